@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Request, Query, Depends
 from fastapi.templating import Jinja2Templates
 from typing import Optional
-from .repos import list_repos
+from .repos import get_repositories, repo_list_query
 from ..models.requests import RepoListQuery
+from ..exceptions import GitHubAPIError
 import os
 
 router = APIRouter()
@@ -14,14 +15,19 @@ templates = Jinja2Templates(directory=templates_path)
 @router.get("/")
 async def dashboard(
     request: Request,
-    query: RepoListQuery = Depends()
+    query: RepoListQuery = Depends(repo_list_query)
 ):
-    repos = await list_repos(query=query)
+    error = None
+    try:
+        repos = await get_repositories(query)
+    except GitHubAPIError as e:
+        repos, error = [], str(e)
     return templates.TemplateResponse(
         "dashboard.html",
         {
             "request": request,
             "repos": repos,
+            "error": error,
             "username": query.username,
             "sort_by": query.sort_by,
             "filter_test": query.filter_test,
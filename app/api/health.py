@@ -1,5 +1,9 @@
 from fastapi import APIRouter
+from ..cache.readme_cache import readme_cache
+from ..cache.response_cache import response_cache
 from ..cache.ttl_cache import ttl_cache
+from ..services.github_client import github_client
+from ..utils.single_flight import refresh_flight
 
 router = APIRouter()
 
@@ -8,10 +12,17 @@ async def health_check():
     """Check the health of the application.
 
     Returns:
-        dict: Health status, version, and cache size.
+        dict: Health status, version, cache size and counters, response and README caches,
+        conditional and deduplicated request and refresh statistics.
     """
     return {
         "status": "healthy",
         "version": "0.1.0",
-        "cache_size": len(ttl_cache._cache)
+        "cache_size": len(ttl_cache._cache),
+        "cache": ttl_cache.stats(),
+        "responses": response_cache.stats(),
+        "readmes": readme_cache.stats(),
+        "conditional_requests": github_client.validators.stats(),
+        "deduplicated_requests": github_client.dedup_hits,
+        "refreshes": refresh_flight.stats()
     }
@@ -0,0 +1,57 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from ..cache.readme_cache import readme_cache
+from ..cache.response_cache import response_cache
+from ..cache.ttl_cache import ttl_cache
+from ..services.github_client import github_client
+from ..utils.metrics import registry
+from ..utils.single_flight import refresh_flight
+
+router = APIRouter()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _cache_events():
+    ttl = ttl_cache.stats()
+    samples = {
+        ("data", "hit"): ttl["hits"],
+        ("data", "stale"): ttl["stale_hits"],
+        ("data", "miss"): ttl["misses"],
+        ("conditional", "hit"): github_client.validators.hits,
+        ("conditional", "miss"): github_client.validators.misses,
+    }
+    for name, cache in (("responses", response_cache), ("readmes", readme_cache)):
+        samples[(name, "hit")] = cache.hits
+        samples[(name, "miss")] = cache.misses
+    return samples
+
+
+registry.collected(
+    "cache_requests_total", "Cache lookups by cache and outcome (hit, stale, miss).",
+    "counter", _cache_events, ("cache", "result")
+)
+registry.collected(
+    "cache_entries", "Entries held per cache.", "gauge",
+    lambda: {
+        ("data",): ttl_cache.stats()["entries"],
+        ("responses",): len(response_cache),
+        ("readmes",): len(readme_cache),
+        ("conditional",): len(github_client.validators),
+    },
+    ("cache",)
+)
+registry.collected(
+    "refreshes_in_flight", "Account refreshes currently running.", "gauge",
+    lambda: {(): refresh_flight.in_flight()}
+)
+registry.collected(
+    "github_deduplicated_requests_total", "GitHub GETs answered by an identical in-flight request.",
+    "counter", lambda: {(): github_client.dedup_hits}
+)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Exposes request, cache and rate-limit metrics in the Prometheus text format."""
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
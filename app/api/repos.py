@@ -1,9 +1,17 @@
 import asyncio
-from fastapi import APIRouter, Depends
-from typing import List, Optional, Dict, Any
+import json
+import time
+from fastapi import APIRouter, Depends, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter, ValidationError
+from httpx import HTTPStatusError, RequestError
+from typing import (
+    Any, AsyncIterator, Awaitable, Callable, Dict, List, Literal, Optional, Sequence, Set, Tuple
+)
 from ..models.repo import Repository
 from ..models.metrics import RepoMetrics
-from ..models.requests import RepoListQuery
+from ..models.requests import RepoListQuery, encode_cursor
 from ..models.enums import BuildStatus, CodeQLStatus, FilterValue
 from ..services.github_client import github_client
 from ..services.actions_service import ActionsService
@@ -11,146 +19,524 @@ from ..services.coverage_service import CoverageService
 from ..services.quality_service import QualityService
 from ..services.badge_service import BadgeService
 from ..services.version_service import VersionService
+from ..services.graphql_enrichment import GraphQLEnrichmentService
+from ..cache.response_cache import CachedResponse, response_cache
+from ..cache.snapshot import RepoSnapshot
 from ..cache.ttl_cache import ttl_cache
+from ..cache.keys import account_cache_key, repo_cache_key
+from ..utils.single_flight import refresh_flight
+from ..utils.metrics import enrichment_duration
+from ..utils.profiling import span, traced
+from ..config import config
+from ..exceptions import GitHubAPIError
+from ..utils.logging import logger
 
 router = APIRouter()
 
+def repo_list_query(
+    username: Optional[str] = None,
+    sort_by: Optional[str] = None,
+    filter_test: Optional[str] = None,
+    filter_quality: Optional[str] = None,
+    filter_codeql: Optional[str] = None,
+    limit: Optional[str] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None
+) -> RepoListQuery:
+    """Builds the repository list query from the query string, reporting errors as 422."""
+    try:
+        return RepoListQuery(
+            username=username, sort_by=sort_by, filter_test=filter_test,
+            filter_quality=filter_quality, filter_codeql=filter_codeql, limit=limit,
+            cursor=cursor, fields=fields
+        )
+    except ValidationError as e:
+        raise RequestValidationError([
+            {**error, "loc": ("query", *error["loc"])}
+            for error in e.errors(include_url=False, include_context=False)
+        ]) from e
+
 async def fetch_repo_metrics(repo_dict: Dict[str, Any]) -> Repository:
     """Enriches a repository with metrics."""
     owner = repo_dict["owner"]["login"]
     name = repo_dict["name"]
 
-    # Fetch badges first as they are used by multiple services
-    badges = await BadgeService.get_all_badges(owner, name)
-
-    # Fetch other metrics in parallel
-    (build_status, coverage, quality_tools, codeql_status,
-     last_commit, commit_count, pages_url, version) = await asyncio.gather(
-        ActionsService.get_build_status(owner, name),
-        CoverageService.get_coverage(owner, name, badges=badges),
-        QualityService.get_quality_tools(owner, name, badges=badges),
-        QualityService.get_codeql_status(owner, name, badges=badges),
-        github_client.get_last_commit(owner, name),
-        github_client.get_commit_count(owner, name),
-        github_client.get_pages_url(owner, name) if repo_dict.get("has_pages") else asyncio.sleep(0),
-        VersionService.get_version(owner, name, badges=badges)
-    )
+    # get_last_commit and get_commit_count read the same response; the fetch
+    # cycle sends it once.
+    with github_client.fetch_cycle():
+        # Fetch and analyse badges first as they are used by multiple services
+        readme = await traced("readme_badges", BadgeService.get_readme_badges(owner, name))
+        badges, analysis = readme.badges, readme.analysis
+
+        # Fetch other metrics in parallel
+        (build_status, failing_tests, coverage, quality_tools, codeql_status,
+         last_commit, commit_count, pages_url, version) = await asyncio.gather(
+            traced("build_status", ActionsService.get_build_status(owner, name)),
+            traced("failed_tests", ActionsService.get_failed_tests_count(owner, name)),
+            traced("coverage", CoverageService.get_coverage(owner, name, analysis=analysis)),
+            traced(
+                "quality_tools", QualityService.get_quality_tools(owner, name, analysis=analysis)
+            ),
+            traced(
+                "codeql_status", QualityService.get_codeql_status(owner, name, analysis=analysis)
+            ),
+            traced("last_commit", github_client.get_last_commit(owner, name)),
+            traced("commit_count", github_client.get_commit_count(owner, name)),
+            traced("pages_url", github_client.get_pages_url(owner, name))
+            if repo_dict.get("has_pages") else asyncio.sleep(0),
+            traced("version", VersionService.get_version(owner, name, analysis=analysis))
+        )
+
+    with span("build_models"):
+        last_commit_at = None
+        if last_commit and "commit" in last_commit:
+            last_commit_at = last_commit["commit"]["committer"]["date"]
+
+        metrics = RepoMetrics(
+            build_status=build_status,
+            failing_tests_count=failing_tests,
+            coverage_percentage=coverage,
+            quality_tools=quality_tools,
+            codeql_status=CodeQLStatus.ACTIVE if codeql_status == "active" else (
+                CodeQLStatus.FAILURE if codeql_status == "failure" else CodeQLStatus.NONE
+            ),
+            last_commit_at=last_commit_at,
+            commit_count=commit_count,
+            readme_badges=badges,
+            version=version
+        )
+
+        return Repository(
+            name=name,
+            full_name=repo_dict["full_name"],
+            html_url=repo_dict["html_url"],
+            pages_url=pages_url or repo_dict.get("homepage"),
+            description=repo_dict.get("description"),
+            metrics=metrics
+        )
+
+def _as_snapshot(repositories: Sequence[Repository]) -> RepoSnapshot:
+    if isinstance(repositories, RepoSnapshot):
+        return repositories
+    return RepoSnapshot(repositories)
+
+async def _fetch_repos_from_cache_or_api(username: Optional[str]) -> RepoSnapshot:
+    """Fetches the repository snapshot of an account from cache or API."""
+    cache_key = account_cache_key(username)
+    cached, stale = ttl_cache.get_with_staleness(cache_key)
+
+    if cached is not None:
+        if stale:
+            _schedule_background_refresh(username, cache_key)
+        return _as_snapshot(cached)
+
+    # Concurrent requests for the same expired key share one refresh.
+    return _as_snapshot(await _run_refresh(username, cache_key))
+
+async def refresh_account(username: Optional[str]) -> List[Repository]:
+    """Refreshes an account's repository list regardless of its cache state."""
+    return await _run_refresh(username, account_cache_key(username))
+
+async def _run_refresh(username: Optional[str], cache_key: str) -> RepoSnapshot:
+    """Starts the refresh of an account, or joins the one in flight, and awaits it.
+
+    The spans of a refresh are recorded in the profile of the request that started
+    it, so a request that joins one only records this span, marked `joined`.
+    """
+    with span("account_refresh", joined=refresh_flight.running(cache_key)):
+        return await refresh_flight.do(cache_key, lambda: _begin_refresh(username, cache_key))
+
+_background_refreshes: Set["asyncio.Task[Any]"] = set()
 
-    last_commit_at = None
-    if last_commit and "commit" in last_commit:
-        last_commit_at = last_commit["commit"]["committer"]["date"]
-
-    metrics = RepoMetrics(
-        build_status=build_status,
-        coverage_percentage=coverage,
-        quality_tools=quality_tools,
-        codeql_status=CodeQLStatus.ACTIVE if codeql_status == "active" else (
-            CodeQLStatus.FAILURE if codeql_status == "failure" else CodeQLStatus.NONE
-        ),
-        last_commit_at=last_commit_at,
-        commit_count=commit_count,
-        readme_badges=badges,
-        version=version
+def _schedule_background_refresh(username: Optional[str], cache_key: str):
+    """Refreshes a stale entry in the background while the stale value is served."""
+    task = asyncio.create_task(
+        refresh_flight.do(cache_key, lambda: _begin_refresh(username, cache_key))
     )
+    _background_refreshes.add(task)
+    task.add_done_callback(_finish_background_refresh)
 
-    return Repository(
-        name=name,
-        full_name=repo_dict["full_name"],
-        html_url=repo_dict["html_url"],
-        pages_url=pages_url or repo_dict.get("homepage"),
-        description=repo_dict.get("description"),
-        metrics=metrics
+def _finish_background_refresh(task: "asyncio.Task[Any]"):
+    _background_refreshes.discard(task)
+    if not task.cancelled() and task.exception():
+        logger.warning(f"Background refresh failed: {task.exception()}")
+
+class _RepositoryFeed:
+    """Repositories of a running refresh in completion order, for the streams following it."""
+
+    def __init__(self):
+        self.repositories: List[Repository] = []
+        self._published = asyncio.Event()
+
+    def publish(self, repository: Repository):
+        self.repositories.append(repository)
+        self._published.set()
+
+    async def follow(self, refresh: "asyncio.Future[Any]") -> AsyncIterator[Repository]:
+        """Yields every repository published so far and since, until `refresh` completes."""
+        sent = 0
+        while True:
+            while sent < len(self.repositories):
+                sent += 1
+                yield self.repositories[sent - 1]
+            if refresh.done():
+                return
+            self._published.clear()
+            published = asyncio.ensure_future(self._published.wait())
+            try:
+                await asyncio.wait({refresh, published}, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                published.cancel()
+
+# Feeds of the refreshes in flight, by account cache key
+_feeds: Dict[str, _RepositoryFeed] = {}
+
+def _begin_refresh(username: Optional[str], cache_key: str) -> Awaitable[RepoSnapshot]:
+    """Registers the feed of a new refresh, before it starts, and returns the refresh."""
+    feed = _RepositoryFeed()
+    _feeds[cache_key] = feed
+    return _refresh_repos(username, cache_key, feed)
+
+async def _refresh_repos(
+    username: Optional[str], cache_key: str, feed: _RepositoryFeed
+) -> RepoSnapshot:
+    """Fetches and enriches all repositories, then stores them in the cache.
+
+    Each repository is published to `feed` as soon as it is enriched. If the listing
+    fails part-way nothing is cached, so an incomplete account is never served for a
+    whole TTL. Identical GitHub requests of one refresh are sent once.
+
+    Raises:
+        GitHubAPIError: If the repositories could not be listed.
+    """
+    try:
+        with github_client.fetch_cycle():
+            repositories = await _enrich_repositories(
+                _iter_user_repos_data(username), feed.publish
+            )
+    except (HTTPStatusError, RequestError) as e:
+        account = username or "authenticated user"
+        logger.warning(f"Listing repositories of {account} failed: {e}")
+        status_code = e.response.status_code if isinstance(e, HTTPStatusError) else None
+        raise GitHubAPIError(f"Listing repositories of {account} failed", status_code) from e
+    finally:
+        if _feeds.get(cache_key) is feed:
+            del _feeds[cache_key]
+    snapshot = RepoSnapshot(repositories)
+    ttl_cache.set(cache_key, snapshot)
+    return snapshot
+
+def _repo_stamp(repo_dict: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+    """Version of a repository as reported by the listing; changes on every push or edit."""
+    return repo_dict.get("pushed_at"), repo_dict.get("updated_at")
+
+def _get_unchanged_repository(repo_dict: Dict[str, Any]) -> Optional[Repository]:
+    """Returns the stored enrichment of a repository if it has not changed since.
+
+    A build that was still running is never reused: finishing a CI run changes
+    neither `pushed_at` nor `updated_at`.
+    """
+    stamp = _repo_stamp(repo_dict)
+    entry = ttl_cache.get(repo_cache_key(repo_dict["full_name"]))
+    if entry is None or stamp == (None, None) or entry[0] != stamp:
+        return None
+    repository = entry[1]
+    if repository.metrics and repository.metrics.build_status == BuildStatus.IN_PROGRESS:
+        return None
+    return repository
+
+def _store_repository(repo_dict: Dict[str, Any], repository: Repository):
+    ttl_cache.set(
+        repo_cache_key(repo_dict["full_name"]),
+        (_repo_stamp(repo_dict), repository),
+        ttl=config.REPO_METRICS_TTL
     )
 
-async def _fetch_repos_from_cache_or_api(username: Optional[str]) -> List[Repository]:
-    """Fetches repositories from cache or API."""
-    cache_key = f"repos_{username or 'authed'}"
-    cached = ttl_cache.get(cache_key)
+async def _enrich_repository_rest(repo_dict: Dict[str, Any]) -> Repository:
+    with enrichment_duration.time(backend="rest"), \
+            span("fetch_repo_metrics", repo=repo_dict["full_name"]):
+        repository = await fetch_repo_metrics(repo_dict)
+    _store_repository(repo_dict, repository)
+    return repository
 
-    if cached:
-        return list(cached)
+async def _enrich_batch_rest(repos_data: List[Dict[str, Any]]) -> List[Repository]:
+    return list(await asyncio.gather(*[_enrich_repository_rest(r) for r in repos_data]))
 
-    repos_data = await _fetch_user_repos_data(username)
-    repositories = await asyncio.gather(*[fetch_repo_metrics(r) for r in repos_data])
-    ttl_cache.set(cache_key, repositories)
-    return list(repositories)
+async def _enrich_batch_graphql(repos_data: List[Dict[str, Any]]) -> List[Repository]:
+    """Enriches one GraphQL batch, falling back to REST for repositories it could not resolve."""
+    started = time.perf_counter()
+    with span("graphql_batch", size=len(repos_data)):
+        resolved = await GraphQLEnrichmentService.fetch_batch(repos_data)
+    # Every repository of the batch took as long as the whole batch.
+    elapsed = time.perf_counter() - started
+    for repo in repos_data:
+        if repo["full_name"] in resolved:
+            enrichment_duration.observe(elapsed, backend="graphql")
+            _store_repository(repo, resolved[repo["full_name"]])
+    missing = [r for r in repos_data if r["full_name"] not in resolved]
+    return list(resolved.values()) + await _enrich_batch_rest(missing)
 
-async def _fetch_user_repos_data(username: Optional[str]) -> List[Dict[str, Any]]:
-    """Fetches repository data from GitHub API and filters by user."""
-    repos_data = await github_client.get_user_repos(username)
+async def _iter_enriched_repositories(
+    repos_stream: AsyncIterator[Dict[str, Any]],
+    repos_data: List[Dict[str, Any]]
+) -> AsyncIterator[Repository]:
+    """Yields repositories as soon as their enrichment completes.
+
+    Enrichment starts as soon as repositories arrive from the paginated listing.
+    Repositories whose `pushed_at`/`updated_at` match their stored enrichment are
+    reused without any API call and yielded right away. The GraphQL backend sends a
+    batch query whenever a batch is full and falls back to per-repo REST enrichment
+    for any repository its query could not resolve.
+
+    Args:
+        repos_stream: Repository data from the listing.
+        repos_data: Receives every listed repository, in listing order.
+    """
+    graphql = config.ENRICHMENT_BACKEND == "graphql"
+    pending: List[Dict[str, Any]] = []
+    tasks: List["asyncio.Task[List[Repository]]"] = []
+    refreshed = 0
+    try:
+        async for repo in repos_stream:
+            repos_data.append(repo)
+            reused = _get_unchanged_repository(repo)
+            if reused is not None:
+                yield reused
+            elif not graphql:
+                tasks.append(asyncio.create_task(_enrich_batch_rest([repo])))
+            else:
+                pending.append(repo)
+                if len(pending) == config.GRAPHQL_BATCH_SIZE:
+                    tasks.append(asyncio.create_task(_enrich_batch_graphql(pending)))
+                    pending = []
+        if pending:
+            tasks.append(asyncio.create_task(_enrich_batch_graphql(pending)))
+
+        for next_done in asyncio.as_completed(tasks):
+            for repository in await next_done:
+                refreshed += 1
+                yield repository
+    finally:
+        # Stops outstanding enrichment if the listing failed or the consumer went away.
+        for task in tasks:
+            task.cancel()
+    logger.info(
+        f"Enriched {refreshed} changed repositories, reused {len(repos_data) - refreshed}"
+    )
 
+async def _enrich_repositories(
+    repos_stream: AsyncIterator[Dict[str, Any]],
+    on_enriched: Optional[Callable[[Repository], None]] = None
+) -> List[Repository]:
+    """Enriches repositories with the configured backend, preserving listing order.
+
+    `on_enriched` is called with each repository as soon as it is enriched.
+    """
+    repos_data: List[Dict[str, Any]] = []
+    enriched: Dict[str, Repository] = {}
+    async for repository in _iter_enriched_repositories(repos_stream, repos_data):
+        enriched[repository.full_name] = repository
+        if on_enriched is not None:
+            on_enriched(repository)
+    return [enriched[r["full_name"]] for r in repos_data]
+
+async def _iter_user_repos_data(username: Optional[str]) -> AsyncIterator[Dict[str, Any]]:
+    """Streams repository data from the GitHub API, keeping only repos owned by the user."""
     if username:
         target_login = username
     else:
         user_info = await github_client.get_authenticated_user()
         target_login = user_info.get("login", "")
 
-    return [
-        r for r in repos_data
-        if r["owner"]["login"].lower() == target_login.lower()
-    ]
+    async for repo in github_client.iter_user_repos(username):
+        if repo["owner"]["login"].lower() == target_login.lower():
+            yield repo
 
-def _apply_filters(
-    repositories: List[Repository],
+def _matches_filters(
+    repository: Repository,
     filter_test: Optional[FilterValue],
     filter_quality: Optional[FilterValue],
     filter_codeql: Optional[FilterValue]
-) -> List[Repository]:
-    """Applies filters to the repository list."""
-    if filter_test:
-        repositories = [r for r in repositories if r.metrics and (
-            (filter_test == FilterValue.PASS and r.metrics.build_status == BuildStatus.SUCCESS) or
-            (filter_test == FilterValue.FAIL and r.metrics.build_status == BuildStatus.FAILURE)
-        )]
-
-    if filter_codeql:
-        repositories = [r for r in repositories if r.metrics and (
-            (filter_codeql == FilterValue.PASS and r.metrics.codeql_status == CodeQLStatus.ACTIVE) or
-            (filter_codeql == FilterValue.FAIL and r.metrics.codeql_status == CodeQLStatus.FAILURE) or
-            (filter_codeql == FilterValue.NONE and r.metrics.codeql_status == CodeQLStatus.NONE)
-        )]
-
-    if filter_quality:
-        repositories = [r for r in repositories if r.metrics and (
-            (filter_quality == FilterValue.PASS and len(r.metrics.quality_tools) > 0) or
-            (filter_quality == FilterValue.FAIL and len(r.metrics.quality_tools) == 0)
-        )]
+) -> bool:
+    """Tells whether a single repository passes the filters."""
+    if not (filter_test or filter_quality or filter_codeql):
+        return True
+    metrics = repository.metrics
+    if metrics is None:
+        return False
 
-    return repositories
+    if filter_test and not (
+        (filter_test == FilterValue.PASS and metrics.build_status == BuildStatus.SUCCESS) or
+        (filter_test == FilterValue.FAIL and metrics.build_status == BuildStatus.FAILURE)
+    ):
+        return False
 
-def _apply_sorting(
-    repositories: List[Repository],
-    sort_by: Optional[str]
-) -> List[Repository]:
-    """Sorts the repository list."""
-    if sort_by == "coverage":
-        repositories.sort(
-            key=lambda r: (r.metrics.coverage_percentage if r.metrics else 0) or 0,
-            reverse=True
-        )
-    elif sort_by == "status":
-        status_order = {
-            BuildStatus.SUCCESS: 0,
-            BuildStatus.IN_PROGRESS: 1,
-            BuildStatus.UNKNOWN: 2,
-            BuildStatus.FAILURE: 3
-        }
-        repositories.sort(
-            key=lambda r: status_order.get(r.metrics.build_status if r.metrics else BuildStatus.UNKNOWN, 4)
-        )
-    elif sort_by == "last_commit":
-        repositories.sort(
-            key=lambda r: (r.metrics.last_commit_at if r.metrics else "") or "",
-            reverse=True
-        )
+    if filter_codeql and not (
+        (filter_codeql == FilterValue.PASS and metrics.codeql_status == CodeQLStatus.ACTIVE) or
+        (filter_codeql == FilterValue.FAIL and metrics.codeql_status == CodeQLStatus.FAILURE) or
+        (filter_codeql == FilterValue.NONE and metrics.codeql_status == CodeQLStatus.NONE)
+    ):
+        return False
+
+    if filter_quality and not (
+        (filter_quality == FilterValue.PASS and len(metrics.quality_tools) > 0) or
+        (filter_quality == FilterValue.FAIL and len(metrics.quality_tools) == 0)
+    ):
+        return False
+
+    return True
+
+async def _select_repositories(
+    query: RepoListQuery, paged: bool = True
+) -> Tuple[List[Repository], int]:
+    """Filters, sorts and (optionally) pages an account's repositories on its snapshot."""
+    snapshot = await _fetch_repos_from_cache_or_api(query.username)
+    return snapshot.select(
+        query.filter_test, query.filter_quality, query.filter_codeql, query.sort_by,
+        offset=query.offset if paged else 0, limit=query.limit if paged else None
+    )
+
+async def get_repositories(query: RepoListQuery) -> List[Repository]:
+    """Returns the filtered and sorted repositories of an account."""
+    repositories, _ = await _select_repositories(query, paged=False)
     return repositories
 
+_REPOSITORY_LIST = TypeAdapter(List[Repository])
+
+def _response_key(query: RepoListQuery) -> Tuple[Any, ...]:
+    return (
+        account_cache_key(query.username), query.sort_by, query.filter_test,
+        query.filter_quality, query.filter_codeql, query.limit, query.cursor, query.fields
+    )
+
+def _build_response(
+    request: Request, query: RepoListQuery, page: List[Repository], total: int
+) -> CachedResponse:
+    """Serializes a page of repositories, dumping only the requested fields."""
+    include = query.projection()
+    body = _REPOSITORY_LIST.dump_json(page, include={"__all__": include} if include else None)
+
+    headers = {"X-Total-Count": str(total)}
+    end = query.offset + len(page)
+    if query.limit and end < total:
+        next_cursor = encode_cursor(end)
+        next_url = request.url.include_query_params(cursor=next_cursor)
+        headers["X-Next-Cursor"] = next_cursor
+        headers["Link"] = f'<{next_url}>; rel="next"'
+
+    expiry = ttl_cache.expiry(account_cache_key(query.username)) or (0.0, 0.0)
+    return CachedResponse.build(body, headers, soft_expiry=expiry[0], hard_expiry=expiry[1])
+
 @router.get("/repos", response_model=List[Repository])
-async def list_repos(query: RepoListQuery = Depends()):
-    """Lists all repositories with metrics."""
-    repositories = await _fetch_repos_from_cache_or_api(query.username)
-    repositories = _apply_filters(
-        repositories, query.filter_test, query.filter_quality, query.filter_codeql
+async def list_repos(request: Request, query: RepoListQuery = Depends(repo_list_query)):
+    """Lists all repositories with metrics.
+
+    Serialized responses are cached per query until the account's data changes, so a
+    warm request is a dictionary lookup; clients revalidate with `If-None-Match`.
+    With `limit`, `cursor` or `fields` only that page and those fields are serialized;
+    the cursor of the next page is returned in `X-Next-Cursor` and a `Link` header.
+    """
+    key = _response_key(query)
+    account_key = account_cache_key(query.username)
+    cached = response_cache.get(key, ttl_cache.generation(account_key))
+    if cached is None:
+        page, total = await _select_repositories(query)
+        # Read right after the data, with no await in between, so they match.
+        generation = ttl_cache.generation(account_key)
+        with span("serialize_response"):
+            cached = _build_response(request, query, page, total)
+        if not cached.is_expired():
+            response_cache.store(key, generation, cached)
+    elif cached.is_stale():
+        _schedule_background_refresh(query.username, account_key)
+    return cached.render(
+        request.headers.get("if-none-match"), request.headers.get("accept-encoding")
+    )
+
+async def _replay(repositories: Sequence[Repository]) -> AsyncIterator[Repository]:
+    for repository in repositories:
+        yield repository
+
+async def _follow_refresh(
+    refresh: "asyncio.Task[RepoSnapshot]", feed: Optional[_RepositoryFeed]
+) -> AsyncIterator[Repository]:
+    """Yields the repositories of a running refresh as they are enriched.
+
+    Any repository the feed did not deliver (e.g. the refresh was just finishing)
+    is taken from the refresh's result.
+    """
+    sent: Set[str] = set()
+    if feed is not None:
+        async for repository in feed.follow(refresh):
+            sent.add(repository.full_name)
+            yield repository
+    for repository in await asyncio.shield(refresh):
+        if repository.full_name not in sent:
+            yield repository
+
+def _open_repository_stream(username: Optional[str]) -> Tuple[bool, AsyncIterator[Repository]]:
+    """Returns whether the repositories come from the cache, and the repositories.
+
+    A cached list (fresh or stale) is replayed as is; a stale one is refreshed in the
+    background as for `/repos`. Otherwise the stream follows the account's refresh,
+    started here or joined if one is already running (from `/repos` or another
+    stream), and yields repositories as they are enriched. The refresh keeps running,
+    and caches its result, if the client goes away.
+    """
+    cache_key = account_cache_key(username)
+    cached, stale = ttl_cache.get_with_staleness(cache_key)
+    if cached is not None:
+        if stale:
+            _schedule_background_refresh(username, cache_key)
+        return True, _replay(cached)
+
+    refresh = refresh_flight.start(cache_key, lambda: _begin_refresh(username, cache_key))
+    return False, _follow_refresh(refresh, _feeds.get(cache_key))
+
+def _format_event(event: str, data: Any, stream_format: str) -> str:
+    payload = json.dumps(data, separators=(",", ":"))
+    if stream_format == "sse":
+        return f"event: {event}\ndata: {payload}\n\n"
+    return f'{{"event":"{event}","data":{payload}}}\n'
+
+async def _stream_events(query: RepoListQuery, stream_format: str) -> AsyncIterator[str]:
+    total = 0
+    matched = 0
+    include = query.projection()
+    try:
+        from_cache, repositories = _open_repository_stream(query.username)
+        async for repository in repositories:
+            total += 1
+            if _matches_filters(
+                repository, query.filter_test, query.filter_quality, query.filter_codeql
+            ):
+                matched += 1
+                yield _format_event(
+                    "repository", repository.model_dump(mode="json", include=include), stream_format
+                )
+    except (HTTPStatusError, RequestError, GitHubAPIError) as e:
+        account = query.username or "authenticated user"
+        logger.warning(f"Streaming repositories of {account} failed: {e}")
+        yield _format_event("error", {"message": "Listing repositories failed"}, stream_format)
+        return
+    yield _format_event(
+        "summary", {"total": total, "matched": matched, "cached": from_cache}, stream_format
+    )
+
+@router.get("/repos/stream")
+async def stream_repos(
+    query: RepoListQuery = Depends(repo_list_query),
+    format: Literal["ndjson", "sse"] = "ndjson"
+):
+    """Streams repositories as they are enriched, ending with a `summary` event.
+
+    Emits NDJSON (`{"event": ..., "data": ...}` per line) or Server-Sent Events.
+    Filters and `fields` apply per repository; `sort_by`, `limit` and `cursor` are
+    ignored because results arrive in completion order.
+    """
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(
+        _stream_events(query, format),
+        media_type=media_type,
+        headers={"Cache-Control": "no-cache"}
     )
-    repositories = _apply_sorting(repositories, query.sort_by)
-    return repositories
@@ -0,0 +1,36 @@
+import json
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, Request
+from ..config import config
+from ..services.webhook_service import WebhookService
+
+router = APIRouter()
+
+@router.post("/github")
+async def github_webhook(
+    request: Request,
+    x_github_event: Optional[str] = Header(None),
+    x_hub_signature_256: Optional[str] = Header(None)
+):
+    """Receives GitHub webhook deliveries and updates cached metrics.
+
+    Returns:
+        dict: The event name and the action taken (`patched`, `invalidated`, `ignored`).
+    """
+    if not config.GITHUB_WEBHOOK_SECRET:
+        raise HTTPException(status_code=503, detail="Webhook secret not configured")
+
+    body = await request.body()
+    if not WebhookService.verify_signature(config.GITHUB_WEBHOOK_SECRET, body, x_hub_signature_256):
+        raise HTTPException(status_code=401, detail="Invalid signature")
+
+    if x_github_event == "ping":
+        return {"event": "ping", "action": "pong"}
+
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid JSON payload")
+
+    action = WebhookService.handle_event(x_github_event or "", payload)
+    return {"event": x_github_event, "action": action}
@@ -0,0 +1,240 @@
+import heapq
+import os
+import pickle  # nosec B403 - only reads entries this process wrote to its own cache file
+import sqlite3
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from ..exceptions import CacheError
+
+# (value, soft_expiry, hard_expiry); expiries are epoch seconds
+CacheEntry = Tuple[Any, float, float]
+
+
+class CacheBackend(ABC):
+    """Storage behind `TTLCache`. Backends store entries; TTL semantics live in `TTLCache`."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[CacheEntry]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, entry: CacheEntry):
+        ...
+
+    @abstractmethod
+    def delete(self, key: str):
+        ...
+
+    @abstractmethod
+    def clear(self):
+        ...
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def purge_expired(self, now: Optional[float] = None) -> int:
+        """Deletes entries past their hard expiry and returns how many were removed."""
+        return 0
+
+    @property
+    def evictions(self) -> int:
+        return 0
+
+    def close(self):
+        pass
+
+
+def _approximate_size(value: Any) -> int:
+    """Approximate memory footprint of a value.
+
+    Values that estimate their own size (`approximate_size`, e.g. `RepoSnapshot`)
+    report it; anything else is measured as its pickled size.
+    """
+    estimate = getattr(value, "approximate_size", None)
+    if isinstance(estimate, int):
+        return estimate
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return 0
+
+
+class MemoryBackend(CacheBackend):
+    """Process-local storage with LRU eviction; lost on restart.
+
+    The store is bounded by `max_entries` and by `max_bytes` (approximated by the
+    pickled size of each value, or its own estimate); the least recently used entries
+    are evicted first.
+    A min-heap of hard expiries lets `purge_expired` remove expired entries in
+    O(log n) each instead of scanning the whole store.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None):
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._evictions = 0
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, entry: CacheEntry):
+        self.delete(key)
+        size = _approximate_size(entry[0]) if self.max_bytes else 0
+        self._entries[key] = entry
+        self._sizes[key] = size
+        self.total_bytes += size
+        heapq.heappush(self._expiry_heap, (entry[2], key))
+        self._evict()
+
+    def _evict(self):
+        while self._entries and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (self.max_bytes is not None and self.total_bytes > self.max_bytes)
+        ):
+            key = next(iter(self._entries))
+            self.delete(key)
+            self._evictions += 1
+        # Drop heap items of replaced/deleted keys once they dominate the heap.
+        if len(self._expiry_heap) > 2 * len(self._entries) + 64:
+            self._expiry_heap = [(e[2], k) for k, e in self._entries.items()]
+            heapq.heapify(self._expiry_heap)
+
+    def delete(self, key: str):
+        if self._entries.pop(key, None) is not None:
+            self.total_bytes -= self._sizes.pop(key, 0)
+
+    def purge_expired(self, now: Optional[float] = None) -> int:
+        now = now or time.time()
+        removed = 0
+        while self._expiry_heap and self._expiry_heap[0][0] < now:
+            hard_expiry, key = heapq.heappop(self._expiry_heap)
+            entry = self._entries.get(key)
+            # Heap items of overwritten entries are stale; only the current expiry counts.
+            if entry is not None and entry[2] == hard_expiry:
+                self.delete(key)
+                removed += 1
+        return removed
+
+    @property
+    def evictions(self) -> int:
+        return self._evictions
+
+    def clear(self):
+        self._entries.clear()
+        self._sizes.clear()
+        self._expiry_heap.clear()
+        self.total_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+
+class SQLiteBackend(CacheBackend):
+    """Persistent storage in an SQLite database in WAL mode.
+
+    Values are pickled and zlib-compressed. Entries are read one key at a time on
+    demand, so a large warm cache costs nothing at startup beyond purging rows past
+    their hard expiry (an indexed range delete).
+    """
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        try:
+            self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                " key TEXT PRIMARY KEY,"
+                " value BLOB NOT NULL,"
+                " soft_expiry REAL NOT NULL,"
+                " hard_expiry REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_cache_entries_hard_expiry"
+                " ON cache_entries (hard_expiry)"
+            )
+            self.purge_expired()
+        except sqlite3.Error as e:
+            raise CacheError(f"Cannot open cache database '{path}': {e}") from e
+
+    @staticmethod
+    def _dumps(value: Any) -> bytes:
+        return zlib.compress(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+    @staticmethod
+    def _loads(blob: bytes) -> Any:
+        return pickle.loads(zlib.decompress(blob))  # nosec B301 - see import note
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        row = self._conn.execute(
+            "SELECT value, soft_expiry, hard_expiry FROM cache_entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        try:
+            return self._loads(row[0]), row[1], row[2]
+        except Exception:
+            # Unreadable entries (e.g. written by an incompatible version) are dropped.
+            self.delete(key)
+            return None
+
+    def set(self, key: str, entry: CacheEntry):
+        value, soft_expiry, hard_expiry = entry
+        self._conn.execute(
+            "INSERT OR REPLACE INTO cache_entries (key, value, soft_expiry, hard_expiry)"
+            " VALUES (?, ?, ?, ?)",
+            (key, self._dumps(value), soft_expiry, hard_expiry)
+        )
+
+    def delete(self, key: str):
+        self._conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def clear(self):
+        self._conn.execute("DELETE FROM cache_entries")
+
+    def purge_expired(self, now: Optional[float] = None) -> int:
+        """Deletes entries past their hard expiry and returns how many were removed."""
+        cursor = self._conn.execute(
+            "DELETE FROM cache_entries WHERE hard_expiry < ?", (now or time.time(),)
+        )
+        return cursor.rowcount
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+
+    def close(self):
+        self._conn.close()
+
+
+def create_backend(
+    kind: str,
+    path: str,
+    max_entries: Optional[int] = None,
+    max_bytes: Optional[int] = None
+) -> CacheBackend:
+    """Creates the cache backend named by the `CACHE_BACKEND` setting."""
+    if kind == "sqlite":
+        return SQLiteBackend(path)
+    if kind == "memory":
+        return MemoryBackend(max_entries=max_entries, max_bytes=max_bytes)
+    raise CacheError(f"Unknown cache backend '{kind}'")
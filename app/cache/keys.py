@@ -0,0 +1,17 @@
+from typing import Optional
+
+def account_cache_key(username: Optional[str]) -> str:
+    """Cache key of an account's enriched repository list (`None` is the authenticated user)."""
+    return f"repos_{username.lower() if username else 'authed'}"
+
+def repo_cache_key(full_name: str) -> str:
+    """Cache key of a single repository's enrichment."""
+    return f"repo_{full_name.lower()}"
+
+def failed_tests_cache_key(full_name: str, run_id: int) -> str:
+    """Cache key of the failed-test count parsed from a completed workflow run's logs."""
+    return f"failed_tests_{full_name.lower()}_{run_id}"
+
+def latest_run_cache_key(full_name: str) -> str:
+    """Cache key of the most recent workflow run applied from a webhook."""
+    return f"latest_run_{full_name.lower()}"
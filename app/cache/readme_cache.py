@@ -0,0 +1,50 @@
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from ..config import config
+from ..parsers.badge_analysis import ReadmeBadges
+
+
+class ReadmeCache:
+    """Bounded LRU store of README analyses keyed by content identifiers.
+
+    Keys are the ETag of the raw README (REST) or its git blob SHA (GraphQL); both
+    change with the content, so an unchanged README is never parsed twice.
+    """
+
+    def __init__(self, max_entries: int = 5000):
+        self._entries: "OrderedDict[str, ReadmeBadges]" = OrderedDict()
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Optional[str]) -> Optional[ReadmeBadges]:
+        entry = self._entries.get(key) if key else None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def store(self, key: Optional[str], readme: ReadmeBadges):
+        if not key:
+            return
+        self._entries[key] = readme
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns size and hit/miss counters for reporting."""
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+readme_cache = ReadmeCache(max_entries=config.README_CACHE_MAX_ENTRIES)
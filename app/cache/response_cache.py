@@ -0,0 +1,153 @@
+import gzip
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, Optional, Tuple
+from starlette.responses import Response
+from ..config import config
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# Bodies smaller than this are not worth compressing.
+MIN_COMPRESS_BYTES = 512
+
+
+def _accepts(accept_encoding: str, coding: str) -> bool:
+    """Tells whether an `Accept-Encoding` header allows a content coding (q > 0)."""
+    for part in accept_encoding.split(","):
+        name, *params = part.split(";")
+        if name.strip().lower() != coding:
+            continue
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    return float(value) > 0
+                except ValueError:
+                    return False
+        return True
+    return False
+
+
+def _matches(if_none_match: str, etags: Dict[str, str]) -> bool:
+    """Weak comparison of `If-None-Match` against the ETags of all encodings."""
+    if if_none_match.strip() == "*":
+        return True
+    known = set(etags.values())
+    return any(tag.strip().removeprefix("W/") in known for tag in if_none_match.split(","))
+
+
+@dataclass
+class CachedResponse:
+    """A serialized JSON response with precompressed variants.
+
+    Attributes:
+        bodies: Body per content coding (`identity`, `gzip`, optionally `br`).
+        etags: Strong ETag per content coding.
+        headers: Extra response headers (e.g. pagination).
+        soft_expiry: When the cached data behind the response turns stale.
+        hard_expiry: When the cached data behind the response is gone.
+    """
+    bodies: Dict[str, bytes]
+    etags: Dict[str, str]
+    headers: Dict[str, str] = field(default_factory=dict)
+    soft_expiry: float = float("inf")
+    hard_expiry: float = float("inf")
+
+    @classmethod
+    def build(
+        cls,
+        body: bytes,
+        headers: Optional[Dict[str, str]] = None,
+        soft_expiry: float = float("inf"),
+        hard_expiry: float = float("inf")
+    ) -> "CachedResponse":
+        """Hashes and precompresses a body."""
+        digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        bodies = {"identity": body}
+        if len(body) >= MIN_COMPRESS_BYTES:
+            bodies["gzip"] = gzip.compress(body, compresslevel=6, mtime=0)
+            if brotli is not None:
+                bodies["br"] = brotli.compress(body)
+        # Each encoding is a different representation and gets its own strong ETag.
+        etags = {
+            coding: f'"{digest}"' if coding == "identity" else f'"{digest}-{coding}"'
+            for coding in bodies
+        }
+        return cls(bodies, etags, dict(headers or {}), soft_expiry, hard_expiry)
+
+    def is_stale(self, now: Optional[float] = None) -> bool:
+        return (now or time.time()) > self.soft_expiry
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        return (now or time.time()) > self.hard_expiry
+
+    def render(self, if_none_match: Optional[str], accept_encoding: Optional[str]) -> Response:
+        """Returns the best encoding the client accepts, or a 304 if its copy is current."""
+        coding = "identity"
+        for candidate in ("br", "gzip"):
+            if candidate in self.bodies and _accepts(accept_encoding or "", candidate):
+                coding = candidate
+                break
+
+        headers = {
+            **self.headers,
+            "ETag": self.etags[coding],
+            "Vary": "Accept-Encoding",
+            "Cache-Control": "no-cache",
+        }
+        if if_none_match and _matches(if_none_match, self.etags):
+            return Response(status_code=304, headers=headers)
+        if coding != "identity":
+            headers["Content-Encoding"] = coding
+        return Response(self.bodies[coding], media_type="application/json", headers=headers)
+
+
+class ResponseCache:
+    """Bounded LRU store of serialized responses, each valid for one data generation.
+
+    Keys include everything that shapes a response except the data, which is covered
+    by the `TTLCache` generation of the entry the response was built from: once that
+    entry changes, responses built from it miss and are dropped. Responses of other
+    accounts are unaffected.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self._entries: "OrderedDict[Hashable, Tuple[int, CachedResponse]]" = OrderedDict()
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, generation: int) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != generation or entry[1].is_expired():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def store(self, key: Hashable, generation: int, response: CachedResponse):
+        self._entries[key] = (generation, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns size and hit/miss counters for reporting."""
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+response_cache = ResponseCache(max_entries=config.RESPONSE_CACHE_MAX_ENTRIES)
@@ -0,0 +1,167 @@
+import pickle  # nosec B403 - only measures sizes, never loads
+from datetime import datetime
+from functools import cached_property
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+from ..models.enums import BuildStatus, CodeQLStatus, FilterValue
+from ..models.repo import Repository
+
+# Sort rank of each build status for `sort_by=status` (lower first).
+STATUS_ORDER = {
+    BuildStatus.SUCCESS: 0,
+    BuildStatus.IN_PROGRESS: 1,
+    BuildStatus.UNKNOWN: 2,
+    BuildStatus.FAILURE: 3,
+}
+_CODEQL_CODES = {status: code for code, status in enumerate(CodeQLStatus)}
+_CODEQL_FILTERS = {
+    FilterValue.PASS: CodeQLStatus.ACTIVE,
+    FilterValue.FAIL: CodeQLStatus.FAILURE,
+    FilterValue.NONE: CodeQLStatus.NONE,
+}
+# CodeQL code of repositories without metrics; they match no filter anyway.
+_NO_METRICS = -1
+# Quality tools beyond the first 63 distinct ones share the last bit.
+_MAX_TOOL_BITS = 64
+# Repositories pickled to estimate a snapshot's size; the others are extrapolated.
+_SIZE_SAMPLE = 32
+
+
+def _epoch(timestamp: Optional[str]) -> float:
+    if not timestamp:
+        return -np.inf
+    try:
+        return datetime.fromisoformat(timestamp.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return -np.inf
+
+
+class RepoSnapshot(Sequence[Repository]):
+    """An account's enriched repositories together with columnar copies of their metrics.
+
+    Filtering and sorting run as NumPy boolean masks and `argsort` over the columns;
+    `Repository` objects are only picked for the rows that are returned. The snapshot
+    behaves as a read-only sequence of repositories in listing order.
+    """
+
+    def __init__(self, repositories: Sequence[Repository]):
+        self.repositories: List[Repository] = list(repositories)
+        metrics = [r.metrics for r in self.repositories]
+        count = len(metrics)
+
+        self.has_metrics = np.fromiter((m is not None for m in metrics), dtype=bool, count=count)
+        self.coverage = np.fromiter(
+            ((m.coverage_percentage or 0.0) if m else 0.0 for m in metrics),
+            dtype=np.float64, count=count
+        )
+        self.commit_count = np.fromiter(
+            ((m.commit_count if m and m.commit_count is not None else -1) for m in metrics),
+            dtype=np.int64, count=count
+        )
+        self.status = np.fromiter(
+            (STATUS_ORDER[m.build_status if m else BuildStatus.UNKNOWN] for m in metrics),
+            dtype=np.int8, count=count
+        )
+        self.codeql = np.fromiter(
+            (_CODEQL_CODES[m.codeql_status] if m else _NO_METRICS for m in metrics),
+            dtype=np.int8, count=count
+        )
+        self.last_commit = np.fromiter(
+            (_epoch(m.last_commit_at if m else None) for m in metrics),
+            dtype=np.float64, count=count
+        )
+
+        self.tool_bits: Dict[str, int] = {}
+        self.quality_tools = np.zeros(count, dtype=np.uint64)
+        for i, m in enumerate(metrics):
+            mask = 0
+            for tool in (m.quality_tools if m else []):
+                bit = self.tool_bits.setdefault(tool, min(len(self.tool_bits), _MAX_TOOL_BITS - 1))
+                mask |= 1 << bit
+            self.quality_tools[i] = mask
+
+    def mask(
+        self,
+        filter_test: Optional[FilterValue] = None,
+        filter_quality: Optional[FilterValue] = None,
+        filter_codeql: Optional[FilterValue] = None
+    ) -> np.ndarray:
+        """Boolean mask of the rows passing the filters (same rules as `/api/repos`)."""
+        mask = np.ones(len(self), dtype=bool)
+        if not (filter_test or filter_quality or filter_codeql):
+            return mask
+        mask &= self.has_metrics
+
+        if filter_test == FilterValue.PASS:
+            mask &= self.status == STATUS_ORDER[BuildStatus.SUCCESS]
+        elif filter_test == FilterValue.FAIL:
+            mask &= self.status == STATUS_ORDER[BuildStatus.FAILURE]
+        elif filter_test:
+            mask[:] = False
+
+        if filter_codeql:
+            mask &= self.codeql == _CODEQL_CODES[_CODEQL_FILTERS[filter_codeql]]
+
+        if filter_quality == FilterValue.PASS:
+            mask &= self.quality_tools != 0
+        elif filter_quality == FilterValue.FAIL:
+            mask &= self.quality_tools == 0
+        elif filter_quality:
+            mask[:] = False
+        return mask
+
+    def order(self, rows: np.ndarray, sort_by: Optional[str]) -> np.ndarray:
+        """Sorts row indices; ties keep listing order, as Python's stable sort does."""
+        if sort_by == "coverage":
+            keys = -self.coverage[rows]
+        elif sort_by == "status":
+            keys = self.status[rows]
+        elif sort_by == "last_commit":
+            keys = -self.last_commit[rows]
+        else:
+            return rows
+        return rows[np.argsort(keys, kind="stable")]
+
+    def select(
+        self,
+        filter_test: Optional[FilterValue] = None,
+        filter_quality: Optional[FilterValue] = None,
+        filter_codeql: Optional[FilterValue] = None,
+        sort_by: Optional[str] = None,
+        offset: int = 0,
+        limit: Optional[int] = None
+    ) -> Tuple[List[Repository], int]:
+        """Filters, sorts and pages the repositories.
+
+        Returns:
+            The repositories of the requested page and the number matching the filters.
+        """
+        rows = np.flatnonzero(self.mask(filter_test, filter_quality, filter_codeql))
+        rows = self.order(rows, sort_by)
+        end = offset + limit if limit else len(rows)
+        return [self.repositories[i] for i in rows[offset:end]], len(rows)
+
+    @cached_property
+    def approximate_size(self) -> int:
+        """Approximate memory footprint, used for the cache's byte limit.
+
+        Pickling every repository on each cache write would cost more than building
+        the snapshot, so only an evenly spaced sample is pickled and scaled up.
+        """
+        count = len(self.repositories)
+        sample = self.repositories[::max(1, -(-count // _SIZE_SAMPLE))]
+        pickled = len(pickle.dumps(sample, protocol=pickle.HIGHEST_PROTOCOL))
+        columns = (
+            self.has_metrics, self.coverage, self.commit_count, self.status, self.codeql,
+            self.last_commit, self.quality_tools
+        )
+        return pickled * count // max(len(sample), 1) + sum(c.nbytes for c in columns)
+
+    def __getitem__(self, index):
+        return self.repositories[index]
+
+    def __iter__(self) -> Iterator[Repository]:
+        return iter(self.repositories)
+
+    def __len__(self) -> int:
+        return len(self.repositories)
@@ -1,28 +1,146 @@
+import itertools
 import time
 from typing import Any, Dict, Optional, Tuple
+from .backends import CacheBackend, MemoryBackend, create_backend
+from ..config import config
 
 class TTLCache:
-    def __init__(self, default_ttl: int = 3600):
-        self._cache: Dict[str, Tuple[Any, float]] = {}
+    """Cache with a soft and a hard TTL per entry, stored in a pluggable backend.
+
+    Until the soft TTL an entry is fresh. Between the soft and the hard TTL it is
+    stale: `get_with_staleness` still returns it (so callers can serve it while
+    refreshing in the background) but `get` does not. After the hard TTL it is gone.
+    """
+
+    def __init__(
+        self,
+        default_ttl: int = 3600,
+        default_hard_ttl: Optional[int] = None,
+        backend: Optional[CacheBackend] = None
+    ):
+        self._cache: CacheBackend = backend if backend is not None else MemoryBackend()
         self.default_ttl = default_ttl
+        self.default_hard_ttl = default_hard_ttl
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.expirations = 0
+        # Generation per key whose generation was asked for, bumped whenever that key is
+        # written, so derived data (e.g. serialized responses) can tell whether it is
+        # still current without reading the entry it came from.
+        self._generations: Dict[str, int] = {}
+        self._counter = itertools.count(1)
+
+    def get_with_staleness(self, key: str) -> Tuple[Optional[Any], bool]:
+        """Returns `(value, is_stale)`, or `(None, False)` if missing or past its hard TTL."""
+        entry = self._cache.get(key)
+        if entry is None:
+            self.misses += 1
+            return None, False
+
+        value, soft_expiry, hard_expiry = entry
+        now = time.time()
+        if now > hard_expiry:
+            self._cache.delete(key)
+            self.expirations += 1
+            self.misses += 1
+            return None, False
+
+        stale = now > soft_expiry
+        if stale:
+            self.stale_hits += 1
+        else:
+            self.hits += 1
+        return value, stale
 
     def get(self, key: str) -> Optional[Any]:
-        if key not in self._cache:
-            return None
+        """Returns the value only while it is fresh."""
+        value, stale = self.get_with_staleness(key)
+        return None if stale else value
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None, hard_ttl: Optional[int] = None):
+        ttl = ttl or self.default_ttl
+        hard_ttl = max(ttl, hard_ttl or self.default_hard_ttl or ttl)
+        now = time.time()
+        # Sweeping on write keeps entries that are never read again from piling up.
+        self.expirations += self._cache.purge_expired(now)
+        self._cache.set(key, (value, now + ttl, now + hard_ttl))
+        self._bump(key)
 
-        value, expiry = self._cache[key]
-        if time.time() > expiry:
-            del self._cache[key]
+    def expiry(self, key: str) -> Optional[Tuple[float, float]]:
+        """Returns `(soft_expiry, hard_expiry)` of an entry, or None if missing."""
+        entry = self._cache.get(key)
+        return None if entry is None else (entry[1], entry[2])
+
+    def expires_in(self, key: str) -> Optional[float]:
+        """Seconds until an entry turns stale (negative once stale), or None if missing."""
+        entry = self._cache.get(key)
+        if entry is None:
             return None
+        return entry[1] - time.time()
+
+    def replace(self, key: str, value: Any) -> bool:
+        """Replaces the value of an existing entry, keeping its expiry times.
 
-        return value
+        Returns:
+            False if the key is missing.
+        """
+        entry = self._cache.get(key)
+        if entry is None:
+            return False
+        self._cache.set(key, (value, entry[1], entry[2]))
+        self._bump(key)
+        return True
 
-    def set(self, key: str, value: Any, ttl: Optional[int] = None):
-        expiry = time.time() + (ttl or self.default_ttl)
-        self._cache[key] = (value, expiry)
+    def mark_stale(self, key: str):
+        """Ends the freshness of an entry; it is still served stale until its hard TTL."""
+        entry = self._cache.get(key)
+        if entry is not None:
+            now = time.time()
+            self._cache.set(key, (entry[0], min(entry[1], now), max(entry[2], now)))
+            self._bump(key)
 
     def delete(self, key: str):
-        if key in self._cache:
-            del self._cache[key]
+        self._cache.delete(key)
+        self._bump(key)
+
+    def clear(self):
+        self._cache.clear()
+        for key in self._generations:
+            self._bump(key)
+
+    def generation(self, key: str) -> int:
+        """Version of an entry; changes whenever the entry is written, replaced or removed."""
+        if key not in self._generations:
+            self._generations[key] = next(self._counter)
+        return self._generations[key]
+
+    def _bump(self, key: str):
+        # Only keys someone derives data from are tracked, so this stays small.
+        if key in self._generations:
+            self._generations[key] = next(self._counter)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns cache size and hit/miss/stale/eviction/expiry counters."""
+        return {
+            "entries": len(self._cache),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self._cache.evictions,
+            "expirations": self.expirations,
+        }
+
+    def close(self):
+        self._cache.close()
 
-ttl_cache = TTLCache()
+ttl_cache = TTLCache(
+    default_ttl=config.CACHE_TTL,
+    default_hard_ttl=config.CACHE_HARD_TTL,
+    backend=create_backend(
+        config.CACHE_BACKEND,
+        config.CACHE_PATH,
+        max_entries=config.CACHE_MAX_ENTRIES,
+        max_bytes=config.CACHE_MAX_BYTES
+    )
+)
@@ -0,0 +1,85 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+
+@dataclass
+class ValidatorEntry:
+    """Validators and the last full response for a single URL.
+
+    Attributes:
+        etag: Value of the `ETag` response header.
+        last_modified: Value of the `Last-Modified` response header.
+        response: The last 200 response, replayed when GitHub answers 304.
+    """
+    etag: Optional[str]
+    last_modified: Optional[str]
+    response: Any
+
+    def request_headers(self) -> Dict[str, str]:
+        """Builds the conditional request headers for this entry."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ValidatorCache:
+    """Bounded LRU store of HTTP validators used for conditional requests.
+
+    GitHub does not count `304 Not Modified` responses against the rate limit,
+    so revalidating with `If-None-Match`/`If-Modified-Since` makes refreshes of
+    unchanged resources nearly free.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self._entries: "OrderedDict[str, ValidatorEntry]" = OrderedDict()
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[ValidatorEntry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def store(self, key: str, etag: Optional[str], last_modified: Optional[str], response: Any):
+        """Stores validators for a key; responses without validators are not kept."""
+        if not etag and not last_modified:
+            self._entries.pop(key, None)
+            return
+        self._entries[key] = ValidatorEntry(etag, last_modified, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def record_hit(self):
+        self.hits += 1
+
+    def record_miss(self):
+        self.misses += 1
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns revalidation counters for reporting."""
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -5,9 +5,32 @@ load_dotenv()
 
 class Config:
     GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
+    GITHUB_WEBHOOK_SECRET = os.getenv("GITHUB_WEBHOOK_SECRET")
     APP_HOST = os.getenv("APP_HOST", "0.0.0.0")
     APP_PORT = int(os.getenv("APP_PORT", 10000))
     CACHE_TTL = int(os.getenv("CACHE_TTL", 3600))  # 1 hour
+    CACHE_HARD_TTL = int(os.getenv("CACHE_HARD_TTL", 86400))  # stale entries served until 24 hours
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+    CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")  # "memory" or "sqlite"
+    CACHE_PATH = os.getenv("CACHE_PATH", ".cache/observatory.sqlite3")
+    CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 10000))
+    CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", 256 * 1024 * 1024))
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", 256))
+    README_MAX_BYTES = int(os.getenv("README_MAX_BYTES", 256 * 1024))
+    README_CACHE_MAX_ENTRIES = int(os.getenv("README_CACHE_MAX_ENTRIES", 5000))
+    WORKFLOW_LOG_SPOOL_BYTES = int(os.getenv("WORKFLOW_LOG_SPOOL_BYTES", 8 * 1024 * 1024))
+    REPO_METRICS_TTL = int(os.getenv("REPO_METRICS_TTL", 86400))  # per-repo enrichment, 24 hours
+    ENRICHMENT_BACKEND = os.getenv("ENRICHMENT_BACKEND", "rest")  # "rest" or "graphql"
+    GRAPHQL_BATCH_SIZE = int(os.getenv("GRAPHQL_BATCH_SIZE", 25))
+    RATE_LIMIT_BURST = int(os.getenv("RATE_LIMIT_BURST", 100))
+    RATE_LIMIT_PER_MINUTE = int(os.getenv("RATE_LIMIT_PER_MINUTE", 900))
+    WARMUP_ACCOUNTS = [a.strip() for a in os.getenv("WARMUP_ACCOUNTS", "").split(",") if a.strip()]
+    WARMUP_AUTHENTICATED_USER = os.getenv("WARMUP_AUTHENTICATED_USER", "true").lower() == "true"
+    WARMUP_BUDGET_SHARE = float(os.getenv("WARMUP_BUDGET_SHARE", 0.2))
+    WARMUP_LEAD_SECONDS = int(os.getenv("WARMUP_LEAD_SECONDS", 300))
+    WARMUP_JITTER_SECONDS = int(os.getenv("WARMUP_JITTER_SECONDS", 60))
+    CONDITIONAL_CACHE_MAX_ENTRIES = int(os.getenv("CONDITIONAL_CACHE_MAX_ENTRIES", 10000))
+    PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+    PROFILING_SAMPLE_INTERVAL_MS = float(os.getenv("PROFILING_SAMPLE_INTERVAL_MS", 5))
 
 config = Config()
@@ -0,0 +1,234 @@
+"""Concurrent load generator for the dashboard and JSON API.
+
+Runs the app in-process (ASGI, no server) against the simulated GitHub of
+`app.testing.fake_github` and lets `--users` concurrent viewers request a weighted
+mix of endpoints. Two phases are measured and reported separately:
+
+* refresh: every round drops all cached data and all viewers hit the app at once,
+  so they pile up on a cold refresh (a cache-miss storm).
+* cache-hit: viewers loop over the mix for `--duration` seconds on warm caches.
+
+Client and app share one event loop, so latencies include the client's overhead.
+
+    python -m app.loadtest --users 50 --repos 100 --duration 10
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import httpx
+from .cache.response_cache import response_cache
+from .cache.ttl_cache import ttl_cache
+from .main import app
+from .testing.fake_github import FakeGitHub, simulated_github
+
+DEFAULT_MIX = "/=1,/api/repos=3,/health=1"
+PERCENTILES = (50, 95, 99)
+
+
+def parse_mix(spec: str) -> List[Tuple[str, float]]:
+    """Parses `path=weight,...` into `(path, weight)` pairs."""
+    mix = []
+    for part in spec.split(","):
+        path, _, weight = part.strip().partition("=")
+        try:
+            mix.append((path, float(weight or 1)))
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid weight in {part!r}")
+        if not path.startswith("/") or mix[-1][1] < 0:
+            raise argparse.ArgumentTypeError(f"invalid mix entry {part!r}")
+    if not any(weight for _, weight in mix):
+        raise argparse.ArgumentTypeError("the mix needs a positive weight")
+    return mix
+
+
+def percentile(ordered: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending sequence (0 if empty)."""
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+@dataclass
+class PhaseStats:
+    """Latencies (seconds) and failures of one phase, by request path."""
+    name: str
+    latencies: Dict[str, List[float]] = field(default_factory=lambda: defaultdict(list))
+    errors: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    seconds: float = 0.0
+    upstream_requests: int = 0
+
+    def record(self, path: str, seconds: float, ok: bool):
+        self.latencies[path].append(seconds)
+        if not ok:
+            self.errors[path] += 1
+
+    def summary(self) -> Dict[str, Any]:
+        """Per path and overall: requests, errors, throughput and latency percentiles (ms)."""
+        rows = dict(self.latencies)
+        rows["all"] = [s for values in self.latencies.values() for s in values]
+        result: Dict[str, Any] = {}
+        for path, values in rows.items():
+            ordered = sorted(values)
+            row = {
+                "requests": len(ordered),
+                "errors": sum(self.errors.values()) if path == "all" else self.errors.get(path, 0),
+                "rps": round(len(ordered) / self.seconds, 1) if self.seconds else 0.0,
+            }
+            for q in PERCENTILES:
+                row[f"p{q}_ms"] = round(percentile(ordered, q) * 1000, 2)
+            result[path] = row
+        return {
+            "seconds": round(self.seconds, 3),
+            "upstream_requests": self.upstream_requests,
+            "paths": result,
+        }
+
+
+class LoadTest:
+    """Drives concurrent viewers through an ASGI client.
+
+    Args:
+        client: Client bound to the app.
+        fake: The simulated GitHub the app talks to.
+        mix: `(path, weight)` pairs viewers pick their requests from.
+        users: Concurrent viewers.
+        think: Seconds a viewer pauses between requests.
+        seed: Seed of the request choices.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        fake: FakeGitHub,
+        mix: List[Tuple[str, float]],
+        users: int,
+        think: float = 0.0,
+        seed: int = 0
+    ):
+        self.client = client
+        self.fake = fake
+        self.paths = [path for path, _ in mix]
+        self.weights = [weight for _, weight in mix]
+        self.users = users
+        self.think = think
+        self.rng = random.Random(seed)
+
+    def _url(self, path: str) -> str:
+        # Account views are requested for the simulated account.
+        if path == "/health":
+            return path
+        return f"{path}?username={self.fake.owner}"
+
+    async def _request(self, stats: PhaseStats, path: str):
+        start = time.perf_counter()
+        try:
+            response = await self.client.get(self._url(path))
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            ok = False
+        stats.record(path, time.perf_counter() - start, ok)
+
+    def _pick(self) -> str:
+        return self.rng.choices(self.paths, self.weights)[0]
+
+    async def refresh_phase(self, rounds: int) -> PhaseStats:
+        """All viewers request at once right after the cached data was dropped."""
+        stats = PhaseStats("refresh")
+        upstream = sum(self.fake.requests.values())
+        start = time.perf_counter()
+        for _ in range(rounds):
+            ttl_cache.clear()
+            response_cache.clear()
+            await asyncio.gather(*[self._request(stats, self._pick()) for _ in range(self.users)])
+        stats.seconds = time.perf_counter() - start
+        stats.upstream_requests = sum(self.fake.requests.values()) - upstream
+        return stats
+
+    async def cache_hit_phase(self, duration: float) -> PhaseStats:
+        """Viewers loop over the mix on warm caches for `duration` seconds."""
+        stats = PhaseStats("cache-hit")
+        upstream = sum(self.fake.requests.values())
+        start = time.perf_counter()
+        deadline = start + duration
+
+        async def viewer():
+            while time.perf_counter() < deadline:
+                await self._request(stats, self._pick())
+                if self.think:
+                    await asyncio.sleep(self.think)
+
+        await asyncio.gather(*[viewer() for _ in range(self.users)])
+        stats.seconds = time.perf_counter() - start
+        stats.upstream_requests = sum(self.fake.requests.values()) - upstream
+        return stats
+
+
+def _print_phase(stats: Dict[str, Any], name: str):
+    print(f"\n{name}: {stats['seconds']:.2f}s, {stats['upstream_requests']} upstream requests")
+    print(f"  {'path':14s} {'requests':>9s} {'errors':>7s} {'req/s':>8s}"
+          + "".join(f" {f'p{q} ms':>9s}" for q in PERCENTILES))
+    for path, row in stats["paths"].items():
+        print(f"  {path:14s} {row['requests']:9d} {row['errors']:7d} {row['rps']:8.1f}"
+              + "".join(f" {row[f'p{q}_ms']:9.2f}" for q in PERCENTILES))
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    fake = FakeGitHub(
+        repo_count=args.repos,
+        latency={"default": args.latency},
+        not_found={"pages": args.not_found, "readme": args.not_found},
+        rate_limit=10 ** 6,
+        seed=args.seed
+    )
+    client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://loadtest", timeout=None
+    )
+    async with simulated_github(fake, paced=args.paced), client:
+        load = LoadTest(client, fake, args.mix, args.users, think=args.think, seed=args.seed)
+        refresh = await load.refresh_phase(args.refresh_rounds)
+        cache_hit = await load.cache_hit_phase(args.duration)
+    return {"refresh": refresh.summary(), "cache-hit": cache_hit.summary()}
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="Concurrent load test against a simulated GitHub."
+    )
+    parser.add_argument("--users", type=int, default=50, help="concurrent viewers")
+    parser.add_argument("--repos", type=int, default=100,
+                        help="repositories of the simulated account")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f"weighted paths (default: {DEFAULT_MIX})")
+    parser.add_argument("--duration", type=float, default=10.0,
+                        help="seconds of the cache-hit phase")
+    parser.add_argument("--refresh-rounds", type=int, default=3, help="cache-miss storms to run")
+    parser.add_argument("--think", type=float, default=0.0,
+                        help="seconds between a viewer's requests")
+    parser.add_argument("--latency", type=float, default=0.02, help="simulated GitHub latency (s)")
+    parser.add_argument("--not-found", type=float, default=0.1,
+                        help="share of READMEs/Pages answering 404")
+    parser.add_argument("--paced", action="store_true", help="keep the production request pacing")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    report = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"{args.users} viewers, {args.repos} repositories, mix "
+          + ", ".join(f"{path}={weight:g}" for path, weight in args.mix))
+    for name, stats in report.items():
+        _print_phase(stats, name)
+
+
+if __name__ == "__main__":
+    main()
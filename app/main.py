@@ -1,18 +1,49 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
-from .api import dashboard, repos, health
+from .api import dashboard, repos, health, metrics, webhooks
+from .config import config
+from .exceptions import GitHubAPIError
+from .services.warmup import WarmupScheduler
 from .utils.logging import setup_logging
+from .utils.profiling import ProfilingMiddleware
 import os
 
 # Initialize logging
 setup_logging()
 
-app = FastAPI(title="GitHub Repo Observatory")
+def _warmup_accounts():
+    accounts = list(config.WARMUP_ACCOUNTS)
+    if config.WARMUP_AUTHENTICATED_USER and config.GITHUB_TOKEN:
+        accounts.append(None)
+    return accounts
 
-@app.on_event("shutdown")
-async def shutdown_event():
+warmup_scheduler = WarmupScheduler(
+    accounts=_warmup_accounts(),
+    refresh=repos.refresh_account,
+    lead_seconds=config.WARMUP_LEAD_SECONDS,
+    jitter_seconds=config.WARMUP_JITTER_SECONDS
+)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    warmup_scheduler.start()
+    yield
     from .services.github_client import github_client
+    from .cache.ttl_cache import ttl_cache
+    await warmup_scheduler.stop()
     await github_client.close()
+    ttl_cache.close()
+
+app = FastAPI(title="GitHub Repo Observatory", lifespan=lifespan)
+app.add_middleware(ProfilingMiddleware)
+
+@app.exception_handler(GitHubAPIError)
+async def github_api_error(request: Request, exc: GitHubAPIError):
+    """Reports GitHub failures as 404 for unknown accounts and 502 otherwise."""
+    status_code = 404 if exc.status_code == 404 else 502
+    return JSONResponse(status_code=status_code, content={"detail": str(exc)})
 
 # Mount static files
 static_path = os.path.join(os.path.dirname(__file__), "frontend", "static")
@@ -22,10 +53,11 @@ app.mount("/static", StaticFiles(directory=static_path), name="static")
 
 # Include routers
 app.include_router(health.router, tags=["Health"])
+app.include_router(metrics.router, tags=["Health"])
 app.include_router(repos.router, prefix="/api", tags=["API"])
+app.include_router(webhooks.router, prefix="/webhooks", tags=["Webhooks"])
 app.include_router(dashboard.router, tags=["Dashboard"])
 
 if __name__ == "__main__":
     import uvicorn
-    from .config import config
     uvicorn.run(app, host=config.APP_HOST, port=config.APP_PORT)
@@ -1,8 +1,29 @@
+import base64
+import binascii
 from pydantic import BaseModel, Field, field_validator, BeforeValidator
-from typing import Optional, Literal, Annotated
+from typing import Any, Dict, Optional, Literal, Annotated
 from .enums import FilterValue
+from .metrics import RepoMetrics
+from .repo import Repository
 from .validators import empty_to_none
 
+MAX_PAGE_SIZE = 500
+
+def encode_cursor(offset: int) -> str:
+    """Encodes a list offset as an opaque pagination cursor."""
+    return base64.urlsafe_b64encode(f"o:{offset}".encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> int:
+    """Decodes a cursor made by `encode_cursor`; raises ValueError if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    except (binascii.Error, UnicodeDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+    prefix, _, offset = raw.partition(":")
+    if prefix != "o" or not offset.isdigit():
+        raise ValueError("Invalid cursor")
+    return int(offset)
+
 class RepoListQuery(BaseModel):
     """Query parameters for repository list.
 
@@ -12,12 +33,20 @@ class RepoListQuery(BaseModel):
         filter_test: Filter by test status.
         filter_quality: Filter by quality tools.
         filter_codeql: Filter by CodeQL status.
+        limit: Maximum number of repositories per page; all when unset.
+        cursor: Opaque cursor of the page to return, from a previous `X-Next-Cursor`.
+        fields: Comma-separated fields to return, e.g. `name,metrics.build_status`.
     """
     username: Annotated[Optional[str], BeforeValidator(empty_to_none)] = None
     sort_by: Annotated[Optional[Literal["coverage", "status", "last_commit"]], BeforeValidator(empty_to_none)] = None
     filter_test: Annotated[Optional[FilterValue], BeforeValidator(empty_to_none)] = None
     filter_quality: Annotated[Optional[FilterValue], BeforeValidator(empty_to_none)] = None
     filter_codeql: Annotated[Optional[FilterValue], BeforeValidator(empty_to_none)] = None
+    limit: Annotated[
+        Optional[Annotated[int, Field(ge=1, le=MAX_PAGE_SIZE)]], BeforeValidator(empty_to_none)
+    ] = None
+    cursor: Annotated[Optional[str], BeforeValidator(empty_to_none)] = None
+    fields: Annotated[Optional[str], BeforeValidator(empty_to_none)] = None
 
     @field_validator('username')
     @classmethod
@@ -31,3 +60,42 @@ class RepoListQuery(BaseModel):
         if len(v) > 39:
             raise ValueError("Username too long")
         return v
+
+    @field_validator('cursor')
+    @classmethod
+    def validate_cursor(cls, v: Optional[str]) -> Optional[str]:
+        """Validates that the cursor was issued by this API."""
+        if v is not None:
+            decode_cursor(v)
+        return v
+
+    @field_validator('fields')
+    @classmethod
+    def validate_fields(cls, v: Optional[str]) -> Optional[str]:
+        """Validates field names against `Repository` and `RepoMetrics`."""
+        if v is None:
+            return v
+        for field in (f.strip() for f in v.split(",")):
+            top, _, sub = field.partition(".")
+            if top not in Repository.model_fields:
+                raise ValueError(f"Unknown field '{field}'")
+            if sub and (top != "metrics" or sub not in RepoMetrics.model_fields):
+                raise ValueError(f"Unknown field '{field}'")
+        return v
+
+    @property
+    def offset(self) -> int:
+        return decode_cursor(self.cursor) if self.cursor else 0
+
+    def projection(self) -> Optional[Dict[str, Any]]:
+        """Builds the `include` argument for `model_dump` from `fields`, or None for all fields."""
+        if self.fields is None:
+            return None
+        include: Dict[str, Any] = {}
+        for field in (f.strip() for f in self.fields.split(",")):
+            top, _, sub = field.partition(".")
+            if not sub:
+                include[top] = True
+            elif include.get(top) is not True:
+                include.setdefault(top, {})[sub] = True
+        return include
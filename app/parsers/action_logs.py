@@ -1,5 +1,100 @@
+import io
 import re
-from typing import Optional
+import zipfile
+from typing import IO, Dict, Iterable, Optional
+
+# Characters read per chunk from a log stream.
+CHUNK_SIZE = 1024 * 1024
+
+# One alternation over all supported test-result lines. Each alternative ends with a
+# named group that identifies the framework (`lastgroup`). Patterns never span lines.
+_RESULT_LINES = re.compile("|".join([
+    r"Tests:\s+(?P<jest>\d+) failed",                                             # jest
+    r"test result: FAILED\. \d+ passed; (?P<cargo>\d+) failed",                   # cargo
+    r"Tests run: \d+, Failures: (?P<maven_failures>\d+), Errors: (?P<maven>\d+)",  # JUnit/Maven
+    # pytest summaries start the line (after the timestamp, "=====" rule or colour codes),
+    # which keeps jest's "Test Suites: 1 failed, 2 passed" out.
+    r"^(?:\S+Z )?(?:=+ |\x1b\[[\d;]*m)*"
+    r"(?P<pytest>\d+) failed(?:, \d+ passed|[^\n]* in \d+(?:\.\d+)?s)",           # pytest
+    r"FAILED \([^)\n]*?failures=(?P<unittest>\d+)",                                # unittest
+    r"^(?:\S+Z )?--- FAIL: (?P<go>)",                                             # go test
+    r"(?i:tests failed): (?P<generic>\d+)",                                       # generic
+]), re.MULTILINE)
+
+# Maven repeats per-class results before its final summary, so only the last line counts;
+# every other framework prints one summary (or, for go, one line per failed test) per run.
+_LAST_ONLY = {"maven"}
+
+_FAIL = re.compile(r"(?i)fail")
+
+
+def _find_fail(text: str, lower: Optional[str], start: int, end: int) -> int:
+    """Offset of the next case-insensitive "fail" in `text[start:end]`, or -1.
+
+    `lower` is the lower-cased text if that keeps offsets (ASCII only), else None.
+    """
+    if lower is not None:
+        return lower.find("fail", start, end)
+    match = _FAIL.search(text, start, end)
+    return match.start() if match else -1
+
+
+class FailedTestScanner:
+    """Counts failed tests per framework in a single pass over a log fed in chunks.
+
+    Chunks are scanned up to their last newline and the remainder is carried over,
+    so memory stays bounded by the chunk size regardless of the log size.
+    """
+
+    def __init__(self):
+        self.counts: Dict[str, int] = {}
+        self._pending = ""
+
+    def feed(self, text: str):
+        text = self._pending + text
+        end = text.rfind("\n") + 1
+        self._pending = text[end:]
+        self._scan(text, end)
+
+    def close(self) -> Dict[str, int]:
+        """Scans the unterminated last line and returns the counts per framework."""
+        self._scan(self._pending, len(self._pending))
+        self._pending = ""
+        return self.counts
+
+    def _scan(self, text: str, end: int):
+        # Every result line mentions "fail" in some case. Finding those lines with a
+        # plain substring search and matching only them is far cheaper than running
+        # the alternation at every position of the log.
+        lower = text.lower() if text.isascii() else None
+        pos = _find_fail(text, lower, 0, end)
+        while pos != -1:
+            start = text.rfind("\n", 0, pos) + 1
+            stop = text.find("\n", pos, end)
+            if stop == -1:
+                stop = end
+            self._scan_line(text, start, stop)
+            pos = _find_fail(text, lower, stop, end)
+
+    def _scan_line(self, text: str, start: int, stop: int):
+        for match in _RESULT_LINES.finditer(text, start, stop):
+            framework = match.lastgroup
+            if framework == "go":
+                count = 1
+            elif framework == "maven":
+                count = int(match.group("maven_failures")) + int(match.group("maven"))
+            else:
+                count = int(match.group(framework))
+            if framework in _LAST_ONLY:
+                self.counts[framework] = count
+            else:
+                self.counts[framework] = self.counts.get(framework, 0) + count
+
+    @property
+    def total(self) -> Optional[int]:
+        """Failed tests over all frameworks, or None if no test results were seen."""
+        return sum(self.counts.values()) if self.counts else None
+
 
 class ActionLogsParser:
     @staticmethod
@@ -10,20 +105,42 @@ class ActionLogsParser:
         - "FAILED (failures=3)"
         - "3 failed, 10 passed"
         - "Tests failed: 5"
+        See `_RESULT_LINES` for all supported frameworks.
+        """
+        scanner = FailedTestScanner()
+        scanner.feed(log_content)
+        scanner.close()
+        return scanner.total
+
+    @staticmethod
+    def count_failed_tests_by_framework(chunks: Iterable[str]) -> Dict[str, int]:
+        """Counts failed tests per framework over a log given as text chunks."""
+        scanner = FailedTestScanner()
+        for chunk in chunks:
+            scanner.feed(chunk)
+        return scanner.close()
+
+    @staticmethod
+    def count_failed_tests_in_archive(archive: IO[bytes]) -> Optional[int]:
+        """Sums the failed tests over the job logs of a workflow run log archive.
+
+        Members are read one at a time, in chunks, without extracting the archive.
+        Only the per-job logs at the top level are read; the per-step logs in the job
+        directories repeat their content.
+
+        Returns:
+            The total, or None if no job log reports test results.
         """
-        # Pytest pattern: "3 failed, 10 passed"
-        pytest_match = re.search(r'(\d+) failed, \d+ passed', log_content)
-        if pytest_match:
-            return int(pytest_match.group(1))
-
-        # Unittest pattern: "FAILED (failures=3)"
-        unittest_match = re.search(r'FAILED \(failures=(\d+)\)', log_content)
-        if unittest_match:
-            return int(unittest_match.group(1))
-
-        # Generic pattern
-        generic_match = re.search(r'Tests failed: (\d+)', log_content, re.IGNORECASE)
-        if generic_match:
-            return int(generic_match.group(1))
-
-        return None
+        total: Optional[int] = None
+        with zipfile.ZipFile(archive) as zf:
+            members = [m for m in zf.infolist() if not m.is_dir() and m.filename.endswith(".txt")]
+            job_logs = [m for m in members if "/" not in m.filename] or members
+            for member in job_logs:
+                with zf.open(member) as raw:
+                    text = io.TextIOWrapper(raw, encoding="utf-8", errors="replace")
+                    counts = ActionLogsParser.count_failed_tests_by_framework(
+                        iter(lambda: text.read(CHUNK_SIZE), "")
+                    )
+                if counts:
+                    total = (total or 0) + sum(counts.values())
+        return total
@@ -0,0 +1,80 @@
+import re
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional
+from .readme_parser import ReadmeParser
+
+# Static Shields.io badge: /badge/<LABEL>-<MESSAGE>-<COLOR>
+_STATIC_BADGE = re.compile(r'/badge/([^/]+)-([^/]+)-([^/]+)')
+_NUMBER = re.compile(r'(\d+(?:\.\d+)?)')
+# Quality tools recognised by a substring of the lower-cased badge URL, in reporting order.
+_QUALITY_TOOLS = (
+    ("sonar", "SonarCloud"),
+    ("codeclimate", "Code Climate"),
+    ("codeql", "CodeQL"),
+    ("codecov", "Codecov"),
+)
+_VERSION_LABELS = {"version", "v", "release"}
+
+
+@dataclass(frozen=True)
+class BadgeAnalysis:
+    """Everything the services derive from a README's badges, computed in one pass.
+
+    Attributes:
+        coverage: Percentage from the first coverage badge.
+        version: Version from the first version badge, without a leading `v`.
+        quality_tools: Detected quality tools, in order of first appearance.
+        codeql: Whether a CodeQL badge is present.
+    """
+    coverage: Optional[float] = None
+    version: Optional[str] = None
+    quality_tools: List[str] = field(default_factory=list)
+    codeql: bool = False
+
+    @classmethod
+    def from_badges(cls, badges: Iterable[str]) -> "BadgeAnalysis":
+        """Classifies every badge URL once with precompiled patterns."""
+        coverage: Optional[float] = None
+        version: Optional[str] = None
+        tools: List[str] = []
+        missing_tools = list(_QUALITY_TOOLS)
+
+        for url in badges:
+            if missing_tools:
+                url_lower = url.lower()
+                for tool in [t for t in missing_tools if t[0] in url_lower]:
+                    missing_tools.remove(tool)
+                    tools.append(tool[1])
+
+            if (coverage is not None and version is not None) or "img.shields.io" not in url:
+                continue
+            static = _STATIC_BADGE.search(url)
+            if not static:
+                continue
+            label = static.group(1).replace('_', ' ').lower()
+            if coverage is None and ("coverage" in label or label == "cov"):
+                number = _NUMBER.search(static.group(2))
+                if number:
+                    coverage = float(number.group(1))
+            elif version is None and label in _VERSION_LABELS:
+                message = static.group(2).replace('_', ' ').replace('%25', '%').lstrip('v')
+                version = message or None
+
+        return cls(
+            coverage=coverage, version=version, quality_tools=tools, codeql="CodeQL" in tools
+        )
+
+
+@dataclass(frozen=True)
+class ReadmeBadges:
+    """The badges of a README together with their analysis."""
+    badges: List[str] = field(default_factory=list)
+    analysis: BadgeAnalysis = field(default_factory=BadgeAnalysis)
+
+    @classmethod
+    def from_badges(cls, badges: List[str]) -> "ReadmeBadges":
+        return cls(badges, BadgeAnalysis.from_badges(badges))
+
+    @classmethod
+    def from_readme(cls, content: str) -> "ReadmeBadges":
+        return cls.from_badges(ReadmeParser.extract_badges(content))
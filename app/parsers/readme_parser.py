@@ -15,3 +15,46 @@ class ReadmeParser:
         html_images = re.findall(r'<img [^>]*src="([^"]+)"', content)
 
         return list(set(md_images + html_images))
+
+class ReadmeHead:
+    """Collects the start of a README fed in chunks until its badge region has ended.
+
+    Badges live at the top of a README, possibly below a logo and spread over short
+    sections (`## Badges`, `## Status`). Once at least one image has been seen, a run
+    of `CONTENT_RUN` non-blank lines without any image ends the region and `feed`
+    returns True, so callers can stop reading. A README without images near the top
+    is read until the caller's byte cap.
+    """
+
+    CONTENT_RUN = 10
+    _IMAGE = re.compile(r'!\[|<img\s', re.IGNORECASE)
+
+    def __init__(self):
+        self._lines: List[str] = []
+        self._pending = ""
+        self._seen_badges = False
+        self._content_run = 0
+        self.ended = False
+
+    def feed(self, text: str) -> bool:
+        """Adds decoded text; returns True once the badge region has ended."""
+        if self.ended:
+            return True
+        lines = (self._pending + text).split("\n")
+        self._pending = lines.pop()
+        for line in lines:
+            self._lines.append(line)
+            if self._IMAGE.search(line):
+                self._seen_badges = True
+                self._content_run = 0
+            elif self._seen_badges and line.strip():
+                self._content_run += 1
+                if self._content_run >= self.CONTENT_RUN:
+                    self.ended = True
+                    return True
+        return False
+
+    def text(self, complete: bool = False) -> str:
+        """The collected text; an unfinished last line is only included if `complete`."""
+        lines = self._lines + ([self._pending] if complete and not self.ended else [])
+        return "\n".join(lines)
@@ -1,6 +1,12 @@
+import asyncio
+import zipfile
 from typing import List, Dict, Any, Optional
 from .github_client import github_client
+from ..cache.keys import failed_tests_cache_key
+from ..cache.ttl_cache import ttl_cache
+from ..config import config
 from ..models.enums import BuildStatus
+from ..parsers.action_logs import ActionLogsParser
 from ..utils.logging import logger
 
 class ActionsService:
@@ -19,9 +25,13 @@ class ActionsService:
         if not runs:
             return BuildStatus.UNKNOWN
 
-        latest_run = runs[0]
-        status = latest_run.get("status")
-        conclusion = latest_run.get("conclusion")
+        return ActionsService.status_from_run(runs[0])
+
+    @staticmethod
+    def status_from_run(run: Dict[str, Any]) -> BuildStatus:
+        """Maps a workflow run (from the API or a `workflow_run` webhook) to a BuildStatus."""
+        status = run.get("status")
+        conclusion = run.get("conclusion")
 
         if status == "completed":
             if conclusion == "success":
@@ -37,6 +47,41 @@ class ActionsService:
 
     @staticmethod
     async def get_failed_tests_count(owner: str, repo: str) -> Optional[int]:
-        """Fetches the number of failed tests (placeholder)."""
-        # Log parsing is currently not implemented due to API complexity.
-        return None
+        """Counts the failed tests of the last workflow run.
+
+        Successful runs count as 0 without looking at their logs. For failed runs the
+        log archive is downloaded and parsed off the event loop; the result is cached
+        by run id because a completed run's logs never change.
+
+        Returns:
+            The number of failed tests, or None if unknown (no run, still running, or
+            no test summary in the logs).
+        """
+        runs = await github_client.get_workflow_runs(owner, repo)
+        if not runs or runs[0].get("status") != "completed":
+            return None
+        run = runs[0]
+        if run.get("conclusion") == "success":
+            return 0
+        if run.get("conclusion") != "failure":
+            return None
+
+        key = failed_tests_cache_key(f"{owner}/{repo}", run["id"])
+        cached = ttl_cache.get(key)
+        if cached is not None:
+            # Runs without a test summary are cached as -1.
+            return cached if cached >= 0 else None
+
+        archive = await github_client.get_workflow_run_logs(owner, repo, run["id"])
+        if archive is None:
+            return None
+        try:
+            count = await asyncio.to_thread(ActionLogsParser.count_failed_tests_in_archive, archive)
+        except (zipfile.BadZipFile, zipfile.LargeZipFile, OSError, EOFError) as e:
+            # Truncated or unusual archives fail in zipfile or in the decompressor.
+            logger.warning(f"Unreadable logs of run {run['id']} in {owner}/{repo}: {e}")
+            return None
+        finally:
+            archive.close()
+        ttl_cache.set(key, -1 if count is None else count, ttl=config.REPO_METRICS_TTL)
+        return count
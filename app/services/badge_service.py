@@ -1,11 +1,58 @@
-from typing import List
-from ..parsers.readme_parser import ReadmeParser
+import codecs
+import httpx
+from typing import List, Optional
+from ..cache.readme_cache import readme_cache
+from ..config import config
+from ..parsers.badge_analysis import ReadmeBadges
+from ..parsers.readme_parser import ReadmeHead
+from ..utils.logging import logger
 from .github_client import github_client
 
 class BadgeService:
+    @staticmethod
+    async def get_readme_badges(owner: str, repo: str) -> ReadmeBadges:
+        """Returns the README's badges and their analysis.
+
+        The raw README is streamed and decoded incrementally; reading stops at
+        `README_MAX_BYTES` or as soon as the badge region at the top has ended.
+        Results are cached by the README's ETag, so an unchanged README revalidates
+        with a bodiless 304 and is neither downloaded nor parsed again.
+        """
+        try:
+            readme = await BadgeService._read_readme(owner, repo, conditional=True)
+            if readme is None:
+                # 304 for an analysis that has since been evicted: fetch it again.
+                readme = await BadgeService._read_readme(owner, repo, conditional=False)
+        except httpx.RequestError as e:
+            logger.warning(f"Fetching README of {owner}/{repo} failed: {e}")
+            return ReadmeBadges()
+        return readme or ReadmeBadges()
+
+    @staticmethod
+    async def _read_readme(owner: str, repo: str, conditional: bool) -> Optional[ReadmeBadges]:
+        async with github_client.open_readme(owner, repo, conditional=conditional) as response:
+            if response is None:
+                return ReadmeBadges()
+            key = response.headers.get("ETag")
+            cached = readme_cache.get(key)
+            if cached is not None or response.status_code == 304:
+                return cached
+
+            head = ReadmeHead()
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            remaining = config.README_MAX_BYTES
+            async for chunk in response.aiter_bytes():
+                chunk = chunk[:remaining]
+                remaining -= len(chunk)
+                if head.feed(decoder.decode(chunk)) or remaining <= 0:
+                    break
+            else:
+                head.feed(decoder.decode(b"", final=True))
+            readme = ReadmeBadges.from_readme(head.text(complete=remaining > 0))
+            # Truncated reads are keyed like complete ones: the badges are what is kept.
+            readme_cache.store(key, readme)
+            return readme
+
     @staticmethod
     async def get_all_badges(owner: str, repo: str) -> List[str]:
-        readme = await github_client.get_readme(owner, repo)
-        if not readme:
-            return []
-        return ReadmeParser.extract_badges(readme)
+        return (await BadgeService.get_readme_badges(owner, repo)).badges
@@ -1,14 +1,17 @@
 from typing import Optional
 from .badge_service import BadgeService
-from ..parsers.shield_parser import ShieldParser
+from ..parsers.badge_analysis import BadgeAnalysis
 
 class CoverageService:
     @staticmethod
-    async def get_coverage(owner: str, repo: str, badges: Optional[list[str]] = None) -> Optional[float]:
-        if badges is None:
-            badges = await BadgeService.get_all_badges(owner, repo)
-        for badge_url in badges:
-            coverage = ShieldParser.extract_coverage(badge_url)
-            if coverage is not None:
-                return coverage
-        return None
+    async def get_coverage(
+        owner: str,
+        repo: str,
+        badges: Optional[list[str]] = None,
+        analysis: Optional[BadgeAnalysis] = None
+    ) -> Optional[float]:
+        if analysis is None:
+            if badges is None:
+                badges = await BadgeService.get_all_badges(owner, repo)
+            analysis = BadgeAnalysis.from_badges(badges)
+        return analysis.coverage
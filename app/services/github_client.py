@@ -1,15 +1,73 @@
-import base64
+import asyncio
 import httpx
 import re
-from typing import List, Dict, Any, Optional
+import tempfile
+import time
+from contextlib import AsyncExitStack, asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import IO, AsyncIterator, Iterator, List, Dict, Any, Optional
+from urllib.parse import urlencode
 from ..config import config
+from ..exceptions import GitHubAPIError
+from ..cache.validator_cache import ValidatorCache
 from ..utils.rate_limit import github_rate_limiter
+from ..utils.metrics import github_request_duration, github_requests
+from ..utils.profiling import span
 from ..utils.logging import logger
 from ..utils.decorators import handle_github_api_errors
 from ..models.github_types import GitHubUser, WorkflowRun, CommitInfo, RepositoryData
 
+REPOS_PER_PAGE = 100
+
+# Requests of the current fetch cycle by URL, shared by every task started within it.
+_fetch_cycle: ContextVar[Optional[Dict[str, "asyncio.Future[httpx.Response]"]]] = ContextVar(
+    "fetch_cycle", default=None
+)
+
+# Endpoint families for metrics, matched against the path below /repos/{owner}/{repo}/.
+_REPO_ENDPOINT_FAMILIES = (
+    (re.compile(r"^actions/runs/\d+/logs$"), "logs"),
+    (re.compile(r"^actions/runs$"), "runs"),
+    (re.compile(r"^readme$"), "readme"),
+    (re.compile(r"^commits$"), "commits"),
+    (re.compile(r"^pages$"), "pages"),
+    (re.compile(r"^releases(/latest)?$"), "releases"),
+    (re.compile(r"^tags$"), "tags"),
+)
+_REPO_PATH = re.compile(r"^/repos/[^/]+/[^/]+/(.+)$")
+
+
+def endpoint_family(path: str) -> str:
+    """Groups an API path into a low-cardinality family (`readme`, `runs`, ...)."""
+    if path == "/user":
+        return "user"
+    if path == "/graphql":
+        return "graphql"
+    if re.match(r"^/users?/(?:[^/]+/)?repos$", path):
+        return "repos"
+    match = _REPO_PATH.match(path)
+    if match:
+        for pattern, family in _REPO_ENDPOINT_FAMILIES:
+            if pattern.match(match.group(1)):
+                return family
+    return "other"
+
+
+def _record_request(family: str, status: Any, started: float):
+    github_requests.inc(family=family, status=str(status))
+    github_request_duration.observe(time.perf_counter() - started, family=family)
+
+
+def _last_page_from_link(link_header: Optional[str]) -> Optional[int]:
+    """Extracts the page number of the `rel="last"` entry of a Link header."""
+    if not link_header:
+        return None
+    match = re.search(r'\bpage=(\d+)[^>]*>; rel="last"', link_header)
+    return int(match.group(1)) if match else None
+
+
 class GitHubClient:
-    def __init__(self):
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
         self.base_url = "https://api.github.com"
         self.headers = {
             "Accept": "application/vnd.github.v3+json",
@@ -18,30 +76,170 @@ class GitHubClient:
         if config.GITHUB_TOKEN:
             self.headers["Authorization"] = f"token {config.GITHUB_TOKEN}"
         self._client = None
+        self._transport = transport
+        self.validators = ValidatorCache(max_entries=config.CONDITIONAL_CACHE_MAX_ENTRIES)
+        self.dedup_hits = 0
 
     def get_client(self):
         if self._client is None or self._client.is_closed:
-            self._client = httpx.AsyncClient(headers=self.headers, timeout=30.0)
+            self._client = httpx.AsyncClient(
+                headers=self.headers, timeout=30.0, transport=self._transport
+            )
         return self._client
 
     async def close(self):
         if self._client and not self._client.is_closed:
             await self._client.aclose()
 
-    async def _get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Any:
+    async def use_transport(self, transport: Optional[httpx.AsyncBaseTransport]):
+        """Sends all further requests through `transport` (None for the network)."""
+        await self.close()
+        self._client = None
+        self._transport = transport
+
+    def _update_rate_limiter(self, response: httpx.Response):
+        rate_limited = False
+        if response.status_code in (403, 429):
+            rate_limited = "rate limit" in response.text.lower()
+            if rate_limited:
+                logger.error(f"GitHub API rate limit exceeded: {response.text}")
+        github_rate_limiter.update_from_headers(
+            response.headers, response.status_code, rate_limited
+        )
+
+    async def _update_rate_limiter_streamed(self, response: httpx.Response):
+        """`_update_rate_limiter` for a streamed response, whose body is not read yet."""
+        if response.status_code in (403, 429):
+            # Error bodies are small; they tell rate limits from permission errors.
+            await response.aread()
+        self._update_rate_limiter(response)
+
+    @staticmethod
+    @contextmanager
+    def fetch_cycle() -> Iterator[None]:
+        """Shares GET responses between all requests made within the block.
+
+        Within a cycle (e.g. one refresh of an account) identical GETs - same URL and
+        parameters - are sent once: later callers await the in-flight request or get
+        its completed response, headers included. Nested cycles join the outer one.
+        """
+        if _fetch_cycle.get() is not None:
+            yield
+            return
+        token = _fetch_cycle.set({})
+        try:
+            yield
+        finally:
+            _fetch_cycle.reset(token)
+
+    async def _request(
+        self, endpoint: str, params: Optional[Dict[str, Any]] = None
+    ) -> httpx.Response:
+        """Performs a conditional GET request, deduplicated within a fetch cycle."""
+        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        cache_key = f"{url}?{urlencode(sorted(params.items()))}" if params else url
+        memo = _fetch_cycle.get()
+        if memo is None:
+            return await self._send(url, cache_key, params)
+
+        future = memo.get(cache_key)
+        if future is None:
+            future = asyncio.ensure_future(self._send(url, cache_key, params))
+            future.add_done_callback(lambda f: self._forget_failed(memo, cache_key, f))
+            memo[cache_key] = future
+        else:
+            self.dedup_hits += 1
+        return await asyncio.shield(future)
+
+    @staticmethod
+    def _forget_failed(
+        memo: Dict[str, "asyncio.Future[httpx.Response]"],
+        cache_key: str,
+        future: "asyncio.Future[httpx.Response]"
+    ):
+        # Failed requests are not shared with later callers, so retries really retry.
+        if future.cancelled() or future.exception() is not None:
+            if memo.get(cache_key) is future:
+                del memo[cache_key]
+
+    async def _send(
+        self, url: str, cache_key: str, params: Optional[Dict[str, Any]] = None
+    ) -> httpx.Response:
+        """Sends a conditional GET request.
+
+        Stored ETag/Last-Modified validators are sent as If-None-Match/If-Modified-Since.
+        A 304 answer (which is free of rate-limit cost) replays the stored response.
+        """
         await github_rate_limiter.wait()
         client = self.get_client()
-        url = f"{self.base_url}/{endpoint.lstrip('/')}"
-        response = await client.get(url, params=params)
+        cached = self.validators.get(cache_key)
+        headers = cached.request_headers() if cached else {}
+        family = endpoint_family(httpx.URL(url).path)
+        started = time.perf_counter()
+        with span("github_request", family=family) as attrs:
+            try:
+                response = await client.get(url, params=params, headers=headers)
+            except httpx.RequestError:
+                _record_request(family, "error", started)
+                raise
+            attrs["status"] = response.status_code
+        _record_request(family, response.status_code, started)
 
-        if response.status_code == 403 and "rate limit exceeded" in response.text.lower():
-            logger.error(f"GitHub API rate limit exceeded: {response.text}")
-            github_rate_limiter.trigger_backoff()
-            response.raise_for_status()
+        self._update_rate_limiter(response)
+
+        if response.status_code == 304 and cached:
+            self.validators.record_hit()
+            return cached.response
 
         response.raise_for_status()
+        if response.status_code == 200:
+            self.validators.record_miss()
+            self.validators.store(
+                cache_key,
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified"),
+                response
+            )
+        return response
+
+    async def _get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        response = await self._request(endpoint, params)
         return response.json()
 
+    async def graphql(
+        self, query: str, variables: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Executes a GraphQL query and returns its `data` object.
+
+        Raises:
+            GitHubAPIError: If the response carries errors and no data at all.
+        """
+        await github_rate_limiter.wait(resource="graphql")
+        client = self.get_client()
+        url = f"{self.base_url}/graphql"
+        started = time.perf_counter()
+        with span("github_request", family="graphql") as attrs:
+            try:
+                response = await client.post(
+                    url, json={"query": query, "variables": variables or {}}
+                )
+            except httpx.RequestError:
+                _record_request("graphql", "error", started)
+                raise
+            attrs["status"] = response.status_code
+        _record_request("graphql", response.status_code, started)
+        self._update_rate_limiter(response)
+
+        response.raise_for_status()
+        payload = response.json()
+        if payload.get("errors"):
+            if not payload.get("data"):
+                raise GitHubAPIError(
+                    f"GraphQL query failed: {payload['errors']}", response.status_code
+                )
+            logger.debug(f"GraphQL partial errors: {payload['errors']}")
+        return payload.get("data") or {}
+
     @handle_github_api_errors(default_return={})
     async def get_authenticated_user(self) -> GitHubUser:
         """Fetch the authenticated user's profile."""
@@ -49,22 +247,116 @@ class GitHubClient:
 
     @handle_github_api_errors(default_return=[])
     async def get_user_repos(self, username: Optional[str] = None) -> List[RepositoryData]:
-        """Fetch repositories for a user. If username is None, fetch for the authenticated user."""
-        if username:
-            return await self._get(f"users/{username}/repos")
-        else:
-            return await self._get("user/repos")
+        """Fetch all repositories for a user, or for the authenticated user if username is None."""
+        return [repo async for repo in self.iter_user_repos(username)]
 
-    @handle_github_api_errors(default_return=None)
-    async def get_readme(self, owner: str, repo: str) -> Optional[str]:
-        """Fetch the README content for a repository.
+    async def iter_user_repos(
+        self, username: Optional[str] = None
+    ) -> AsyncIterator[RepositoryData]:
+        """Yield all repositories for a user, page by page.
 
-        Returns:
-            README content as string, or None if not found/accessible
+        The first page's `Link: rel="last"` header tells how many pages exist; the
+        remaining pages are then requested concurrently (each one still passes the
+        rate limiter) and yielded in page order as soon as all earlier pages are in,
+        so callers can start working on repositories before the last page arrives.
+
+        Raises:
+            httpx.HTTPStatusError, httpx.RequestError: If a page fails (5xx and
+                connection errors after one retry). The listing is never silently
+                truncated.
+        """
+        endpoint = f"users/{username}/repos" if username else "user/repos"
+        first = await self._request_with_retry(
+            endpoint, params={"per_page": REPOS_PER_PAGE, "page": 1}
+        )
+        for repo in first.json():
+            yield repo
+
+        last_page = _last_page_from_link(first.headers.get("Link")) or 1
+        if last_page <= 1:
+            return
+
+        tasks = [
+            asyncio.create_task(self._request_with_retry(
+                endpoint, params={"per_page": REPOS_PER_PAGE, "page": page}
+            ))
+            for page in range(2, last_page + 1)
+        ]
+        try:
+            for task in tasks:
+                for repo in (await task).json():
+                    yield repo
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _request_with_retry(
+        self, endpoint: str, params: Optional[Dict[str, Any]] = None, attempts: int = 2
+    ) -> httpx.Response:
+        """Sends a GET, retrying server errors and failed connections.
+
+        Client errors (404, 401, ...) would fail again and only cost quota, so they
+        are raised right away.
         """
-        data = await self._get(f"repos/{owner}/{repo}/readme")
-        content = base64.b64decode(data["content"]).decode("utf-8")
-        return content
+        for attempt in range(1, attempts + 1):
+            try:
+                return await self._request(endpoint, params)
+            except (httpx.HTTPStatusError, httpx.RequestError) as e:
+                client_error = (
+                    isinstance(e, httpx.HTTPStatusError) and e.response.status_code < 500
+                )
+                if client_error or attempt == attempts:
+                    raise
+                logger.warning(f"{endpoint} {params}: {type(e).__name__}: {e}; retrying")
+        raise AssertionError("unreachable")
+
+    @asynccontextmanager
+    async def open_readme(
+        self, owner: str, repo: str, conditional: bool = True
+    ) -> AsyncIterator[Optional[httpx.Response]]:
+        """Opens a streamed request for the raw README (no JSON/base64 envelope).
+
+        The body is not read; callers consume as much of it as they need with
+        `aiter_bytes()`. With `conditional`, the stored ETag is sent and an unchanged
+        README yields a `304` response without a body. Yields None if the repository
+        has no README. Streamed requests are not shared within a fetch cycle.
+
+        Raises:
+            httpx.RequestError: If the connection fails.
+        """
+        await github_rate_limiter.wait()
+        url = f"{self.base_url}/repos/{owner}/{repo}/readme"
+        cache_key = f"{url}#raw"
+        cached = self.validators.get(cache_key) if conditional else None
+        headers = {"Accept": "application/vnd.github.raw+json"}
+        if cached:
+            headers.update(cached.request_headers())
+
+        async with AsyncExitStack() as stack:
+            # The span ends with the headers; reading the body is up to the caller.
+            started = time.perf_counter()
+            with span("github_request", family="readme") as attrs:
+                response = await stack.enter_async_context(
+                    self.get_client().stream("GET", url, headers=headers)
+                )
+                _record_request("readme", response.status_code, started)
+                attrs["status"] = response.status_code
+                await self._update_rate_limiter_streamed(response)
+            if response.status_code == 304 and cached:
+                self.validators.record_hit()
+                yield response
+            elif response.status_code == 200:
+                self.validators.record_miss()
+                self.validators.store(
+                    cache_key,
+                    response.headers.get("ETag"),
+                    response.headers.get("Last-Modified"),
+                    None
+                )
+                yield response
+            else:
+                logger.debug(f"README of {owner}/{repo}: HTTP {response.status_code}")
+                yield None
 
     @handle_github_api_errors(default_return=[])
     async def get_workflow_runs(self, owner: str, repo: str) -> List[WorkflowRun]:
@@ -72,10 +364,44 @@ class GitHubClient:
         data = await self._get(f"repos/{owner}/{repo}/actions/runs", params={"per_page": 5})
         return data.get("workflow_runs", [])
 
-    async def get_workflow_run_logs(self, owner: str, repo: str, run_id: int) -> Optional[str]:
-        """Fetch logs for a workflow run."""
-        # Note: Parsing logs from the zip is complex.
-        return None
+    async def get_workflow_run_logs(
+        self, owner: str, repo: str, run_id: int
+    ) -> Optional[IO[bytes]]:
+        """Download the log archive (a zip) of a workflow run.
+
+        The archive is streamed into a spooled temporary file: it stays in memory up
+        to `WORKFLOW_LOG_SPOOL_BYTES` and moves to disk beyond that, so large logs
+        never have to fit in memory. The caller owns (and closes) the returned file.
+
+        Returns:
+            The rewound archive, or None if the logs are missing, expired or inaccessible.
+        """
+        await github_rate_limiter.wait()
+        url = f"{self.base_url}/repos/{owner}/{repo}/actions/runs/{run_id}/logs"
+        spool = tempfile.SpooledTemporaryFile(max_size=config.WORKFLOW_LOG_SPOOL_BYTES)
+        with span("github_request", family="logs") as attrs:
+            try:
+                # GitHub redirects to short-lived storage; httpx drops the token on the way.
+                started = time.perf_counter()
+                async with self.get_client().stream("GET", url, follow_redirects=True) as response:
+                    api_response = response.history[0] if response.history else response
+                    _record_request("logs", api_response.status_code, started)
+                    await self._update_rate_limiter_streamed(api_response)
+                    attrs["status"] = response.status_code
+                    if response.status_code != 200:
+                        logger.debug(
+                            f"Logs of run {run_id} in {owner}/{repo}: HTTP {response.status_code}"
+                        )
+                        spool.close()
+                        return None
+                    async for chunk in response.aiter_bytes():
+                        spool.write(chunk)
+            except (httpx.RequestError, httpx.StreamError) as e:
+                logger.warning(f"Downloading logs of run {run_id} in {owner}/{repo} failed: {e}")
+                spool.close()
+                return None
+        spool.seek(0)
+        return spool
 
     @handle_github_api_errors(default_return=None)
     async def get_last_commit(self, owner: str, repo: str) -> Optional[CommitInfo]:
@@ -86,24 +412,14 @@ class GitHubClient:
     @handle_github_api_errors(default_return=0)
     async def get_commit_count(self, owner: str, repo: str) -> int:
         """Estimate commit count using the Link header from the commits endpoint."""
-        # Note: _get already does wait(), but here we use client.get directly for Link header
-        await github_rate_limiter.wait()
-        client = self.get_client()
-        url = f"{self.base_url}/repos/{owner}/{repo}/commits"
-        response = await client.get(url, params={"per_page": 1})
-
-        if response.status_code == 403 and "rate limit exceeded" in response.text.lower():
-            github_rate_limiter.trigger_backoff()
-            response.raise_for_status()
+        response = await self._request(f"repos/{owner}/{repo}/commits", params={"per_page": 1})
 
         if response.status_code != 200:
             return 0
 
-        if "Link" in response.headers:
-            links = response.headers["Link"]
-            match = re.search(r'page=(\d+)>; rel="last"', links)
-            if match:
-                return int(match.group(1))
+        last_page = _last_page_from_link(response.headers.get("Link"))
+        if last_page:
+            return last_page
 
         return len(response.json())
 
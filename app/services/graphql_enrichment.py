@@ -0,0 +1,165 @@
+import asyncio
+from typing import Any, Dict, List, Optional
+from .github_client import github_client
+from .actions_service import ActionsService
+from .badge_service import BadgeService
+from .coverage_service import CoverageService
+from .quality_service import QualityService
+from ..config import config
+from ..models.enums import CodeQLStatus
+from ..models.metrics import RepoMetrics
+from ..models.repo import Repository
+from ..models.github_types import RepositoryData
+from ..cache.readme_cache import readme_cache
+from ..parsers.badge_analysis import ReadmeBadges
+from ..utils.decorators import handle_github_api_errors
+
+# Common README locations, tried in order. GitHub's /readme endpoint accepts more names
+# and extensions (and looks in docs/ and .github/ too), so repositories where none of
+# these resolve fall back to a REST README fetch.
+README_EXPRESSIONS = [
+    "HEAD:README.md", "HEAD:README.rst", "HEAD:README", "HEAD:readme.md", "HEAD:Readme.md",
+    "HEAD:README.markdown", "HEAD:README.txt", "HEAD:docs/README.md", "HEAD:.github/README.md",
+]
+
+REPO_FIELDS = """
+    homepageUrl
+    %(readme_fields)s
+    defaultBranchRef {
+      target {
+        ... on Commit {
+          committedDate
+          history { totalCount }
+        }
+      }
+    }
+    latestRelease { tagName }
+    refs(refPrefix: "refs/tags/", first: 1, orderBy: {field: TAG_COMMIT_DATE, direction: DESC}) {
+      nodes { name }
+    }
+""" % {
+    "readme_fields": "\n    ".join(
+        f'readme{i}: object(expression: "{expr}") {{ ... on Blob {{ oid text }} }}'
+        for i, expr in enumerate(README_EXPRESSIONS)
+    )
+}
+
+
+class GraphQLEnrichmentService:
+    """Enriches repositories in batches with aliased GraphQL queries.
+
+    One round trip per batch replaces the README, commit, release and tag REST calls.
+    Build status and the Pages URL are not exposed by GraphQL and still use REST.
+    """
+
+    @staticmethod
+    def build_batch_query(repos: List[RepositoryData]) -> tuple[str, Dict[str, str]]:
+        """Builds an aliased query (`r0`, `r1`, ...) and its variables for a batch."""
+        declarations = []
+        selections = []
+        variables: Dict[str, str] = {}
+        for i, repo in enumerate(repos):
+            declarations.append(f"$o{i}: String!, $n{i}: String!")
+            selections.append(f"r{i}: repository(owner: $o{i}, name: $n{i}) {{{REPO_FIELDS}}}")
+            variables[f"o{i}"] = repo["owner"]["login"]
+            variables[f"n{i}"] = repo["name"]
+        query = f"query({', '.join(declarations)}) {{\n" + "\n".join(selections) + "\n}"
+        return query, variables
+
+    @staticmethod
+    async def _build_repository(repo: RepositoryData, node: Dict[str, Any]) -> Repository:
+        owner = repo["owner"]["login"]
+        name = repo["name"]
+
+        blob = next(
+            (node[f"readme{i}"] for i in range(len(README_EXPRESSIONS))
+             if (node.get(f"readme{i}") or {}).get("text") is not None),
+            None
+        )
+        if blob is not None:
+            readme = readme_cache.get(blob.get("oid"))
+            if readme is None:
+                readme = ReadmeBadges.from_readme(blob["text"])
+                readme_cache.store(blob.get("oid"), readme)
+        else:
+            readme = await BadgeService.get_readme_badges(owner, name)
+        badges, analysis = readme.badges, readme.analysis
+
+        head = ((node.get("defaultBranchRef") or {}).get("target")) or {}
+        tags = ((node.get("refs") or {}).get("nodes")) or []
+        release = (node.get("latestRelease") or {}).get("tagName")
+        version = analysis.version
+        if not version and release:
+            version = release.lstrip('v')
+        if not version and tags:
+            version = tags[0]["name"].lstrip('v')
+
+        # Build status and failed tests read the same workflow runs response.
+        with github_client.fetch_cycle():
+            (build_status, failing_tests, coverage, quality_tools, codeql_status,
+             pages_url) = await asyncio.gather(
+                ActionsService.get_build_status(owner, name),
+                ActionsService.get_failed_tests_count(owner, name),
+                CoverageService.get_coverage(owner, name, analysis=analysis),
+                QualityService.get_quality_tools(owner, name, analysis=analysis),
+                QualityService.get_codeql_status(owner, name, analysis=analysis),
+                (
+                    github_client.get_pages_url(owner, name)
+                    if repo.get("has_pages") else asyncio.sleep(0)
+                )
+            )
+
+        metrics = RepoMetrics(
+            build_status=build_status,
+            failing_tests_count=failing_tests,
+            coverage_percentage=coverage,
+            quality_tools=quality_tools,
+            codeql_status=CodeQLStatus.ACTIVE if codeql_status == "active" else CodeQLStatus.NONE,
+            last_commit_at=head.get("committedDate"),
+            commit_count=(head.get("history") or {}).get("totalCount"),
+            readme_badges=badges,
+            version=version
+        )
+
+        return Repository(
+            name=name,
+            full_name=repo["full_name"],
+            html_url=repo["html_url"],
+            pages_url=pages_url or node.get("homepageUrl") or repo.get("homepage"),
+            description=repo.get("description"),
+            metrics=metrics
+        )
+
+    @staticmethod
+    @handle_github_api_errors(default_return={})
+    async def fetch_batch(repos: List[RepositoryData]) -> Dict[str, Repository]:
+        """Enriches one batch of repositories with a single GraphQL round trip.
+
+        Returns:
+            Repositories keyed by `full_name`. Repositories GraphQL could not resolve are
+            missing from the result so the caller can fall back to REST for them.
+        """
+        if not repos:
+            return {}
+        query, variables = GraphQLEnrichmentService.build_batch_query(repos)
+        data = await github_client.graphql(query, variables)
+
+        resolved = [(repo, data.get(f"r{i}")) for i, repo in enumerate(repos)]
+        built = await asyncio.gather(*[
+            GraphQLEnrichmentService._build_repository(repo, node)
+            for repo, node in resolved if node
+        ])
+        return {r.full_name: r for r in built}
+
+    @staticmethod
+    async def fetch_all(
+        repos: List[RepositoryData], batch_size: Optional[int] = None
+    ) -> Dict[str, Repository]:
+        """Enriches all repositories, `batch_size` repositories per GraphQL request."""
+        size = batch_size or config.GRAPHQL_BATCH_SIZE
+        batches = [repos[i:i + size] for i in range(0, len(repos), size)]
+        results = await asyncio.gather(*[GraphQLEnrichmentService.fetch_batch(b) for b in batches])
+        merged: Dict[str, Repository] = {}
+        for result in results:
+            merged.update(result)
+        return merged
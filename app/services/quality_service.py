@@ -1,33 +1,36 @@
 from typing import List, Optional
 from .badge_service import BadgeService
+from ..parsers.badge_analysis import BadgeAnalysis
 
 class QualityService:
     @staticmethod
-    async def get_quality_tools(owner: str, repo: str, badges: Optional[List[str]] = None) -> List[str]:
+    async def _analysis(
+        owner: str, repo: str, badges: Optional[List[str]], analysis: Optional[BadgeAnalysis]
+    ) -> BadgeAnalysis:
+        if analysis is not None:
+            return analysis
         if badges is None:
             badges = await BadgeService.get_all_badges(owner, repo)
-        tools = []
+        return BadgeAnalysis.from_badges(badges)
 
-        for url in badges:
-            url_lower = url.lower()
-            if "sonarcloud" in url_lower or "sonar" in url_lower:
-                if "SonarCloud" not in tools:
-                    tools.append("SonarCloud")
-            if "codeclimate" in url_lower:
-                if "Code Climate" not in tools:
-                    tools.append("Code Climate")
-            if "codeql" in url_lower:
-                if "CodeQL" not in tools:
-                    tools.append("CodeQL")
-            if "codecov" in url_lower:
-                if "Codecov" not in tools:
-                    tools.append("Codecov")
-
-        return tools
+    @staticmethod
+    async def get_quality_tools(
+        owner: str,
+        repo: str,
+        badges: Optional[List[str]] = None,
+        analysis: Optional[BadgeAnalysis] = None
+    ) -> List[str]:
+        analysis = await QualityService._analysis(owner, repo, badges, analysis)
+        return list(analysis.quality_tools)
 
     @staticmethod
-    async def get_codeql_status(owner: str, repo: str, badges: Optional[List[str]] = None) -> str:
+    async def get_codeql_status(
+        owner: str,
+        repo: str,
+        badges: Optional[List[str]] = None,
+        analysis: Optional[BadgeAnalysis] = None
+    ) -> str:
         # Check if CodeQL workflow exists
         # This is a simplified check
-        tools = await QualityService.get_quality_tools(owner, repo, badges=badges)
-        return "active" if "CodeQL" in tools else "none"
+        analysis = await QualityService._analysis(owner, repo, badges, analysis)
+        return "active" if analysis.codeql else "none"
@@ -1,11 +1,21 @@
 from typing import Optional, List
 from .badge_service import BadgeService
 from .github_client import github_client
-from ..parsers.shield_parser import ShieldParser
+from ..parsers.badge_analysis import BadgeAnalysis
 
 class VersionService:
     @staticmethod
-    async def get_version(owner: str, repo: str, badges: Optional[List[str]] = None) -> Optional[str]:
+    def version_from_badges(badges: List[str]) -> Optional[str]:
+        """Returns the first version found in the given badge URLs."""
+        return BadgeAnalysis.from_badges(badges).version
+
+    @staticmethod
+    async def get_version(
+        owner: str,
+        repo: str,
+        badges: Optional[List[str]] = None,
+        analysis: Optional[BadgeAnalysis] = None
+    ) -> Optional[str]:
         """
         Orchestrates version discovery for a repository.
 
@@ -14,14 +24,12 @@ class VersionService:
         3. Fallback to latest GitHub tag.
         """
         # 1. README badges
-        if badges is None:
-            badges = await BadgeService.get_all_badges(owner, repo)
-
-        for url in badges:
-            version = ShieldParser.extract_version(url)
-            if version:
-                # Clean up 'v' prefix if present for consistency
-                return version.lstrip('v')
+        if analysis is None:
+            if badges is None:
+                badges = await BadgeService.get_all_badges(owner, repo)
+            analysis = BadgeAnalysis.from_badges(badges)
+        if analysis.version:
+            return analysis.version
 
         # 2. Latest Release
         release = await github_client.get_latest_release(owner, repo)
@@ -0,0 +1,102 @@
+import asyncio
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from ..cache.keys import account_cache_key
+from ..cache.ttl_cache import ttl_cache
+from ..utils.logging import logger
+from ..utils.rate_limit import background_priority, github_rate_limiter
+
+# Refreshes one account (None is the authenticated user) and stores the result in the cache.
+AccountRefresher = Callable[[Optional[str]], Awaitable[Any]]
+
+
+class WarmupScheduler:
+    """Refreshes configured accounts shortly before their cached lists expire.
+
+    Each account is refreshed `lead_seconds` before its cache entry turns stale, plus
+    a random jitter so refreshes of different accounts do not line up. All requests run
+    under `background_priority()` and therefore yield to interactive requests; the rate
+    limiter also caps each request against the warm-up budget (`WARMUP_BUDGET_SHARE`).
+    An account is not even started while that budget is spent.
+    """
+
+    def __init__(
+        self,
+        accounts: List[Optional[str]],
+        refresh: AccountRefresher,
+        lead_seconds: float = 300,
+        jitter_seconds: float = 60,
+        retry_seconds: float = 60
+    ):
+        self.accounts = accounts
+        self.refresh = refresh
+        self.lead_seconds = lead_seconds
+        self.jitter_seconds = jitter_seconds
+        self.retry_seconds = retry_seconds
+        self.refreshes = 0
+        self.skipped_for_budget = 0
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    def _next_due(self, account: Optional[str], just_refreshed: bool = False) -> float:
+        """Monotonic time at which an account should be refreshed next.
+
+        After a refresh the next one is at least `retry_seconds` away, even if the entry
+        is missing or `lead_seconds` exceeds the cache TTL.
+        """
+        expires_in = ttl_cache.expires_in(account_cache_key(account))
+        delay = 0.0 if expires_in is None else max(0.0, expires_in - self.lead_seconds)
+        if just_refreshed:
+            delay = max(delay, self.retry_seconds)
+        return time.monotonic() + delay + random.uniform(0, self.jitter_seconds)  # nosec B311
+
+    async def run_once(self, account: Optional[str]) -> bool:
+        """Refreshes one account if the warm-up budget allows it."""
+        if not github_rate_limiter.background_budget_left():
+            self.skipped_for_budget += 1
+            logger.info(f"Warm-up: budget exhausted, postponing {account or 'authenticated user'}")
+            return False
+        with background_priority():
+            await self.refresh(account)
+        self.refreshes += 1
+        return True
+
+    async def _run(self):
+        # Accounts with a warm cache (e.g. from the SQLite backend) wait for their expiry.
+        due: Dict[Optional[str], float] = {
+            account: self._next_due(account) for account in self.accounts
+        }
+        while True:
+            account = min(due, key=lambda a: due[a])
+            # Always yield, even when the account is already due.
+            await asyncio.sleep(max(0.0, due[account] - time.monotonic()))
+            try:
+                refreshed = await self.run_once(account)
+            except Exception as e:
+                logger.warning(f"Warm-up of {account or 'authenticated user'} failed: {e}")
+                refreshed = False
+            due[account] = (
+                self._next_due(account, just_refreshed=True) if refreshed
+                else time.monotonic() + self.retry_seconds
+            )
+
+    def start(self):
+        if self._task is None and self.accounts:
+            logger.info(f"Warm-up: scheduling {len(self.accounts)} accounts")
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "accounts": len(self.accounts),
+            "refreshes": self.refreshes,
+            "skipped_for_budget": self.skipped_for_budget,
+        }
@@ -0,0 +1,154 @@
+import hashlib
+import hmac
+from typing import Any, Callable, Dict, Optional
+from .actions_service import ActionsService
+from .version_service import VersionService
+from ..cache.keys import (
+    account_cache_key, failed_tests_cache_key, latest_run_cache_key, repo_cache_key
+)
+from ..cache.snapshot import RepoSnapshot
+from ..cache.ttl_cache import ttl_cache
+from ..config import config
+from ..models.enums import BuildStatus
+from ..models.repo import Repository
+from ..utils.logging import logger
+
+SUPPORTED_EVENTS = {"push", "workflow_run", "release", "create", "page_build"}
+
+# Returns the patched repository, or None if the event cannot be applied without an API call.
+RepositoryPatch = Callable[[Repository], Optional[Repository]]
+
+
+class WebhookService:
+    """Applies GitHub webhook events to cached repository metrics.
+
+    Events either patch the affected repository in place (no API call at all) or
+    invalidate just that repository: its per-repo entry is dropped and the account
+    lists containing it are marked stale, so the next request serves them while a
+    background refresh re-enriches only that repository.
+    """
+
+    @staticmethod
+    def verify_signature(secret: str, body: bytes, signature: Optional[str]) -> bool:
+        """Checks an `X-Hub-Signature-256` header against the payload HMAC."""
+        if not signature or not signature.startswith("sha256="):
+            return False
+        expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+        return hmac.compare_digest(f"sha256={expected}", signature)
+
+    @staticmethod
+    def handle_event(event: str, payload: Dict[str, Any]) -> str:
+        """Applies an event and returns what was done: `patched`, `invalidated` or `ignored`."""
+        repository = payload.get("repository") or {}
+        full_name = repository.get("full_name")
+        if event not in SUPPORTED_EVENTS or not full_name:
+            return "ignored"
+        owner = repository.get("owner", {}).get("login") or full_name.split("/")[0]
+
+        if event == "workflow_run":
+            run = payload.get("workflow_run") or {}
+            if not WebhookService._is_latest_run(full_name, run):
+                return "ignored"
+            status = ActionsService.status_from_run(run)
+            if status == BuildStatus.FAILURE:
+                # Counting the failed tests needs the run's logs, unless they were parsed before.
+                cached = ttl_cache.get(failed_tests_cache_key(full_name, run.get("id")))
+                if cached is None:
+                    WebhookService.invalidate(full_name, owner)
+                    return "invalidated"
+                failing_tests = cached if cached >= 0 else None
+            else:
+                # Same rule as ActionsService.get_failed_tests_count.
+                failing_tests = 0 if status == BuildStatus.SUCCESS else None
+            patch = WebhookService._metrics_patch(
+                build_status=status, failing_tests_count=failing_tests
+            )
+            return WebhookService._apply(full_name, owner, patch)
+
+        if event == "release" and payload.get("action") in ("published", "released"):
+            release = payload.get("release") or {}
+            # releases/latest, which VersionService uses, ignores drafts and prereleases.
+            if release.get("draft") or release.get("prerelease"):
+                return "ignored"
+            tag = release.get("tag_name")
+            if tag:
+                return WebhookService._apply(full_name, owner, WebhookService._release_patch(tag))
+
+        # push, create, page_build and other release actions change data we cannot
+        # derive from the payload alone (README badges, commit count, tags, Pages URL).
+        WebhookService.invalidate(full_name, owner)
+        return "invalidated"
+
+    @staticmethod
+    def _is_latest_run(full_name: str, run: Dict[str, Any]) -> bool:
+        """Records the run and tells whether it is at least as recent as any run seen before.
+
+        Deliveries can arrive out of order; a late event of an older run must not
+        overwrite the status of a newer one.
+        """
+        order = (run.get("run_started_at") or run.get("created_at") or "", run.get("id") or 0)
+        key = latest_run_cache_key(full_name)
+        seen = ttl_cache.get(key)
+        if seen is not None and tuple(seen) > order:
+            return False
+        ttl_cache.set(key, order, ttl=config.REPO_METRICS_TTL)
+        return True
+
+    @staticmethod
+    def _metrics_patch(**updates: Any) -> RepositoryPatch:
+        def patch(repo: Repository) -> Optional[Repository]:
+            if repo.metrics is None:
+                return None
+            return repo.model_copy(update={"metrics": repo.metrics.model_copy(update=updates)})
+        return patch
+
+    @staticmethod
+    def _release_patch(tag: str) -> RepositoryPatch:
+        def patch(repo: Repository) -> Optional[Repository]:
+            if repo.metrics is None:
+                return None
+            # A version badge in the README takes precedence over releases.
+            if VersionService.version_from_badges(repo.metrics.readme_badges):
+                return repo
+            return WebhookService._metrics_patch(version=tag.lstrip('v'))(repo)
+        return patch
+
+    @staticmethod
+    def _apply(full_name: str, owner: str, patch: RepositoryPatch) -> str:
+        key = repo_cache_key(full_name)
+        entry, _ = ttl_cache.get_with_staleness(key)
+        if entry is not None:
+            stamp, repo = entry
+            patched = patch(repo)
+            if patched is None:
+                WebhookService.invalidate(full_name, owner)
+                return "invalidated"
+            ttl_cache.replace(key, (stamp, patched))
+
+        for account_key in {account_cache_key(owner), account_cache_key(None)}:
+            repos, _ = ttl_cache.get_with_staleness(account_key)
+            if not repos:
+                continue
+            updated = []
+            for repo in repos:
+                if repo.full_name.lower() == full_name.lower():
+                    patched = patch(repo)
+                    if patched is None:
+                        WebhookService.invalidate(full_name, owner)
+                        return "invalidated"
+                    repo = patched
+                updated.append(repo)
+            ttl_cache.replace(account_key, RepoSnapshot(updated))
+
+        logger.info(f"Webhook: patched cached metrics of {full_name}")
+        return "patched"
+
+    @staticmethod
+    def invalidate(full_name: str, owner: str):
+        """Drops a repository's metrics and marks the account lists containing it stale."""
+        ttl_cache.delete(repo_cache_key(full_name))
+        for account_key in {account_cache_key(owner), account_cache_key(None)}:
+            repos, _ = ttl_cache.get_with_staleness(account_key)
+            if repos and any(r.full_name.lower() == full_name.lower() for r in repos):
+                ttl_cache.mark_stale(account_key)
+        logger.info(f"Webhook: invalidated cached metrics of {full_name}")
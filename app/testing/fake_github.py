@@ -0,0 +1,299 @@
+import asyncio
+import base64
+import hashlib
+import io
+import json
+import random
+import re
+import time
+import zipfile
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+import httpx
+from ..cache.backends import MemoryBackend
+from ..cache.readme_cache import readme_cache
+from ..cache.response_cache import response_cache
+from ..cache.ttl_cache import ttl_cache
+from ..config import config
+from ..services import github_client as github_client_module
+from ..services import warmup as warmup_module
+from ..services.github_client import github_client
+from ..utils.rate_limit import TokenBucketRateLimiter
+
+# Host the log archive download redirects to (GitHub uses short-lived blob storage).
+LOG_STORAGE_HOST = "pipelines.fake-github.invalid"
+
+_REPO_ENDPOINTS = (
+    (re.compile(r"^/repos/([^/]+)/([^/]+)/readme$"), "readme"),
+    (re.compile(r"^/repos/([^/]+)/([^/]+)/actions/runs$"), "runs"),
+    (re.compile(r"^/repos/([^/]+)/([^/]+)/actions/runs/\d+/logs$"), "logs"),
+    (re.compile(r"^/repos/([^/]+)/([^/]+)/commits$"), "commits"),
+    (re.compile(r"^/repos/([^/]+)/([^/]+)/pages$"), "pages"),
+    (re.compile(r"^/repos/([^/]+)/([^/]+)/releases/latest$"), "releases"),
+    (re.compile(r"^/repos/([^/]+)/([^/]+)/tags$"), "tags"),
+)
+_LISTING = re.compile(r"^/users?/(?:([^/]+)/)?repos$")
+
+
+class FakeGitHub:
+    """Simulated GitHub REST API for an httpx `MockTransport`.
+
+    Serves one account of `repo_count` generated repositories with everything the
+    enrichment reads: listing pages, raw READMEs with badges, workflow runs and log
+    archives, commits, Pages sites, releases and tags. Responses carry ETags (answered
+    with a free 304 on `If-None-Match`) and `X-RateLimit-*` headers drawn from a
+    simulated primary quota, which answers 403 once exhausted.
+
+    Args:
+        repo_count: Repositories of the account.
+        owner: Login of the account (also the authenticated user).
+        latency: Seconds every request takes, by endpoint family (see `family`);
+            the `default` entry applies to unlisted families.
+        not_found: Share of repositories (0..1) answering 404, by endpoint family.
+        rate_limit: Primary quota per hour.
+        seed: Seed of the deterministic choices (404s).
+    """
+
+    def __init__(
+        self,
+        repo_count: int = 10,
+        owner: str = "octo-bench",
+        latency: Optional[Dict[str, float]] = None,
+        not_found: Optional[Dict[str, float]] = None,
+        rate_limit: int = 5000,
+        seed: int = 0
+    ):
+        self.owner = owner
+        self.repos = [self._repository(i) for i in range(repo_count)]
+        self._by_name = {repo["name"]: (i, repo) for i, repo in enumerate(self.repos)}
+        self.latency = dict(latency or {})
+        self.not_found = dict(not_found or {})
+        self.rate_limit = rate_limit
+        self.remaining = rate_limit
+        self.reset_at = int(time.time()) + 3600
+        self.seed = seed
+        self.requests: Counter = Counter()
+        self.not_modified = 0
+
+    @property
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
+
+    @property
+    def quota_used(self) -> int:
+        return self.rate_limit - self.remaining
+
+    def reset_stats(self):
+        """Zeroes the request counters and refills the quota."""
+        self.requests.clear()
+        self.not_modified = 0
+        self.remaining = self.rate_limit
+
+    def _repository(self, index: int) -> Dict[str, Any]:
+        name = f"repo-{index:04d}"
+        return {
+            "name": name,
+            "full_name": f"{self.owner}/{name}",
+            "html_url": f"https://github.com/{self.owner}/{name}",
+            "owner": {"login": self.owner},
+            "description": f"Generated repository {index}",
+            "homepage": None,
+            "has_pages": index % 5 == 0,
+            "pushed_at": "2024-03-01T12:00:00Z",
+            "updated_at": "2024-03-01T12:00:00Z",
+        }
+
+    @staticmethod
+    def family(request: httpx.Request) -> str:
+        """Endpoint family of a request, the unit of latency and 404 settings."""
+        path = request.url.path
+        if request.url.host == LOG_STORAGE_HOST:
+            return "log_storage"
+        if path == "/user":
+            return "user"
+        if _LISTING.match(path):
+            return "repos"
+        for pattern, family in _REPO_ENDPOINTS:
+            if pattern.match(path):
+                return family
+        return "other"
+
+    def _missing(self, family: str, name: str) -> bool:
+        ratio = self.not_found.get(family, 0.0)
+        return ratio > 0 and random.Random(f"{self.seed}:{family}:{name}").random() < ratio
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        family = self.family(request)
+        self.requests[family] += 1
+        delay = self.latency.get(family, self.latency.get("default", 0.0))
+        if delay:
+            await asyncio.sleep(delay)
+        if family == "log_storage":
+            return httpx.Response(200, content=self._log_archive(request.url.path))
+
+        status, body, headers = self._route(family, request)
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        if status == 200 and etag in request.headers.get("If-None-Match", ""):
+            # Revalidations answered 304 do not count against the quota.
+            self.not_modified += 1
+            return httpx.Response(304, headers={"ETag": etag, **self._rate_limit_headers()})
+
+        if self.remaining <= 0:
+            return httpx.Response(
+                403, json={"message": "API rate limit exceeded"}, headers=self._rate_limit_headers()
+            )
+        self.remaining -= 1
+        if status == 200:
+            headers["ETag"] = etag
+        headers.update(self._rate_limit_headers())
+        return httpx.Response(status, content=body, headers=headers)
+
+    def _rate_limit_headers(self) -> Dict[str, str]:
+        return {
+            "X-RateLimit-Limit": str(self.rate_limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Used": str(self.quota_used),
+            "X-RateLimit-Reset": str(self.reset_at),
+            "X-RateLimit-Resource": "core",
+        }
+
+    def _route(self, family: str, request: httpx.Request) -> Tuple[int, bytes, Dict[str, str]]:
+        if family == "user":
+            return self._json({"login": self.owner})
+        if family == "repos":
+            return self._listing(request)
+
+        match = next((p.match(request.url.path) for p, f in _REPO_ENDPOINTS if f == family), None)
+        if match is None or match.group(1) != self.owner or match.group(2) not in self._by_name:
+            return self._not_found()
+        index, repo = self._by_name[match.group(2)]
+        if self._missing(family, repo["name"]):
+            return self._not_found()
+
+        if family == "readme":
+            return self._readme(request, index)
+        if family == "runs":
+            failed = index % 4 == 3
+            return self._json({"workflow_runs": [{
+                "id": 1000 + index,
+                "status": "completed",
+                "conclusion": "failure" if failed else "success",
+            }]})
+        if family == "logs":
+            url = f"https://{LOG_STORAGE_HOST}/{repo['name']}.zip"
+            return 302, b"", {"Location": url}
+        if family == "commits":
+            last_url = request.url.copy_with(params={"per_page": 1, "page": 100 + index})
+            last = f'<{last_url}>; rel="last"'
+            return self._json(
+                [{"sha": f"{index:040x}", "commit": {"committer": {"date": repo["pushed_at"]}}}],
+                {"Link": last}
+            )
+        if family == "pages":
+            if not repo["has_pages"]:
+                return self._not_found()
+            return self._json({"html_url": f"https://{self.owner}.github.io/{repo['name']}/"})
+        if family == "releases":
+            if index % 3 != 1:
+                return self._not_found()
+            return self._json({"tag_name": f"v1.{index}.0"})
+        return self._json([{"name": f"v0.{index}.0"}])
+
+    def _listing(self, request: httpx.Request) -> Tuple[int, bytes, Dict[str, str]]:
+        per_page = int(request.url.params.get("per_page", 30))
+        page = int(request.url.params.get("page", 1))
+        last = max(1, -(-len(self.repos) // per_page))
+        headers = {}
+        if last > 1:
+            last_url = request.url.copy_with(params={"per_page": per_page, "page": last})
+            headers["Link"] = f'<{last_url}>; rel="last"'
+        return self._json(self.repos[(page - 1) * per_page:page * per_page], headers)
+
+    def _readme(self, request: httpx.Request, index: int) -> Tuple[int, bytes, Dict[str, str]]:
+        badges = [
+            f"[![CI](https://github.com/{self.owner}/r/actions/workflows/ci.yml/badge.svg)](#)",
+            f"![coverage](https://img.shields.io/badge/coverage-{50 + index % 50}%25-green)",
+        ]
+        if index % 3 == 0:
+            badges.append(f"![version](https://img.shields.io/badge/version-v2.{index}.0-blue)")
+        if index % 2 == 0:
+            workflow = f"https://github.com/{self.owner}/r/actions/workflows/codeql.yml"
+            badges.append(f"![codeql]({workflow}/badge.svg)")
+        text = (
+            f"# repo-{index:04d}\n\n" + "\n".join(badges)
+            + "\n\n## Usage\n\n" + "Lorem ipsum.\n" * 200
+        )
+        if "raw" in request.headers.get("Accept", ""):
+            return 200, text.encode(), {"Content-Type": "text/plain; charset=utf-8"}
+        content = base64.b64encode(text.encode()).decode()
+        return self._json({"content": content, "encoding": "base64"})
+
+    @staticmethod
+    def _log_archive(path: str) -> bytes:
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+            log = "".join(
+                f"2024-03-01T12:00:00.0000000Z step output line {i}\n" for i in range(2000)
+            )
+            zf.writestr("0_test.txt", log + "===== 2 failed, 40 passed in 3.20s =====\n")
+            zf.writestr("test/1_Run tests.txt", log)
+        return buffer.getvalue()
+
+    @staticmethod
+    def _json(
+        data: Any, headers: Optional[Dict[str, str]] = None
+    ) -> Tuple[int, bytes, Dict[str, str]]:
+        headers = {"Content-Type": "application/json", **(headers or {})}
+        return 200, json.dumps(data).encode(), headers
+
+    @staticmethod
+    def _not_found() -> Tuple[int, bytes, Dict[str, str]]:
+        return 404, b'{"message": "Not Found"}', {"Content-Type": "application/json"}
+
+
+def _reset_caches():
+    readme_cache.clear()
+    response_cache.clear()
+    github_client.validators.clear()
+
+
+@asynccontextmanager
+async def simulated_github(fake: FakeGitHub, paced: bool = False) -> AsyncIterator[FakeGitHub]:
+    """Routes the app's GitHub client to `fake`, with empty caches, for the block.
+
+    The shared cache gets a fresh in-memory backend for the block, so a SQLite cache
+    (`CACHE_BACKEND=sqlite`) on disk is neither read nor wiped.
+
+    Args:
+        fake: The simulated API.
+        paced: Keep the production request pacing; by default the rate limiter only
+            follows the fake's quota headers, so runs measure the app, not the sleeps.
+    """
+    if paced:
+        limiter = TokenBucketRateLimiter(
+            requests_per_hour=fake.rate_limit,
+            requests_per_minute=config.RATE_LIMIT_PER_MINUTE,
+            burst=config.RATE_LIMIT_BURST
+        )
+    else:
+        limiter = TokenBucketRateLimiter(
+            requests_per_hour=fake.rate_limit, requests_per_minute=10 ** 9, burst=10 ** 9
+        )
+    # Modules that imported the limiter by name.
+    limiter_modules = (github_client_module, warmup_module)
+    production_limiter = github_client_module.github_rate_limiter
+    production_backend = ttl_cache._cache
+    for module in limiter_modules:
+        module.github_rate_limiter = limiter
+    ttl_cache._cache = MemoryBackend()
+    _reset_caches()
+    await github_client.use_transport(fake.transport)
+    try:
+        yield fake
+    finally:
+        await github_client.use_transport(None)
+        for module in limiter_modules:
+            module.github_rate_limiter = production_limiter
+        ttl_cache._cache = production_backend
+        _reset_caches()
@@ -0,0 +1,224 @@
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Dict, Iterator, List, Optional, TypeVar
+from urllib.parse import parse_qs
+from ..config import config
+
+T = TypeVar("T")
+
+# Profile of the request being handled; tasks started within it inherit it.
+_active: ContextVar[Optional["Profile"]] = ContextVar("profile", default=None)
+# Repository the current span belongs to, inherited by nested spans.
+_repo: ContextVar[Optional[str]] = ContextVar("profile_repo", default=None)
+
+
+@dataclass
+class Span:
+    name: str
+    start: float
+    end: float
+    repo: Optional[str]
+    attrs: Dict[str, Any] = field(default_factory=dict)
+
+
+class Profile:
+    """Spans recorded while handling one request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+        self.spans: List[Span] = []
+
+    def _span(self, span: Span) -> Dict[str, Any]:
+        return {
+            "name": span.name,
+            "start_ms": round((span.start - self.started) * 1000, 3),
+            "duration_ms": round((span.end - span.start) * 1000, 3),
+            **({"attrs": span.attrs} if span.attrs else {}),
+        }
+
+    def report(self) -> Dict[str, Any]:
+        """Waterfall per repository, the remaining spans and totals per span name."""
+        end = self.finished or time.perf_counter()
+        by_repo: Dict[str, List[Span]] = defaultdict(list)
+        other: List[Span] = []
+        totals: Dict[str, Dict[str, float]] = defaultdict(lambda: {"count": 0, "total_ms": 0.0})
+        for span in sorted(self.spans, key=lambda s: s.start):
+            (by_repo[span.repo] if span.repo else other).append(span)
+            totals[span.name]["count"] += 1
+            totals[span.name]["total_ms"] += (span.end - span.start) * 1000
+
+        repositories = {
+            repo: {
+                "start_ms": round((spans[0].start - self.started) * 1000, 3),
+                "duration_ms": round((max(s.end for s in spans) - spans[0].start) * 1000, 3),
+                "spans": [self._span(s) for s in spans],
+            }
+            for repo, spans in by_repo.items()
+        }
+        return {
+            "total_ms": round((end - self.started) * 1000, 3),
+            "repositories": repositories,
+            "spans": [self._span(s) for s in other],
+            "totals": {
+                name: {"count": t["count"], "total_ms": round(t["total_ms"], 3)}
+                for name, t in sorted(totals.items(), key=lambda item: -item[1]["total_ms"])
+            },
+        }
+
+
+@contextmanager
+def profiling() -> Iterator[Profile]:
+    """Records the spans of the block (and of tasks started in it) into a new profile."""
+    profile = Profile()
+    token = _active.set(profile)
+    try:
+        yield profile
+    finally:
+        profile.finished = time.perf_counter()
+        _active.reset(token)
+
+
+@contextmanager
+def span(name: str, repo: Optional[str] = None, **attrs: Any) -> Iterator[Dict[str, Any]]:
+    """Times the block as a span of the active profile; a no-op without one.
+
+    Yields the span's attributes, so callers can add results (e.g. a status code).
+    Spans without `repo` belong to the repository of the enclosing span, if any.
+    """
+    profile = _active.get()
+    # Background work outliving the request no longer records.
+    if profile is None or profile.finished is not None:
+        yield attrs
+        return
+    token = _repo.set(repo) if repo else None
+    start = time.perf_counter()
+    try:
+        yield attrs
+    finally:
+        profile.spans.append(Span(name, start, time.perf_counter(), repo or _repo.get(), attrs))
+        if token is not None:
+            _repo.reset(token)
+
+
+async def traced(name: str, awaitable: Awaitable[T], **attrs: Any) -> T:
+    """Awaits `awaitable` inside a span, e.g. for the calls of an `asyncio.gather`."""
+    with span(name, **attrs):
+        return await awaitable
+
+
+class StackSampler:
+    """Samples the stack of one thread at a fixed interval, in folded-stack format.
+
+    The output (`frame;frame;frame count` per line) can be rendered as a flame graph
+    by flamegraph.pl or speedscope. Sampling the event-loop thread also captures
+    any other request it serves meanwhile.
+    """
+
+    def __init__(self, interval: float = 0.005, thread_id: Optional[int] = None):
+        self.interval = interval
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample(self):
+        frame = sys._current_frames().get(self.thread_id)
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            location = f"{os.path.basename(code.co_filename)}:{code.co_firstlineno}"
+            names.append(f"{code.co_name} ({location})")
+            frame = frame.f_back
+        if names:
+            self.stacks[";".join(reversed(names))] += 1
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def _requested_mode(scope: Dict[str, Any]) -> Optional[str]:
+    """`spans`, `flame` or None, from `?profile=` or the `X-Profile` header."""
+    values = parse_qs(scope.get("query_string", b"").decode("latin-1")).get("profile", [])
+    headers = dict(scope.get("headers") or [])
+    value = (values[-1] if values else headers.get(b"x-profile", b"").decode("latin-1")).lower()
+    if value in ("1", "true", "spans"):
+        return "spans"
+    if value == "flame":
+        return "flame"
+    return None
+
+
+class ProfilingMiddleware:
+    """Answers requests asking for a profile with their timing waterfall instead of the body.
+
+    Only active with `PROFILING_ENABLED`. `?profile=1` (or `X-Profile: 1`) returns the
+    spans as JSON together with the original status code; `profile=flame` also adds
+    folded stacks sampled every `PROFILING_SAMPLE_INTERVAL_MS` during the request.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        enabled = scope["type"] == "http" and config.PROFILING_ENABLED
+        mode = _requested_mode(scope) if enabled else None
+        if mode is None:
+            await self.app(scope, receive, send)
+            return
+
+        status: Dict[str, int] = {}
+
+        async def capture(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+
+        sampler = None
+        if mode == "flame":
+            sampler = StackSampler(config.PROFILING_SAMPLE_INTERVAL_MS / 1000)
+        with profiling() as profile:
+            if sampler:
+                sampler.start()
+            try:
+                await self.app(scope, receive, capture)
+            finally:
+                if sampler:
+                    sampler.stop()
+
+        report = {"status": status.get("code"), **profile.report()}
+        if sampler:
+            report["flamegraph"] = {
+                "format": "folded",
+                "interval_ms": config.PROFILING_SAMPLE_INTERVAL_MS,
+                "stacks": sampler.folded(),
+            }
+        body = json.dumps(report).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -1,8 +1,14 @@
 import asyncio
+import contextvars
 import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, Iterator, Mapping, Optional
 from .logging import logger
+from .metrics import rate_limit_remaining, rate_limit_wait
+from .profiling import span
+from ..config import config
 
 class RateLimiter:
     """Rate Limiter with basic interval-based limiting."""
@@ -57,5 +63,263 @@ class AdaptiveRateLimiter:
         self.backoff_until = datetime.now() + timedelta(seconds=backoff_seconds)
         logger.error(f"Rate limit hit. Backing off for {backoff_seconds}s")
 
+class BackgroundWork:
+    """Requests made under one `background_priority()` block.
+
+    Background requests yield to interactive ones. Once an interactive caller waits on
+    the work (e.g. by joining the same single-flight refresh) it is promoted, and its
+    remaining requests are sent at interactive priority.
+    """
+
+    def __init__(self):
+        self._promoted = asyncio.Event()
+
+    @property
+    def promoted(self) -> bool:
+        return self._promoted.is_set()
+
+    def promote(self):
+        self._promoted.set()
+
+    async def sleep(self, delay: float):
+        """Sleeps for `delay` seconds, or until the work is promoted."""
+        try:
+            await asyncio.wait_for(self._promoted.wait(), delay)
+        except asyncio.TimeoutError:
+            pass
+
+# Set for work that must yield to interactive requests (e.g. cache warm-up).
+_background: contextvars.ContextVar[Optional[BackgroundWork]] = contextvars.ContextVar(
+    "rate_limit_background", default=None
+)
+
+@contextmanager
+def background_priority() -> Iterator[BackgroundWork]:
+    """Marks GitHub requests made inside this block (and tasks it spawns) as background work."""
+    work = BackgroundWork()
+    token = _background.set(work)
+    try:
+        yield work
+    finally:
+        _background.reset(token)
+
+def current_background_work() -> Optional[BackgroundWork]:
+    """The background work the caller belongs to, or None for interactive callers."""
+    work = _background.get()
+    return None if work is None or work.promoted else work
+
+def _header_number(headers: Mapping[str, str], name: str) -> Optional[float]:
+    value = headers.get(name)
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+@dataclass
+class _Quota:
+    """Last known primary quota of one GitHub rate-limit resource (`core`, `graphql`, ...)."""
+    limit: int
+    remaining: float
+    reset_at: float = 0.0  # epoch seconds, as sent in X-RateLimit-Reset
+    next_slot: float = field(default=0.0)  # monotonic time of the next paced request
+    budget_window: Optional[float] = None  # reset_at of the window the budget applies to
+    background_budget: float = 0.0  # background requests allowed in that window
+    background_used: int = 0
+
+class TokenBucketRateLimiter:
+    """Header-driven token-bucket rate limiter for the GitHub API.
+
+    Two independent limits are enforced:
+
+    * Secondary limits: a token bucket (`burst` tokens, refilled at
+      `requests_per_minute`) allows short bursts of concurrent requests while keeping
+      the sustained rate below GitHub's per-minute ceiling. `Retry-After` and
+      secondary-limit 403/429 responses block this bucket only.
+    * Primary quota: recalibrated from `X-RateLimit-Remaining`/`X-RateLimit-Reset` on
+      every response. Requests flow freely while quota is plentiful; below
+      `reserve_fraction` of the limit the remainder is spread evenly until the reset,
+      and an exhausted quota waits for the reset.
+
+    Each caller reserves its slot synchronously before sleeping, so any number of
+    coroutines can call `wait()` at once without racing on shared state.
+
+    Requests made under `background_priority()` only take tokens while no interactive
+    request is waiting and at least `background_floor` of the burst is left over, so
+    warm-up work never delays a user-facing request. Per rate-limit window they may
+    also spend at most `background_budget_share` of the quota that was remaining when
+    the window's first background request was made; beyond that they wait for the reset.
+    """
+
+    def __init__(
+        self,
+        requests_per_hour: int = 5000,
+        requests_per_minute: int = 900,
+        burst: int = 100,
+        reserve_fraction: float = 0.1,
+        background_floor: float = 0.5,
+        background_budget_share: float = 1.0
+    ):
+        self.requests_per_hour = requests_per_hour
+        self.rate = requests_per_minute / 60
+        self.burst = burst
+        self.reserve_fraction = reserve_fraction
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._quotas: Dict[str, _Quota] = {}
+        self.secondary_until = 0.0  # monotonic
+        self.consecutive_errors = 0
+        self.background_floor = background_floor
+        self.background_budget_share = background_budget_share
+        self.background_requests = 0
+        self._interactive_waiting = 0
+
+    def _quota(self, resource: str) -> _Quota:
+        if resource not in self._quotas:
+            self._quotas[resource] = _Quota(self.requests_per_hour, self.requests_per_hour)
+        return self._quotas[resource]
+
+    def remaining(self, resource: str = "core") -> float:
+        """Last known remaining primary quota for a resource."""
+        return self._quota(resource).remaining
+
+    def reset_at(self, resource: str = "core") -> float:
+        """Epoch time at which the resource's quota resets (0 if unknown)."""
+        return self._quota(resource).reset_at
+
+    def background_budget_left(self, resource: str = "core") -> bool:
+        """Tells whether background work may still spend quota in the current window."""
+        quota = self._quota(resource)
+        if quota.budget_window != quota.reset_at:
+            quota.budget_window = quota.reset_at
+            quota.background_budget = quota.remaining * self.background_budget_share
+            quota.background_used = 0
+        return quota.background_used < quota.background_budget
+
+    def _available_tokens(self) -> float:
+        return min(self.burst, self._tokens + (time.monotonic() - self._updated) * self.rate)
+
+    def reserve(self, resource: str = "core") -> float:
+        """Reserves a request slot and returns how long the caller must sleep first."""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1
+        delay = 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+        delay = max(delay, self.secondary_until - now)
+
+        quota = self._quota(resource)
+        wall_now = time.time()
+        if quota.reset_at and wall_now >= quota.reset_at:
+            quota.remaining = quota.limit
+            quota.reset_at = 0.0
+        quota.remaining -= 1
+        if quota.remaining < 0:
+            delay = max(delay, quota.reset_at - wall_now if quota.reset_at else 60.0)
+        elif quota.remaining < quota.limit * self.reserve_fraction and quota.reset_at:
+            spacing = max(0.0, quota.reset_at - wall_now) / (quota.remaining + 1)
+            slot = max(quota.next_slot, now)
+            quota.next_slot = slot + spacing
+            delay = max(delay, slot - now)
+        return delay
+
+    async def wait(self, resource: str = "core"):
+        """Waits until a request against the given rate-limit resource may be sent."""
+        work = current_background_work()
+        priority = "background" if work else "interactive"
+        with rate_limit_wait.time(resource=resource, priority=priority), \
+                span("rate_limit_wait", resource=resource, priority=priority):
+            if work:
+                await self._wait_for_background_turn(resource, work)
+            if work and not work.promoted:
+                self.background_requests += 1
+                self._quota(resource).background_used += 1
+                delay = self.reserve(resource)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            else:
+                await self._wait_interactive(resource)
+
+    async def _wait_interactive(self, resource: str):
+        delay = self.reserve(resource)
+        if delay > 0:
+            logger.debug(f"Rate limit ({resource}): waiting {delay:.2f}s")
+            self._interactive_waiting += 1
+            try:
+                await asyncio.sleep(delay)
+            finally:
+                self._interactive_waiting -= 1
+
+    async def _wait_for_background_turn(self, resource: str, work: BackgroundWork):
+        """Holds background work back for interactive requests or a spent budget.
+
+        Returns early once the work is promoted.
+        """
+        floor = self.burst * self.background_floor + 1
+        while not work.promoted:
+            if not self.background_budget_left(resource):
+                reset_at = self.reset_at(resource)
+                delay = max(reset_at - time.time(), 1.0) if reset_at else 60.0
+            elif self._interactive_waiting or self._available_tokens() < floor:
+                delay = max(floor - self._available_tokens(), 1) / self.rate
+            else:
+                return
+            await work.sleep(delay)
+
+    def update_from_headers(
+        self, headers: Mapping[str, str], status_code: int = 200, rate_limited: bool = False
+    ):
+        """Recalibrates the limiter from a GitHub response.
+
+        Args:
+            headers: Response headers.
+            status_code: Response status code.
+            rate_limited: Whether the response body reported a rate limit; GitHub also
+                answers 403 for plain permission errors, which must not trigger a backoff.
+        """
+        resource = headers.get("X-RateLimit-Resource") or "core"
+        quota = self._quota(resource)
+        limit = _header_number(headers, "X-RateLimit-Limit")
+        remaining = _header_number(headers, "X-RateLimit-Remaining")
+        reset_at = _header_number(headers, "X-RateLimit-Reset")
+        retry_after = _header_number(headers, "Retry-After")
+
+        if limit:
+            quota.limit = int(limit)
+        if status_code == 304:
+            # Revalidations answered 304 are not charged by GitHub; refund the reserved slot.
+            quota.remaining = min(quota.limit, quota.remaining + 1)
+        if remaining is not None:
+            rate_limit_remaining.set(remaining, resource=resource)
+            # Within the same window, in-flight requests may already have been counted locally.
+            same_window = reset_at is None or reset_at == quota.reset_at
+            quota.remaining = min(quota.remaining, remaining) if same_window else remaining
+        if reset_at:
+            quota.reset_at = reset_at
+
+        if status_code == 429 or (status_code == 403 and (
+            rate_limited or retry_after is not None or remaining == 0
+        )):
+            if retry_after is not None:
+                self.secondary_until = max(self.secondary_until, time.monotonic() + retry_after)
+                logger.warning(f"Secondary rate limit: retrying after {retry_after:.0f}s")
+            elif remaining == 0:
+                logger.error(f"Primary rate limit for '{resource}' exhausted until reset")
+            else:
+                self.trigger_backoff()
+        elif status_code < 400:
+            self.consecutive_errors = 0
+
+    def trigger_backoff(self):
+        """Blocks the secondary bucket with exponential backoff (60s, 120s, 240s, max 300s)."""
+        self.consecutive_errors += 1
+        backoff_seconds = min(300, 60 * (2 ** (self.consecutive_errors - 1)))
+        self.secondary_until = max(self.secondary_until, time.monotonic() + backoff_seconds)
+        logger.error(f"Rate limit hit. Backing off for {backoff_seconds}s")
+
 # Default rate limiter for GitHub API
-github_rate_limiter = AdaptiveRateLimiter(requests_per_hour=5000)
+github_rate_limiter = TokenBucketRateLimiter(
+    requests_per_hour=5000,
+    requests_per_minute=config.RATE_LIMIT_PER_MINUTE,
+    burst=config.RATE_LIMIT_BURST,
+    background_budget_share=config.WARMUP_BUDGET_SHARE
+)
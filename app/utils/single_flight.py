@@ -0,0 +1,76 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+from .logging import logger
+from .rate_limit import BackgroundWork, current_background_work
+
+T = TypeVar('T')
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into one execution.
+
+    The first caller for a key starts the work as a task; callers arriving while it
+    runs await the same task. Results and exceptions are delivered to every waiter.
+    A waiter being cancelled does not cancel the shared work (it is shielded), so the
+    remaining waiters - and the cache the work populates - are unaffected.
+
+    Work started under `background_priority()` is promoted to interactive priority
+    as soon as an interactive caller joins it, so that caller is never throttled as
+    background work.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, "asyncio.Task[Any]"] = {}
+        self._background: Dict[str, Optional[BackgroundWork]] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, func: Callable[[], Awaitable[T]]) -> T:
+        """Runs `func` for `key` unless a call for `key` is already in flight."""
+        return await asyncio.shield(self.start(key, func))
+
+    def start(self, key: str, func: Callable[[], Awaitable[T]]) -> "asyncio.Task[T]":
+        """Starts `func` for `key`, or joins the call in flight, and returns its task.
+
+        `func` is called synchronously, so it can register state (e.g. a progress
+        feed) before this returns. Callers must not cancel the returned task; await it
+        through `asyncio.shield`.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            self._background[key] = current_background_work()
+            task.add_done_callback(lambda t: self._finish(key, t))
+        else:
+            self.coalesced += 1
+            logger.debug(f"Single-flight: joining in-flight call for '{key}'")
+            work = self._background.get(key)
+            if work is not None and current_background_work() is None:
+                work.promote()
+        return task
+
+    def _finish(self, key: str, task: "asyncio.Task[Any]"):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+            self._background.pop(key, None)
+        # Mark the exception as retrieved even if every waiter was cancelled.
+        if not task.cancelled():
+            task.exception()
+
+    def running(self, key: str) -> bool:
+        """Tells whether a call for `key` is in flight."""
+        return key in self._inflight
+
+    def in_flight(self) -> int:
+        return len(self._inflight)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": self.in_flight(),
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+        }
+
+# Single-flight group for repository list refreshes, keyed on the cache key
+refresh_flight = SingleFlight()
@@ -0,0 +1,76 @@
+"""Microbenchmark: per-pattern line scanning vs. the combined FailedTestScanner.
+
+Builds a synthetic workflow log of mostly noise lines with a few test summaries and
+scans it both ways. Run from the repository root:
+
+    python -m benchmarks.bench_action_logs
+"""
+import io
+import re
+import time
+from typing import Iterable, Optional
+from app.parsers.action_logs import CHUNK_SIZE, ActionLogsParser
+
+NOISE = (
+    "2024-01-01T00:00:00.0000000Z Collecting requests>=2.31 (from -r requirements.txt (line 3))",
+    "2024-01-01T00:00:00.0000000Z tests/test_api.py::test_list_repos PASSED                 [ 42%]",
+    "2024-01-01T00:00:00.0000000Z [INFO] Compiling 128 source files to /home/runner/target/classes",
+    "2024-01-01T00:00:00.0000000Z ok  \tgithub.com/user/repo/pkg/server\t0.412s",
+)
+SUMMARIES = (
+    "2024-01-01T00:00:00.0000000Z ===== 3 failed, 120 passed in 12.50s =====",
+    "2024-01-01T00:00:00.0000000Z --- FAIL: TestHandler (0.01s)",
+    "2024-01-01T00:00:00.0000000Z Tests run: 40, Failures: 2, Errors: 0, Skipped: 1",
+)
+
+# The line-by-line scan ActionLogsParser ran before the combined pattern.
+_PATTERNS = (
+    re.compile(r'(\d+) failed, \d+ passed'),
+    re.compile(r'FAILED \(failures=(\d+)\)'),
+    re.compile(r'Tests failed: (\d+)', re.IGNORECASE),
+)
+
+
+def synthetic_log(megabytes: int) -> str:
+    lines = []
+    size = 0
+    while size < megabytes * 1024 * 1024:
+        line = NOISE[len(lines) % len(NOISE)]
+        if len(lines) % 50000 == 49999:
+            line = SUMMARIES[(len(lines) // 50000) % len(SUMMARIES)]
+        lines.append(line)
+        size += len(line) + 1
+    return "\n".join(lines) + "\n"
+
+
+def per_pattern(lines: Iterable[str]) -> Optional[int]:
+    found = [None] * len(_PATTERNS)
+    for line in lines:
+        for i, pattern in enumerate(_PATTERNS):
+            if found[i] is None:
+                match = pattern.search(line)
+                if match:
+                    found[i] = int(match.group(1))
+    return next((count for count in found if count is not None), None)
+
+
+def combined(text: io.StringIO) -> int:
+    counts = ActionLogsParser.count_failed_tests_by_framework(
+        iter(lambda: text.read(CHUNK_SIZE), "")
+    )
+    return sum(counts.values())
+
+
+def main(megabytes: int = 64):
+    log = synthetic_log(megabytes)
+    print(f"synthetic log: {len(log) / 1024 / 1024:.1f} MB, {log.count(chr(10))} lines")
+    for name, func in (("per-pattern", lambda: per_pattern(io.StringIO(log))),
+                       ("combined", lambda: combined(io.StringIO(log)))):
+        start = time.perf_counter()
+        result = func()
+        seconds = time.perf_counter() - start
+        print(f"{name:12s} {seconds:7.3f} s  {megabytes / seconds:8.1f} MB/s  failed={result}")
+
+
+if __name__ == "__main__":
+    main()
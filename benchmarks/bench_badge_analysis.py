@@ -0,0 +1,62 @@
+"""Microbenchmark: per-service badge parsing vs. the single-pass BadgeAnalysis.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_badge_analysis
+"""
+import timeit
+from typing import List, Optional
+from app.parsers.badge_analysis import BadgeAnalysis
+from app.parsers.shield_parser import ShieldParser
+
+BADGES = [
+    "https://img.shields.io/github/actions/workflow/status/user/repo/ci.yml",
+    "https://img.shields.io/badge/coverage-87%25-green",
+    "https://img.shields.io/badge/version-v1.2.3-blue",
+    "https://img.shields.io/badge/python-3.10%2B-blue",
+    "https://img.shields.io/badge/license-MIT-yellow",
+    "https://img.shields.io/badge/code%20style-black-000000",
+    "https://sonarcloud.io/api/project_badges/measure?project=user_repo&metric=alert_status",
+    "https://github.com/user/repo/actions/workflows/codeql.yml/badge.svg",
+    "https://codecov.io/gh/user/repo/branch/main/graph/badge.svg",
+    "https://api.codeclimate.com/v1/badges/abc/maintainability",
+]
+
+
+def _quality_tools(badges: List[str]) -> List[str]:
+    """The substring scan QualityService used to run (twice per repository)."""
+    tools: List[str] = []
+    for url in badges:
+        url_lower = url.lower()
+        for needle, name in (("sonar", "SonarCloud"), ("codeclimate", "Code Climate"),
+                             ("codeql", "CodeQL"), ("codecov", "Codecov")):
+            if needle in url_lower and name not in tools:
+                tools.append(name)
+    return tools
+
+
+def per_service(badges: List[str]):
+    """What coverage, quality, CodeQL and version services did separately."""
+    coverage: Optional[float] = next(
+        (c for c in map(ShieldParser.extract_coverage, badges) if c is not None), None
+    )
+    tools = _quality_tools(badges)
+    codeql = "CodeQL" in _quality_tools(badges)
+    version = next((v.lstrip('v') for v in map(ShieldParser.extract_version, badges) if v), None)
+    return coverage, tools, codeql, version
+
+
+def single_pass(badges: List[str]):
+    analysis = BadgeAnalysis.from_badges(badges)
+    return analysis.coverage, analysis.quality_tools, analysis.codeql, analysis.version
+
+
+def main(number: int = 20000):
+    assert per_service(BADGES) == single_pass(BADGES)
+    for name, func in (("per-service", per_service), ("single-pass", single_pass)):
+        seconds = min(timeit.repeat(lambda: func(BADGES), number=number, repeat=5))
+        print(f"{name:12s} {seconds / number * 1e6:8.2f} us per README ({len(BADGES)} badges)")
+
+
+if __name__ == "__main__":
+    main()
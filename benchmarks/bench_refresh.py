@@ -0,0 +1,147 @@
+"""Refresh cost against a simulated GitHub: wall time, requests, quota and memory.
+
+Drives `list_repos`, `refresh_account` and `fetch_repo_metrics` against
+`app.testing.fake_github` (no network, no quota). Every scenario starts from empty
+caches and runs twice: once for wall time, once under `tracemalloc` for peak memory.
+Results are compared with `benchmarks/baselines/refresh.json`; request and quota
+counts are deterministic and must not grow, time and memory may drift by
+`--tolerance`. Run from the repository root:
+
+    python -m benchmarks.bench_refresh                  # compare with the baseline
+    python -m benchmarks.bench_refresh --save-baseline  # record a new baseline
+"""
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+from app.api.repos import fetch_repo_metrics, list_repos, refresh_account
+from app.models.requests import RepoListQuery
+from app.testing.fake_github import FakeGitHub, simulated_github
+
+BASELINE = Path(__file__).parent / "baselines" / "refresh.json"
+# Simulated round trip per endpoint family, in seconds.
+LATENCY = {"default": 0.02, "repos": 0.05, "logs": 0.05, "log_storage": 0.1}
+# Share of repositories answering 404, per endpoint family.
+NOT_FOUND = {"readme": 0.1, "runs": 0.2}
+
+
+@dataclass
+class Result:
+    wall_s: float
+    requests: int
+    quota: int
+    not_modified: int
+    peak_mib: float
+
+
+@dataclass
+class Scenario:
+    name: str
+    repo_count: int
+    run: Callable[[FakeGitHub], Awaitable[object]]
+    prepare: Optional[Callable[[FakeGitHub], Awaitable[object]]] = None
+
+
+async def _list_repos(fake: FakeGitHub):
+    return await list_repos(RepoListQuery(username=fake.owner))
+
+
+async def _refresh(fake: FakeGitHub):
+    return await refresh_account(fake.owner)
+
+
+async def _fetch_repo_metrics(fake: FakeGitHub):
+    return await asyncio.gather(*[fetch_repo_metrics(repo) for repo in fake.repos])
+
+
+def scenarios(sizes: List[int]) -> List[Scenario]:
+    result = [Scenario("fetch_repo_metrics x10", 10, _fetch_repo_metrics)]
+    for size in sizes:
+        result.append(Scenario(f"list_repos cold {size}", size, _list_repos))
+        result.append(Scenario(f"refresh unchanged {size}", size, _refresh, prepare=_list_repos))
+    return result
+
+
+async def measure(scenario: Scenario, trace: bool, paced: bool) -> Result:
+    fake = FakeGitHub(
+        repo_count=scenario.repo_count, latency=LATENCY, not_found=NOT_FOUND, rate_limit=10 ** 6
+    )
+    async with simulated_github(fake, paced=paced):
+        if scenario.prepare:
+            await scenario.prepare(fake)
+        fake.reset_stats()
+        if trace:
+            tracemalloc.start()
+        start = time.perf_counter()
+        await scenario.run(fake)
+        wall = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if trace else 0
+        tracemalloc.stop()
+    return Result(
+        wall_s=round(wall, 3),
+        requests=sum(fake.requests.values()),
+        quota=fake.quota_used,
+        not_modified=fake.not_modified,
+        peak_mib=round(peak / 2 ** 20, 2),
+    )
+
+
+def regressions(
+    name: str, result: Result, baseline: Dict[str, float], tolerance: float
+) -> List[str]:
+    found = []
+    for key in ("requests", "quota"):
+        if getattr(result, key) > baseline[key]:
+            found.append(f"{name}: {key} {baseline[key]} -> {getattr(result, key)}")
+    for key in ("wall_s", "peak_mib"):
+        if getattr(result, key) > baseline[key] * (1 + tolerance):
+            found.append(f"{name}: {key} {baseline[key]} -> {getattr(result, key)}")
+    return found
+
+
+async def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--paced", action="store_true", help="keep the production request pacing")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed time/memory growth")
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args(argv)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    baseline = json.loads(BASELINE.read_text()) if BASELINE.exists() else {}
+    results: Dict[str, Dict[str, float]] = {}
+    found: List[str] = []
+    print(
+        f"{'scenario':26s} {'wall s':>8s} {'requests':>9s} {'quota':>7s} {'304':>6s} "
+        f"{'peak MiB':>9s}"
+    )
+    for scenario in scenarios(args.sizes):
+        timed = await measure(scenario, trace=False, paced=args.paced)
+        traced = await measure(scenario, trace=True, paced=args.paced)
+        result = Result(
+            timed.wall_s, timed.requests, timed.quota, timed.not_modified, traced.peak_mib
+        )
+        results[scenario.name] = asdict(result)
+        print(f"{scenario.name:26s} {result.wall_s:8.3f} {result.requests:9d} {result.quota:7d} "
+              f"{result.not_modified:6d} {result.peak_mib:9.2f}")
+        if scenario.name in baseline:
+            found += regressions(scenario.name, result, baseline[scenario.name], args.tolerance)
+
+    if args.save_baseline:
+        BASELINE.parent.mkdir(parents=True, exist_ok=True)
+        BASELINE.write_text(json.dumps({**baseline, **results}, indent=2, sort_keys=True) + "\n")
+        print(f"Baseline written to {BASELINE}")
+        return 0
+    for line in found:
+        print(f"REGRESSION {line}")
+    return 1 if found else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -1,6 +1,15 @@
 import pytest
 from httpx import AsyncClient
+from pydantic import ValidationError
+from unittest.mock import AsyncMock, patch
+from app.cache.response_cache import response_cache
+from app.cache.snapshot import RepoSnapshot
+from app.cache.ttl_cache import ttl_cache
+from app.api import repos as repos_api
 from app.main import app
+from app.models.enums import BuildStatus
+from app.models.metrics import RepoMetrics
+from app.models.repo import Repository
 
 @pytest.mark.asyncio
 async def test_health_endpoint():
@@ -20,3 +29,97 @@ async def test_dashboard_endpoint():
         response = await ac.get("/")
     assert response.status_code == 200
     assert "GitHub Repo Observatory" in response.text
+
+@pytest.mark.asyncio
+async def test_repos_pagination_and_projection():
+    """limit/cursor page through the list and fields restricts what is serialized."""
+    repos = [
+        Repository(name=f"r{i}", full_name=f"user/r{i}", html_url=f"https://github.com/user/r{i}",
+                   metrics=RepoMetrics(build_status=BuildStatus.SUCCESS,
+                                       readme_badges=["https://img.shields.io/badge/a-b-c"]))
+        for i in range(5)
+    ]
+    with patch(
+        "app.api.repos._fetch_repos_from_cache_or_api", new_callable=AsyncMock
+    ) as mock_fetch:
+        mock_fetch.return_value = RepoSnapshot(repos)
+        async with AsyncClient(app=app, base_url="http://test") as ac:
+            first = await ac.get("/api/repos", params={
+                "limit": 2, "fields": "name,metrics.build_status"
+            })
+            cursor = first.headers["X-Next-Cursor"]
+            second = await ac.get("/api/repos", params={
+                "limit": 2, "fields": "name,metrics.build_status", "cursor": cursor
+            })
+            last = await ac.get("/api/repos", params={
+                "limit": 2, "cursor": second.headers["X-Next-Cursor"]
+            })
+            invalid = await ac.get("/api/repos", params={"fields": "name,secret"})
+
+    assert first.json() == [
+        {"name": "r0", "metrics": {"build_status": "success"}},
+        {"name": "r1", "metrics": {"build_status": "success"}},
+    ]
+    assert first.headers["X-Total-Count"] == "5"
+    assert 'rel="next"' in first.headers["Link"]
+    assert [r["name"] for r in second.json()] == ["r2", "r3"]
+    assert [r["name"] for r in last.json()] == ["r4"]
+    assert last.json()[0]["metrics"]["readme_badges"]
+    assert "X-Next-Cursor" not in last.headers
+    assert invalid.status_code == 422
+    assert invalid.json()["detail"][0]["loc"] == ["query", "fields"]
+
+@pytest.mark.asyncio
+async def test_internal_validation_errors_are_not_client_errors():
+    """Only the query is reported as 422; a model failing during enrichment is a 500."""
+    def broken(*args, **kwargs):
+        Repository(name="r", full_name="user/r", html_url="not a url")
+
+    with patch("app.api.repos._fetch_repos_from_cache_or_api", side_effect=broken):
+        async with AsyncClient(app=app, base_url="http://test") as ac:
+            invalid = await ac.get("/api/repos", params={"limit": "0"})
+            with pytest.raises(ValidationError):
+                await ac.get("/api/repos", params={"username": "user"})
+    assert invalid.status_code == 422
+
+@pytest.mark.asyncio
+async def test_repos_responses_are_cached_with_etag():
+    """Warm requests reuse the serialized body, honour If-None-Match and are precompressed."""
+    repos = [
+        Repository(name=f"r{i}", full_name=f"user/r{i}", html_url=f"https://github.com/user/r{i}",
+                   description="x" * 100)
+        for i in range(10)
+    ]
+    ttl_cache.set("repos_cacheduser", repos)
+    response_cache.clear()
+    with patch("app.api.repos._select_repositories",
+               side_effect=repos_api._select_repositories) as mock_select:
+        async with AsyncClient(app=app, base_url="http://test") as ac:
+            first = await ac.get("/api/repos", params={"username": "cacheduser"},
+                                 headers={"Accept-Encoding": "identity"})
+            gzipped = await ac.get("/api/repos", params={"username": "cacheduser"},
+                                   headers={"Accept-Encoding": "gzip"})
+            revalidated = await ac.get("/api/repos", params={"username": "cacheduser"},
+                                       headers={"If-None-Match": first.headers["ETag"]})
+            ttl_cache.set("repos_cacheduser", repos[:1])
+            changed = await ac.get("/api/repos", params={"username": "cacheduser"},
+                                   headers={"If-None-Match": first.headers["ETag"]})
+            # Writes for other accounts or other keys keep the response cached.
+            ttl_cache.set("repos_otheruser", repos)
+            ttl_cache.set("repo_user/r0", repos[0])
+            unaffected = await ac.get("/api/repos", params={"username": "cacheduser"},
+                                      headers={"If-None-Match": changed.headers["ETag"]})
+
+    assert first.status_code == 200
+    assert [r["name"] for r in first.json()] == [f"r{i}" for i in range(10)]
+    assert gzipped.headers["Content-Encoding"] == "gzip"
+    assert gzipped.json() == first.json()
+    assert gzipped.headers["ETag"] != first.headers["ETag"]
+    assert revalidated.status_code == 304
+    assert changed.status_code == 200
+    assert len(changed.json()) == 1
+    assert unaffected.status_code == 304
+    assert mock_select.call_count == 2
+    ttl_cache.delete("repos_cacheduser")
+    ttl_cache.delete("repos_otheruser")
+    ttl_cache.delete("repo_user/r0")
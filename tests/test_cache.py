@@ -1,6 +1,12 @@
 import pytest
 import time
 from app.cache.ttl_cache import TTLCache
+from app.cache.backends import MemoryBackend, SQLiteBackend, create_backend
+from app.cache.snapshot import RepoSnapshot
+from app.exceptions import CacheError
+from app.models.enums import BuildStatus, CodeQLStatus, FilterValue
+from app.models.metrics import RepoMetrics
+from app.models.repo import Repository
 
 def test_ttl_cache_set_and_get():
     """Cache should store and retrieve values."""
@@ -28,3 +34,140 @@ def test_ttl_cache_delete():
     cache.set("key", "value")
     cache.delete("key")
     assert cache.get("key") is None
+
+def test_ttl_cache_serves_stale_until_hard_ttl():
+    """Entries between soft and hard TTL are returned as stale."""
+    cache = TTLCache(default_ttl=1, default_hard_ttl=60)
+    cache.set("key", "value")
+    assert cache.get_with_staleness("key") == ("value", False)
+    time.sleep(1.1)
+    assert cache.get("key") is None
+    assert cache.get_with_staleness("key") == ("value", True)
+
+def test_ttl_cache_hard_ttl_expiry():
+    """Entries past their hard TTL are removed."""
+    cache = TTLCache(default_ttl=60)
+    cache.set("key", "value", ttl=1, hard_ttl=1)
+    time.sleep(1.1)
+    assert cache.get_with_staleness("key") == (None, False)
+    assert "key" not in cache._cache
+
+def test_sqlite_backend_survives_restart(tmp_path):
+    """Entries written to the SQLite backend are readable by a new cache instance."""
+    path = str(tmp_path / "cache.sqlite3")
+    repo = Repository(name="repo", full_name="user/repo", html_url="https://github.com/user/repo")
+    cache = TTLCache(default_ttl=60, backend=SQLiteBackend(path))
+    cache.set("repos_user", [repo])
+    cache._cache.close()
+
+    reopened = TTLCache(default_ttl=60, backend=SQLiteBackend(path))
+    assert reopened.get("repos_user") == [repo]
+    assert len(reopened._cache) == 1
+
+def test_sqlite_backend_purges_expired_on_open(tmp_path):
+    """Entries past their hard TTL are removed when the database is opened."""
+    path = str(tmp_path / "cache.sqlite3")
+    backend = SQLiteBackend(path)
+    backend.set("old", ("value", time.time() - 10, time.time() - 5))
+    backend.set("new", ("value", time.time() + 10, time.time() + 10))
+    backend.close()
+
+    reopened = SQLiteBackend(path)
+    assert "old" not in reopened
+    assert "new" in reopened
+
+def test_create_backend_rejects_unknown_kind():
+    with pytest.raises(CacheError):
+        create_backend("redis", "unused")
+
+def test_memory_backend_evicts_least_recently_used():
+    """The oldest unused entry is evicted once max_entries is exceeded."""
+    cache = TTLCache(default_ttl=60, backend=MemoryBackend(max_entries=2))
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+def test_memory_backend_respects_max_bytes():
+    """Entries are evicted to keep the approximate size under max_bytes."""
+    backend = MemoryBackend(max_bytes=5000)
+    cache = TTLCache(default_ttl=60, backend=backend)
+    for i in range(50):
+        cache.set(f"user{i}", "x" * 1000)
+    assert backend.total_bytes <= 5000
+    assert len(backend) < 50
+
+def test_snapshot_size_is_estimated_from_a_sample():
+    """Snapshots are not pickled whole on every write; their estimate is close enough."""
+    import pickle
+    from unittest.mock import patch
+
+    repos = [
+        _snapshot_repo(f"r{i}", quality_tools=["ruff"] * (i % 3), last_commit_at="2024-01-01")
+        for i in range(500)
+    ]
+    snapshot = RepoSnapshot(repos)
+    actual = len(pickle.dumps(snapshot))
+    backend = MemoryBackend(max_bytes=10 * actual)
+    assert 0.7 * actual <= snapshot.approximate_size <= 1.3 * actual
+    # Estimated once per snapshot, not on each cache write.
+    with patch("app.cache.backends.pickle.dumps") as dumps:
+        backend.set("repos_user", (snapshot, 0.0, 0.0))
+    dumps.assert_not_called()
+    assert backend.total_bytes == snapshot.approximate_size
+
+def test_expired_entries_are_swept_on_write():
+    """Entries past their hard TTL are removed without being read again."""
+    cache = TTLCache(default_ttl=60)
+    cache.set("one-off", "value", ttl=1)
+    time.sleep(1.1)
+    cache.set("other", "value")
+    assert "one-off" not in cache._cache
+    assert cache.stats()["expirations"] == 1
+
+def test_cache_counters():
+    cache = TTLCache(default_ttl=60)
+    cache.set("key", "value")
+    cache.get("key")
+    cache.get("missing")
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["entries"] == 1
+
+def _snapshot_repo(name, **metrics):
+    return Repository(
+        name=name, full_name=f"user/{name}", html_url=f"https://github.com/user/{name}",
+        metrics=RepoMetrics(**metrics) if metrics else None
+    )
+
+def test_repo_snapshot_filters_and_sorts():
+    repos = [
+        _snapshot_repo("a", build_status=BuildStatus.SUCCESS, coverage_percentage=50.0,
+                       quality_tools=["ruff"], last_commit_at="2024-01-01T00:00:00Z"),
+        _snapshot_repo("b", build_status=BuildStatus.FAILURE, coverage_percentage=90.0,
+                       codeql_status=CodeQLStatus.ACTIVE, last_commit_at="2024-03-01T00:00:00Z"),
+        _snapshot_repo("c"),
+        _snapshot_repo("d", build_status=BuildStatus.SUCCESS, coverage_percentage=50.0,
+                       quality_tools=["mypy", "ruff"]),
+    ]
+    snapshot = RepoSnapshot(repos)
+
+    def names(**kwargs):
+        page, total = snapshot.select(**kwargs)
+        return [r.name for r in page], total
+
+    assert list(snapshot) == repos and len(snapshot) == 4
+    assert names() == (["a", "b", "c", "d"], 4)
+    assert names(filter_test=FilterValue.PASS) == (["a", "d"], 2)
+    assert names(filter_quality=FilterValue.FAIL) == (["b"], 1)
+    assert names(filter_codeql=FilterValue.NONE, filter_quality=FilterValue.PASS) == (["a", "d"], 2)
+    # Ties keep listing order; repositories without metrics rank as unknown status.
+    assert names(sort_by="coverage") == (["b", "a", "d", "c"], 4)
+    assert names(sort_by="status") == (["a", "d", "c", "b"], 4)
+    assert names(sort_by="last_commit") == (["b", "a", "c", "d"], 4)
+    assert names(sort_by="coverage", offset=1, limit=2) == (["a", "d"], 4)
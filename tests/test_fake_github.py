@@ -0,0 +1,77 @@
+import httpx
+import pytest
+from app.api.repos import fetch_repo_metrics, get_repositories, refresh_account
+from app.models.enums import BuildStatus
+from app.cache.backends import SQLiteBackend
+from app.cache.ttl_cache import ttl_cache
+from app.models.requests import RepoListQuery
+from app.services import github_client as github_client_module, warmup
+from app.testing.fake_github import FakeGitHub, simulated_github
+
+
+@pytest.mark.asyncio
+async def test_fetch_repo_metrics_against_simulated_github():
+    fake = FakeGitHub(repo_count=4)
+    async with simulated_github(fake):
+        repository = await fetch_repo_metrics(fake.repos[3])
+
+    metrics = repository.metrics
+    assert metrics.build_status == BuildStatus.FAILURE
+    assert metrics.failing_tests_count == 2
+    assert metrics.coverage_percentage == 53.0
+    assert metrics.commit_count == 103
+    assert fake.requests["logs"] == 1 and fake.requests["log_storage"] == 1
+    # The log storage download is not an API call and costs no quota.
+    assert fake.quota_used == sum(fake.requests.values()) - 1
+
+
+@pytest.mark.asyncio
+async def test_unchanged_refresh_costs_no_quota():
+    fake = FakeGitHub(repo_count=150, not_found={"readme": 0.5})
+    async with simulated_github(fake):
+        repositories = await get_repositories(RepoListQuery(username=fake.owner))
+        assert len(repositories) == 150
+        assert fake.requests["repos"] == 2
+        assert 0 < fake.requests["readme"] == 150
+        assert sum(not r.metrics.readme_badges for r in repositories) > 0
+
+        fake.reset_stats()
+        await refresh_account(fake.owner)
+
+    assert dict(fake.requests) == {"repos": 2}
+    assert fake.not_modified == 2
+    assert fake.quota_used == 0
+
+
+@pytest.mark.asyncio
+async def test_simulation_keeps_the_production_cache_and_limiter(tmp_path, monkeypatch):
+    backend = SQLiteBackend(str(tmp_path / "cache.db"))
+    monkeypatch.setattr(ttl_cache, "_cache", backend)
+    ttl_cache.set("repos_production", ["kept"])
+    production_limiter = warmup.github_rate_limiter
+    fake = FakeGitHub(repo_count=1)
+    async with simulated_github(fake):
+        assert ttl_cache.get("repos_production") is None
+        assert warmup.github_rate_limiter is not production_limiter
+        assert warmup.github_rate_limiter is github_client_module.github_rate_limiter
+        ttl_cache.clear()
+
+    assert ttl_cache.get("repos_production") == ["kept"]
+    assert warmup.github_rate_limiter is production_limiter
+    backend.close()
+
+
+@pytest.mark.asyncio
+async def test_exhausted_quota_answers_403():
+    fake = FakeGitHub(repo_count=1, rate_limit=1)
+    client = httpx.AsyncClient(transport=fake.transport, base_url="https://api.github.com")
+    async with client:
+        first = await client.get("/repos/octo-bench/repo-0000/tags")
+        second = await client.get("/repos/octo-bench/repo-0000/tags")
+        revalidated = await client.get(
+            "/repos/octo-bench/repo-0000/tags", headers={"If-None-Match": first.headers["ETag"]}
+        )
+
+    assert first.status_code == 200 and first.headers["X-RateLimit-Remaining"] == "0"
+    assert second.status_code == 403 and "rate limit" in second.text
+    assert revalidated.status_code == 304
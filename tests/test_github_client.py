@@ -1,3 +1,5 @@
+import asyncio
+import httpx
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
 from app.services.github_client import GitHubClient
@@ -32,3 +34,136 @@ async def test_get_pages_url():
         url = await client.get_pages_url("owner", "repo")
         assert url == "https://owner.github.io/repo/"
         mock_get.assert_called_once_with("repos/owner/repo/pages")
+
+@pytest.mark.asyncio
+async def test_conditional_request_replays_body_on_304():
+    seen_headers = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_headers.append(dict(request.headers))
+        if request.headers.get("If-None-Match") == '"abc"':
+            return httpx.Response(304)
+        return httpx.Response(200, json={"html_url": "https://owner.github.io/repo/"},
+                              headers={"ETag": '"abc"'})
+
+    client = GitHubClient(transport=httpx.MockTransport(handler))
+    first = await client.get_pages_url("owner", "repo")
+    second = await client.get_pages_url("owner", "repo")
+
+    assert first == second == "https://owner.github.io/repo/"
+    assert "if-none-match" not in seen_headers[0]
+    assert seen_headers[1]["if-none-match"] == '"abc"'
+    assert client.validators.hits == 1
+    assert client.validators.misses == 1
+    assert client.validators.hit_rate == 0.5
+
+@pytest.mark.asyncio
+async def test_conditional_request_uses_last_modified():
+    seen_headers = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_headers.append(dict(request.headers))
+        if "If-Modified-Since" in request.headers:
+            return httpx.Response(304)
+        return httpx.Response(200, json=[{"name": "v1.0.0"}],
+                              headers={"Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+
+    client = GitHubClient(transport=httpx.MockTransport(handler))
+    assert await client.get_latest_tag("owner", "repo") == "v1.0.0"
+    assert await client.get_latest_tag("owner", "repo") == "v1.0.0"
+    assert seen_headers[1]["if-modified-since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+
+@pytest.mark.asyncio
+async def test_iter_user_repos_paginates_concurrently():
+    requested_pages = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        requested_pages.append(page)
+        assert request.url.params["per_page"] == "100"
+        headers = {}
+        if page == 1:
+            headers["Link"] = (
+                '<https://api.github.com/users/u/repos?per_page=100&page=2>; rel="next", '
+                '<https://api.github.com/users/u/repos?per_page=100&page=3>; rel="last"'
+            )
+        return httpx.Response(200, json=[{"name": f"repo-{page}-{i}"} for i in range(2)],
+                              headers=headers)
+
+    client = GitHubClient(transport=httpx.MockTransport(handler))
+    with patch("app.services.github_client.github_rate_limiter.wait", new_callable=AsyncMock):
+        names = [repo["name"] async for repo in client.iter_user_repos("u")]
+        all_repos = await client.get_user_repos("u")
+
+    assert names == [f"repo-{p}-{i}" for p in (1, 2, 3) for i in range(2)]
+    assert len(all_repos) == 6
+    assert sorted(requested_pages[:3]) == [1, 2, 3]
+
+@pytest.mark.asyncio
+async def test_iter_user_repos_raises_instead_of_truncating():
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        if page == 2:
+            return httpx.Response(502)
+        return httpx.Response(200, json=[{"name": f"repo-{page}"}], headers={
+            "Link": '<https://api.github.com/users/u/repos?per_page=100&page=2>; rel="last"'
+        })
+
+    client = GitHubClient(transport=httpx.MockTransport(handler))
+    with patch("app.services.github_client.github_rate_limiter.wait", new_callable=AsyncMock):
+        with pytest.raises(httpx.HTTPStatusError):
+            [repo async for repo in client.iter_user_repos("u")]
+        assert await client.get_user_repos("u") == []
+
+@pytest.mark.asyncio
+async def test_listing_retries_server_errors_only():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if request.url.path == "/users/gone/repos":
+            return httpx.Response(404)
+        if len(calls) == 1:
+            return httpx.Response(502)
+        return httpx.Response(200, json=[{"name": "repo"}])
+
+    client = GitHubClient(transport=httpx.MockTransport(handler))
+    with patch("app.services.github_client.github_rate_limiter.wait", new_callable=AsyncMock):
+        assert [r["name"] async for r in client.iter_user_repos("u")] == ["repo"]
+        with pytest.raises(httpx.HTTPStatusError):
+            [r async for r in client.iter_user_repos("gone")]
+
+    assert calls == ["/users/u/repos", "/users/u/repos", "/users/gone/repos"]
+
+@pytest.mark.asyncio
+async def test_fetch_cycle_shares_identical_requests():
+    """get_last_commit and get_commit_count share one request within a fetch cycle."""
+    calls = []
+
+    def handler(request):
+        calls.append(str(request.url))
+        if request.url.path.endswith("/pages") and len(calls) == 2:
+            return httpx.Response(502)
+        if request.url.path.endswith("/pages"):
+            return httpx.Response(200, json={"html_url": "https://owner.github.io/repo"})
+        return httpx.Response(
+            200,
+            json=[{"sha": "abc", "commit": {"committer": {"date": "2024-01-01T00:00:00Z"}}}],
+            headers={"Link": '<https://api.github.com/x?per_page=1&page=42>; rel="last"'}
+        )
+
+    client = GitHubClient(transport=httpx.MockTransport(handler))
+    with patch("app.services.github_client.github_rate_limiter.wait", new_callable=AsyncMock):
+        with client.fetch_cycle():
+            last_commit, count = await asyncio.gather(
+                client.get_last_commit("owner", "repo"), client.get_commit_count("owner", "repo")
+            )
+            # A failed request is not shared, so a retry within the cycle goes out again.
+            assert await client.get_pages_url("owner", "repo") is None
+            assert await client.get_pages_url("owner", "repo") == "https://owner.github.io/repo"
+        await client.get_commit_count("owner", "repo")
+
+    assert last_commit["sha"] == "abc"
+    assert count == 42
+    assert len(calls) == 4
+    assert client.dedup_hits == 1
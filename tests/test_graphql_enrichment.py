@@ -0,0 +1,132 @@
+import json
+import httpx
+import pytest
+from unittest.mock import AsyncMock, patch
+from app.api import repos as repos_api
+from app.models.enums import BuildStatus, CodeQLStatus
+from app.services.github_client import GitHubClient
+from app.services.graphql_enrichment import GraphQLEnrichmentService
+
+README = """
+[![coverage](https://img.shields.io/badge/coverage-91%25-green)](https://example.com)
+![codeql](https://github.com/user/alpha/actions/workflows/codeql.yml/badge.svg)
+"""
+
+GRAPHQL_REPOS = {
+    "user/alpha": {
+        "homepageUrl": "https://alpha.example.com",
+        "readme0": {"text": README},
+        "defaultBranchRef": {"target": {
+            "committedDate": "2024-03-01T12:00:00Z", "history": {"totalCount": 321}
+        }},
+        "latestRelease": {"tagName": "v1.4.0"},
+        "refs": {"nodes": [{"name": "v1.4.0"}]},
+    },
+    "user/beta": {
+        "homepageUrl": None,
+        "defaultBranchRef": None,
+        "latestRelease": None,
+        "refs": {"nodes": [{"name": "v0.2.0"}]},
+    },
+}
+
+
+class FakeGitHub:
+    """Local stand-in for the GitHub GraphQL and REST endpoints used by enrichment."""
+
+    def __init__(self, graphql_repos):
+        self.graphql_repos = graphql_repos
+        self.graphql_calls = 0
+        self.rest_paths = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/graphql":
+            self.graphql_calls += 1
+            variables = json.loads(request.content)["variables"]
+            data = {}
+            for key, owner in variables.items():
+                if key.startswith("o"):
+                    index = key[1:]
+                    data[f"r{index}"] = self.graphql_repos.get(f"{owner}/{variables['n' + index]}")
+            return httpx.Response(200, json={"data": data})
+
+        self.rest_paths.append(request.url.path)
+        if request.url.path == "/repos/user/beta/readme":
+            return httpx.Response(200, text="![v](https://img.shields.io/badge/version-0.3.0-blue)")
+        if request.url.path.endswith("/actions/runs"):
+            return httpx.Response(200, json={"workflow_runs": [
+                {"status": "completed", "conclusion": "success"}
+            ]})
+        return httpx.Response(404, json={"message": "Not Found"})
+
+
+def _repo(name):
+    return {
+        "name": name,
+        "full_name": f"user/{name}",
+        "html_url": f"https://github.com/user/{name}",
+        "owner": {"login": "user"},
+        "has_pages": False,
+    }
+
+
+async def _stream(repos):
+    for repo in repos:
+        yield repo
+
+
+@pytest.fixture
+def fake_github():
+    fake = FakeGitHub(GRAPHQL_REPOS)
+    client = GitHubClient(transport=httpx.MockTransport(fake))
+    with patch("app.services.graphql_enrichment.github_client", client), \
+         patch("app.services.badge_service.github_client", client), \
+         patch("app.services.actions_service.github_client", client), \
+         patch("app.services.github_client.github_rate_limiter.wait", new_callable=AsyncMock):
+        yield fake
+
+
+def test_build_batch_query_uses_aliases_and_variables():
+    query, variables = GraphQLEnrichmentService.build_batch_query([_repo("alpha"), _repo("beta")])
+    assert "r0: repository(owner: $o0, name: $n0)" in query
+    assert "r1: repository(owner: $o1, name: $n1)" in query
+    assert variables == {"o0": "user", "n0": "alpha", "o1": "user", "n1": "beta"}
+
+
+@pytest.mark.asyncio
+async def test_fetch_all_batches_repositories(fake_github):
+    result = await GraphQLEnrichmentService.fetch_all(
+        [_repo("alpha"), _repo("beta")], batch_size=10
+    )
+
+    assert fake_github.graphql_calls == 1
+    alpha = result["user/alpha"]
+    assert alpha.metrics.coverage_percentage == 91.0
+    assert alpha.metrics.codeql_status == CodeQLStatus.ACTIVE
+    assert alpha.metrics.commit_count == 321
+    assert alpha.metrics.last_commit_at == "2024-03-01T12:00:00Z"
+    assert alpha.metrics.version == "1.4.0"
+    assert alpha.metrics.build_status == BuildStatus.SUCCESS
+    assert str(alpha.pages_url).rstrip("/") == "https://alpha.example.com"
+
+    # No README expression resolved for beta, so its README came from REST.
+    beta = result["user/beta"]
+    assert "/repos/user/beta/readme" in fake_github.rest_paths
+    assert beta.metrics.version == "0.3.0"
+    assert "/repos/user/alpha/readme" not in fake_github.rest_paths
+
+
+@pytest.mark.asyncio
+async def test_graphql_backend_falls_back_to_rest_for_unresolved(fake_github):
+    missing = _repo("gamma")
+    with patch.object(repos_api.config, "ENRICHMENT_BACKEND", "graphql"), \
+         patch("app.api.repos.fetch_repo_metrics", new_callable=AsyncMock) as mock_rest:
+        mock_rest.return_value = repos_api.Repository(
+            name="gamma", full_name="user/gamma", html_url="https://github.com/user/gamma"
+        )
+        result = await repos_api._enrich_repositories(
+            _stream([_repo("alpha"), missing, _repo("beta")])
+        )
+
+    assert [r.full_name for r in result] == ["user/alpha", "user/gamma", "user/beta"]
+    mock_rest.assert_called_once_with(missing)
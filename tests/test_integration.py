@@ -1,9 +1,25 @@
+import asyncio
+import json
+import httpx
+import time
 import pytest
-from unittest.mock import AsyncMock, patch
-from app.api.repos import list_repos
+from unittest.mock import AsyncMock, MagicMock, patch
+from app.api.repos import get_repositories, _get_unchanged_repository
 from app.cache.ttl_cache import ttl_cache
+from app.exceptions import GitHubAPIError
+from app.main import app
 from app.models.requests import RepoListQuery
 from app.models.enums import BuildStatus
+from app.models.metrics import RepoMetrics
+from app.models.repo import Repository
+from app.parsers.badge_analysis import ReadmeBadges
+
+def _repos_stream(repos):
+    """Mocks GitHubClient.iter_user_repos, which is an async generator."""
+    async def stream(*args, **kwargs):
+        for repo in repos:
+            yield repo
+    return MagicMock(side_effect=stream)
 
 @pytest.mark.asyncio
 async def test_full_repo_analysis_pipeline():
@@ -16,7 +32,7 @@ async def test_full_repo_analysis_pipeline():
          patch("app.api.repos.BadgeService") as mock_badges:
 
         # Mock GitHub API Responses for the client calls in repos.py
-        mock_client.get_user_repos = AsyncMock(return_value=[{
+        mock_client.iter_user_repos = _repos_stream([{
             "name": "test-repo",
             "full_name": "user/test-repo",
             "html_url": "https://github.com/user/test-repo",
@@ -33,15 +49,16 @@ async def test_full_repo_analysis_pipeline():
 
         # Mock Services
         mock_actions.get_build_status = AsyncMock(return_value=BuildStatus.SUCCESS)
+        mock_actions.get_failed_tests_count = AsyncMock(return_value=None)
         mock_coverage.get_coverage = AsyncMock(return_value=85.0)
         mock_quality.get_quality_tools = AsyncMock(return_value=["SonarCloud"])
         mock_quality.get_codeql_status = AsyncMock(return_value="active")
-        mock_badges.get_all_badges = AsyncMock(return_value=["badge1"])
+        mock_badges.get_readme_badges = AsyncMock(return_value=ReadmeBadges.from_badges(["badge1"]))
 
         # Execute
         ttl_cache._cache.clear()
         query = RepoListQuery(username="user")
-        repos = await list_repos(query=query)
+        repos = await get_repositories(query)
 
         # Assertions
         assert len(repos) == 1
@@ -61,7 +78,7 @@ async def test_repo_with_pages_pipeline():
          patch("app.api.repos.BadgeService") as mock_badges:
 
         # Mock GitHub API Responses
-        mock_client.get_user_repos = AsyncMock(return_value=[{
+        mock_client.iter_user_repos = _repos_stream([{
             "name": "pages-repo",
             "full_name": "user/pages-repo",
             "html_url": "https://github.com/user/pages-repo",
@@ -76,15 +93,16 @@ async def test_repo_with_pages_pipeline():
 
         # Mock Services
         mock_actions.get_build_status = AsyncMock(return_value=BuildStatus.SUCCESS)
+        mock_actions.get_failed_tests_count = AsyncMock(return_value=None)
         mock_coverage.get_coverage = AsyncMock(return_value=None)
         mock_quality.get_quality_tools = AsyncMock(return_value=[])
         mock_quality.get_codeql_status = AsyncMock(return_value="none")
-        mock_badges.get_all_badges = AsyncMock(return_value=[])
+        mock_badges.get_readme_badges = AsyncMock(return_value=ReadmeBadges())
 
         # Execute
         ttl_cache._cache.clear()
         query = RepoListQuery(username="user")
-        repos = await list_repos(query=query)
+        repos = await get_repositories(query)
 
         # Assertions
         assert len(repos) == 1
@@ -103,7 +121,7 @@ async def test_repo_with_empty_homepage_pipeline():
          patch("app.api.repos.BadgeService") as mock_badges:
 
         # Mock GitHub API Responses with empty homepage
-        mock_client.get_user_repos = AsyncMock(return_value=[{
+        mock_client.iter_user_repos = _repos_stream([{
             "name": "empty-homepage-repo",
             "full_name": "user/empty-homepage-repo",
             "html_url": "https://github.com/user/empty-homepage-repo",
@@ -118,19 +136,203 @@ async def test_repo_with_empty_homepage_pipeline():
 
         # Mock Services
         mock_actions.get_build_status = AsyncMock(return_value=BuildStatus.UNKNOWN)
+        mock_actions.get_failed_tests_count = AsyncMock(return_value=None)
         mock_coverage.get_coverage = AsyncMock(return_value=None)
         mock_quality.get_quality_tools = AsyncMock(return_value=[])
         mock_quality.get_codeql_status = AsyncMock(return_value="none")
-        mock_badges.get_all_badges = AsyncMock(return_value=[])
+        mock_badges.get_readme_badges = AsyncMock(return_value=ReadmeBadges())
 
         # Execute
         ttl_cache._cache.clear()
         query = RepoListQuery(username="user")
         # This used to raise ValidationError
-        repos = await list_repos(query=query)
+        repos = await get_repositories(query)
 
         # Assertions
         assert len(repos) == 1
         repo = repos[0]
         assert repo.name == "empty-homepage-repo"
         assert repo.pages_url is None
+
+@pytest.mark.asyncio
+async def test_stale_repos_are_served_while_refreshing():
+    """A stale cache entry is returned immediately and refreshed in the background."""
+    stale_repo = Repository(
+        name="old", full_name="user/old", html_url="https://github.com/user/old"
+    )
+    fresh_repo = Repository(
+        name="new", full_name="user/new", html_url="https://github.com/user/new"
+    )
+    ttl_cache._cache.clear()
+    ttl_cache.set("repos_user", [stale_repo], ttl=1, hard_ttl=60)
+    time.sleep(1.1)
+
+    with patch("app.api.repos._enrich_repositories", new_callable=AsyncMock) as mock_enrich:
+        mock_enrich.return_value = [fresh_repo]
+        repos = await get_repositories(RepoListQuery(username="user"))
+        assert [r.name for r in repos] == ["old"]
+
+        await asyncio.sleep(0.01)
+        mock_enrich.assert_called_once()
+        assert [r.name for r in ttl_cache.get("repos_user")] == ["new"]
+    ttl_cache._cache.clear()
+
+@pytest.mark.asyncio
+async def test_refresh_reenriches_only_changed_repos():
+    """Repos whose pushed_at/updated_at are unchanged reuse their stored metrics."""
+    def listing(pushed_b):
+        return [
+            {"name": "a", "full_name": "user/a", "html_url": "https://github.com/user/a",
+             "owner": {"login": "user"}, "pushed_at": "2024-01-01T00:00:00Z",
+             "updated_at": "2024-01-01T00:00:00Z"},
+            {"name": "b", "full_name": "user/b", "html_url": "https://github.com/user/b",
+             "owner": {"login": "user"}, "pushed_at": pushed_b,
+             "updated_at": "2024-01-01T00:00:00Z"},
+        ]
+
+    async def enrich(repo_dict):
+        return Repository(name=repo_dict["name"], full_name=repo_dict["full_name"],
+                          html_url=repo_dict["html_url"])
+
+    ttl_cache._cache.clear()
+    with patch("app.api.repos.github_client") as mock_client, \
+         patch("app.api.repos.fetch_repo_metrics", side_effect=enrich) as mock_fetch:
+        mock_client.iter_user_repos = _repos_stream(listing("2024-01-01T00:00:00Z"))
+        await get_repositories(RepoListQuery(username="user"))
+        assert mock_fetch.call_count == 2
+
+        ttl_cache.delete("repos_user")
+        mock_client.iter_user_repos = _repos_stream(listing("2024-02-01T00:00:00Z"))
+        repos = await get_repositories(RepoListQuery(username="user"))
+
+        assert mock_fetch.call_count == 3
+        assert mock_fetch.call_args[0][0]["name"] == "b"
+        assert [r.name for r in repos] == ["a", "b"]
+    ttl_cache._cache.clear()
+
+@pytest.mark.asyncio
+async def test_failed_listing_is_not_cached():
+    """A listing that fails part-way raises and leaves the cache empty."""
+    async def failing_stream(*args, **kwargs):
+        yield {"name": "a", "full_name": "user/a", "html_url": "https://github.com/user/a",
+               "owner": {"login": "user"}}
+        raise httpx.HTTPStatusError("bad gateway", request=None, response=httpx.Response(502))
+
+    async def enrich(repo_dict):
+        return Repository(name=repo_dict["name"], full_name=repo_dict["full_name"],
+                          html_url=repo_dict["html_url"])
+
+    ttl_cache._cache.clear()
+    with patch("app.api.repos.github_client") as mock_client, \
+         patch("app.api.repos.fetch_repo_metrics", side_effect=enrich):
+        mock_client.iter_user_repos = MagicMock(side_effect=failing_stream)
+        with pytest.raises(GitHubAPIError):
+            await get_repositories(RepoListQuery(username="user"))
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            response = await client.get("/api/repos", params={"username": "user"})
+
+    assert response.status_code == 502
+    assert ttl_cache.get("repos_user") is None
+
+@pytest.mark.asyncio
+async def test_in_progress_builds_are_not_reused():
+    """A repo cached while its build was running is re-enriched even if unchanged."""
+    repo_dict = {"name": "a", "full_name": "user/a", "html_url": "https://github.com/user/a",
+                 "owner": {"login": "user"}, "pushed_at": "2024-01-01T00:00:00Z",
+                 "updated_at": "2024-01-01T00:00:00Z"}
+    running = Repository(name="a", full_name="user/a", html_url="https://github.com/user/a",
+                         metrics=RepoMetrics(build_status=BuildStatus.IN_PROGRESS))
+    ttl_cache._cache.clear()
+    ttl_cache.set("repo_user/a", ((repo_dict["pushed_at"], repo_dict["updated_at"]), running))
+
+    assert _get_unchanged_repository(repo_dict) is None
+    ttl_cache._cache.clear()
+
+@pytest.mark.asyncio
+async def test_stream_emits_repos_as_completed_then_caches():
+    """The stream yields each repo when its enrichment finishes and caches the full list."""
+    listing = [
+        {"name": name, "full_name": f"user/{name}", "html_url": f"https://github.com/user/{name}",
+         "owner": {"login": "user"}}
+        for name in ("slow", "fast")
+    ]
+
+    async def enrich(repo_dict):
+        await asyncio.sleep(0.05 if repo_dict["name"] == "slow" else 0)
+        metrics = RepoMetrics(build_status=BuildStatus.SUCCESS if repo_dict["name"] == "fast"
+                              else BuildStatus.FAILURE)
+        return Repository(name=repo_dict["name"], full_name=repo_dict["full_name"],
+                          html_url=repo_dict["html_url"], metrics=metrics)
+
+    ttl_cache._cache.clear()
+    with patch("app.api.repos.github_client") as mock_client, \
+         patch("app.api.repos.fetch_repo_metrics", side_effect=enrich):
+        mock_client.iter_user_repos = _repos_stream(listing)
+        async with httpx.AsyncClient(app=app, base_url="http://test") as ac:
+            response = await ac.get("/api/repos/stream", params={"username": "user"})
+
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert [e["data"]["name"] for e in events[:-1]] == ["fast", "slow"]
+    assert events[-1] == {"event": "summary",
+                          "data": {"total": 2, "matched": 2, "cached": False}}
+    assert [r.name for r in ttl_cache.get("repos_user")] == ["slow", "fast"]
+
+    async with httpx.AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.get("/api/repos/stream",
+                                params={"username": "user", "filter_test": "pass",
+                                        "format": "sse"})
+    assert response.text.startswith("event: repository\ndata: ")
+    assert response.text.count("event: repository") == 1
+    assert 'event: summary\ndata: {"total":2,"matched":1,"cached":true}' in response.text
+    ttl_cache._cache.clear()
+
+@pytest.mark.asyncio
+async def test_concurrent_streams_share_one_enrichment():
+    """Streams and /repos requests on a cold cache join one refresh of the account."""
+    listing = [
+        {"name": name, "full_name": f"user/{name}", "html_url": f"https://github.com/user/{name}",
+         "owner": {"login": "user"}}
+        for name in ("a", "b", "c")
+    ]
+    enriched = []
+
+    async def enrich(repo_dict):
+        enriched.append(repo_dict["name"])
+        await asyncio.sleep(0.02)
+        return Repository(name=repo_dict["name"], full_name=repo_dict["full_name"],
+                          html_url=repo_dict["html_url"])
+
+    ttl_cache._cache.clear()
+    with patch("app.api.repos.github_client") as mock_client, \
+         patch("app.api.repos.fetch_repo_metrics", side_effect=enrich):
+        mock_client.iter_user_repos = _repos_stream(listing)
+        async with httpx.AsyncClient(app=app, base_url="http://test") as ac:
+            first, second, listed = await asyncio.gather(
+                ac.get("/api/repos/stream", params={"username": "user"}),
+                ac.get("/api/repos/stream", params={"username": "user"}),
+                ac.get("/api/repos", params={"username": "user"}),
+            )
+
+    assert sorted(enriched) == ["a", "b", "c"]
+    for response in (first, second):
+        events = [json.loads(line) for line in response.text.splitlines()]
+        assert sorted(e["data"]["name"] for e in events[:-1]) == ["a", "b", "c"]
+        assert events[-1]["data"] == {"total": 3, "matched": 3, "cached": False}
+    assert [r["name"] for r in listed.json()] == ["a", "b", "c"]
+    ttl_cache._cache.clear()
+
+@pytest.mark.asyncio
+async def test_stream_of_empty_account_is_not_reported_as_cached():
+    ttl_cache._cache.clear()
+    with patch("app.api.repos.github_client") as mock_client:
+        mock_client.iter_user_repos = _repos_stream([])
+        async with httpx.AsyncClient(app=app, base_url="http://test") as ac:
+            fresh = await ac.get("/api/repos/stream", params={"username": "user"})
+            cached = await ac.get("/api/repos/stream", params={"username": "user"})
+
+    assert json.loads(fresh.text)["data"] == {"total": 0, "matched": 0, "cached": False}
+    assert json.loads(cached.text)["data"] == {"total": 0, "matched": 0, "cached": True}
+    ttl_cache._cache.clear()
@@ -0,0 +1,36 @@
+import argparse
+import json
+import pytest
+from app.loadtest import main, parse_mix, percentile
+
+
+def test_parse_mix():
+    assert parse_mix("/=1, /api/repos=3,/health") == [
+        ("/", 1.0), ("/api/repos", 3.0), ("/health", 1.0)
+    ]
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_mix("api/repos=1")
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_mix("/=0")
+
+
+def test_percentile_nearest_rank():
+    values = [float(i) for i in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 95) == 0.0
+
+
+def test_load_test_reports_both_phases(capsys):
+    main(["--users", "4", "--repos", "3", "--duration", "0.2", "--refresh-rounds", "1",
+          "--latency", "0", "--json"])
+    report = json.loads(capsys.readouterr().out)
+
+    refresh, cache_hit = report["refresh"], report["cache-hit"]
+    assert refresh["paths"]["all"]["requests"] == 4
+    assert refresh["paths"]["all"]["errors"] == 0
+    assert refresh["upstream_requests"] > 0
+    assert cache_hit["paths"]["all"]["requests"] > 0
+    assert cache_hit["paths"]["all"]["errors"] == 0
+    # Warm caches answer every viewer without calling GitHub.
+    assert cache_hit["upstream_requests"] == 0
@@ -0,0 +1,53 @@
+import pytest
+from httpx import AsyncClient
+from app.main import app
+from app.services.github_client import endpoint_family
+from app.utils.metrics import MetricsRegistry
+
+
+def test_registry_renders_prometheus_text():
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests.", ("family",))
+    latency = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    registry.collected("in_flight", "In flight.", "gauge", lambda: {(): 3})
+
+    requests.inc(family='say "hi"')
+    requests.inc(2, family='say "hi"')
+    for value in (0.05, 0.1, 0.5, 5.0):
+        latency.observe(value)
+
+    assert registry.render().splitlines() == [
+        "# HELP requests_total Requests.",
+        "# TYPE requests_total counter",
+        'requests_total{family="say \\"hi\\""} 3',
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{le="0.1"} 2',
+        'latency_seconds_bucket{le="1"} 3',
+        'latency_seconds_bucket{le="+Inf"} 4',
+        "latency_seconds_sum 5.65",
+        "latency_seconds_count 4",
+        "# HELP in_flight In flight.",
+        "# TYPE in_flight gauge",
+        "in_flight 3",
+    ]
+    with pytest.raises(ValueError):
+        requests.inc(status="200")
+
+
+def test_endpoint_family():
+    assert endpoint_family("/users/octo/repos") == "repos"
+    assert endpoint_family("/repos/octo/app/actions/runs/42/logs") == "logs"
+    assert endpoint_family("/repos/octo/app/releases/latest") == "releases"
+    assert endpoint_family("/repos/octo/app/contents/README.md") == "other"
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    for name in ("cache_requests_total", "refreshes_in_flight", "github_requests_total",
+                 "github_rate_limit_wait_seconds", "repo_enrichment_duration_seconds"):
+        assert f"# TYPE {name} " in response.text
@@ -1,6 +1,7 @@
-from app.parsers.readme_parser import ReadmeParser
+from app.parsers.readme_parser import ReadmeHead, ReadmeParser
 from app.parsers.shield_parser import ShieldParser
-from app.parsers.action_logs import ActionLogsParser
+from app.parsers.action_logs import ActionLogsParser, FailedTestScanner
+from app.parsers.badge_analysis import BadgeAnalysis
 
 def test_extract_badges():
     content = """
@@ -12,6 +13,19 @@ def test_extract_badges():
     assert "https://img.shields.io/github/actions/workflow/status/user/repo/ci.yml" in badges
     assert "https://img.shields.io/badge/coverage-85%25-green" in badges
 
+def test_readme_head_keeps_badges_in_sections_below_a_logo():
+    readme = (
+        '<img src="logo.png" width="200">\n\n# Project\n\nA short tagline.\n\n'
+        "## Badges\n\n![ci](https://img.shields.io/badge/ci-passing-green)\n\n"
+        "## Status\n\n![cov](https://img.shields.io/badge/coverage-80%25-green)\n\n"
+        "## Install\n\n" + "".join(f"step {i}\n" for i in range(50))
+    )
+    head = ReadmeHead()
+    assert head.feed(readme) is True
+    badges = ReadmeParser.extract_badges(head.text())
+    assert "https://img.shields.io/badge/coverage-80%25-green" in badges
+    assert "step 20" not in head.text()
+
 def test_parse_shield_url():
     url = "https://img.shields.io/badge/coverage-80%25-green"
     data = ShieldParser.parse_badge_url(url)
@@ -50,3 +64,47 @@ def test_count_failed_tests():
     log2 = "FAILED (failures=5)"
     count2 = ActionLogsParser.count_failed_tests(log2)
     assert count2 == 5
+
+def test_failed_test_scanner_counts_per_framework():
+    log = "\n".join([
+        "2024-01-01T00:00:00.0000000Z ===== 2 failed, 9 passed in 0.5s =====",
+        "FAILED (errors=1, failures=3)",
+        "Test Suites: 1 failed, 2 passed, 3 total",
+        "Tests:       4 failed, 10 passed, 14 total",
+        "2024-01-01T00:00:01.0000000Z --- FAIL: TestOne (0.00s)",
+        "2024-01-01T00:00:01.0000000Z     --- FAIL: TestOne/sub (0.00s)",
+        "--- FAIL: TestTwo (0.00s)",
+        "Tests run: 3, Failures: 1, Errors: 0, Skipped: 0, Time elapsed: 0.1 s",
+        "Tests run: 9, Failures: 1, Errors: 1, Skipped: 0",
+        "test result: FAILED. 8 passed; 2 failed; 0 ignored",
+        "✗ tests failed: 7",
+    ])
+    scanner = FailedTestScanner()
+    # Chunk boundaries fall in the middle of lines.
+    for start in range(0, len(log), 7):
+        scanner.feed(log[start:start + 7])
+    assert scanner.close() == {
+        "pytest": 2, "unittest": 3, "jest": 4, "go": 2, "maven": 2, "cargo": 2, "generic": 7
+    }
+    assert scanner.total == 22
+    assert FailedTestScanner().total is None
+
+def test_badge_analysis_single_pass():
+    badges = [
+        "https://img.shields.io/badge/coverage-87.5%25-green",
+        "https://sonarcloud.io/api/project_badges/measure?project=x&metric=alert_status",
+        "https://github.com/user/repo/actions/workflows/codeql.yml/badge.svg",
+        "https://img.shields.io/badge/version-v1.2.3-blue",
+        "https://img.shields.io/badge/coverage-10%25-red",
+        "https://codecov.io/gh/user/repo/branch/main/graph/badge.svg",
+    ]
+    analysis = BadgeAnalysis.from_badges(badges)
+    assert analysis.coverage == 87.5
+    assert analysis.version == "1.2.3"
+    assert analysis.quality_tools == ["SonarCloud", "CodeQL", "Codecov"]
+    assert analysis.codeql is True
+
+    empty = BadgeAnalysis.from_badges([])
+    assert (empty.coverage, empty.version, empty.quality_tools, empty.codeql) == (
+        None, None, [], False
+    )
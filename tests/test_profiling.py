@@ -0,0 +1,92 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+import httpx
+from httpx import ASGITransport, AsyncClient
+from app.api.repos import refresh_account
+from app.config import config
+from app.main import app
+from app.services.github_client import GitHubClient
+from app.testing.fake_github import FakeGitHub, simulated_github
+from app.utils.profiling import profiling, span, traced
+
+
+async def test_spans_are_attributed_to_the_enclosing_repository():
+    async def fetch(repo):
+        with span("fetch_repo_metrics", repo=repo):
+            await traced("readme", asyncio.sleep(0))
+            with span("github_request", family="readme") as attrs:
+                attrs["status"] = 200
+
+    with profiling() as profile:
+        with span("list_repos"):
+            await asyncio.gather(fetch("octo/a"), fetch("octo/b"))
+    with span("after_request"):
+        pass
+
+    report = profile.report()
+    assert set(report["repositories"]) == {"octo/a", "octo/b"}
+    spans = report["repositories"]["octo/a"]["spans"]
+    assert [s["name"] for s in spans] == ["fetch_repo_metrics", "readme", "github_request"]
+    assert spans[2]["attrs"] == {"family": "readme", "status": 200}
+    assert [s["name"] for s in report["spans"]] == ["list_repos"]
+    assert report["totals"]["github_request"]["count"] == 2
+
+
+async def test_profile_parameter_is_ignored_unless_enabled():
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/health", params={"profile": "1"})
+    assert response.status_code == 200
+    assert "repositories" not in response.json()
+
+
+async def test_profile_returns_waterfall_per_repository():
+    fake = FakeGitHub(repo_count=3, latency={"default": 0.0})
+    with patch.object(config, "PROFILING_ENABLED", True):
+        async with simulated_github(fake), AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            response = await client.get(
+                "/api/repos", params={"username": "octo-bench", "profile": "flame"}
+            )
+
+    report = response.json()
+    assert response.status_code == 200
+    assert report["status"] == 200
+    assert len(report["repositories"]) == 3
+    names = {s["name"] for s in report["repositories"]["octo-bench/repo-0000"]["spans"]}
+    assert {"fetch_repo_metrics", "readme_badges", "rate_limit_wait", "github_request"} <= names
+    assert report["flamegraph"]["format"] == "folded"
+
+
+async def test_readme_span_ends_when_the_headers_arrive():
+    client = GitHubClient(transport=httpx.MockTransport(lambda request: httpx.Response(200)))
+    with profiling() as profile, \
+         patch("app.services.github_client.github_rate_limiter.wait", new_callable=AsyncMock):
+        async with client.open_readme("octo", "app") as response:
+            await asyncio.sleep(0.05)
+            await response.aread()
+
+    (request,) = profile.report()["spans"]
+    assert request["name"] == "github_request" and request["duration_ms"] < 50
+
+
+async def test_joined_refresh_is_flagged_in_the_joining_profile():
+    fake = FakeGitHub(repo_count=2, latency={"default": 0.01})
+
+    async def profiled_refresh():
+        with profiling() as profile:
+            await refresh_account(fake.owner)
+        return profile.report()
+
+    async with simulated_github(fake):
+        first = asyncio.create_task(profiled_refresh())
+        await asyncio.sleep(0)
+        joined = await profiled_refresh()
+        started = await first
+
+    assert len(started["repositories"]) == 2
+    assert started["spans"][0]["attrs"] == {"joined": False}
+    assert joined["repositories"] == {}
+    assert [(s["name"], s["attrs"]) for s in joined["spans"]] == [
+        ("account_refresh", {"joined": True})
+    ]
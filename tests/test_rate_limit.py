@@ -0,0 +1,77 @@
+import asyncio
+import time
+import pytest
+from app.utils.rate_limit import TokenBucketRateLimiter
+
+@pytest.mark.asyncio
+async def test_token_bucket_allows_concurrent_burst():
+    limiter = TokenBucketRateLimiter(requests_per_minute=60, burst=50)
+    start = time.monotonic()
+    await asyncio.gather(*[limiter.wait() for _ in range(50)])
+    assert time.monotonic() - start < 0.5
+
+def test_token_bucket_spaces_requests_beyond_burst():
+    limiter = TokenBucketRateLimiter(requests_per_minute=600, burst=2)
+    delays = [limiter.reserve() for _ in range(4)]
+    assert delays[:2] == [0.0, 0.0]
+    # Each reservation beyond the burst queues behind the previous one (10 tokens/s).
+    assert delays[2] == pytest.approx(0.1, abs=0.02)
+    assert delays[3] == pytest.approx(0.2, abs=0.02)
+
+def test_exhausted_primary_quota_waits_for_reset():
+    limiter = TokenBucketRateLimiter(burst=10)
+    reset_at = time.time() + 30
+    limiter.update_from_headers({
+        "X-RateLimit-Limit": "5000",
+        "X-RateLimit-Remaining": "0",
+        "X-RateLimit-Reset": str(reset_at),
+    })
+    assert limiter.reserve() == pytest.approx(30, abs=1)
+
+def test_low_primary_quota_is_spread_until_reset():
+    limiter = TokenBucketRateLimiter(burst=100, reserve_fraction=0.1)
+    limiter.update_from_headers({
+        "X-RateLimit-Limit": "5000",
+        "X-RateLimit-Remaining": "10",
+        "X-RateLimit-Reset": str(time.time() + 100),
+    })
+    first, second = limiter.reserve(), limiter.reserve()
+    assert first == 0.0
+    assert second == pytest.approx(10, abs=1)
+
+def test_retry_after_blocks_secondary_bucket_only():
+    limiter = TokenBucketRateLimiter()
+    limiter.update_from_headers({"Retry-After": "20", "X-RateLimit-Remaining": "4000"}, 403)
+    assert limiter.reserve() == pytest.approx(20, abs=1)
+    assert limiter.remaining() == 3999
+
+def test_plain_forbidden_does_not_back_off():
+    limiter = TokenBucketRateLimiter()
+    limiter.update_from_headers({"X-RateLimit-Remaining": "4000"}, 403)
+    assert limiter.reserve() == 0.0
+    limiter.update_from_headers({"X-RateLimit-Remaining": "4000"}, 403, rate_limited=True)
+    assert limiter.reserve() == pytest.approx(60, abs=1)
+
+def test_resources_have_separate_quotas():
+    limiter = TokenBucketRateLimiter()
+    limiter.update_from_headers({
+        "X-RateLimit-Resource": "graphql",
+        "X-RateLimit-Remaining": "0",
+        "X-RateLimit-Reset": str(time.time() + 60),
+    })
+    assert limiter.reserve("core") == 0.0
+    assert limiter.reserve("graphql") > 50
+
+def test_not_modified_responses_do_not_consume_quota():
+    limiter = TokenBucketRateLimiter(burst=1000)
+    reset_at = str(time.time() + 3600)
+    limiter.update_from_headers({"X-RateLimit-Remaining": "4000", "X-RateLimit-Reset": reset_at})
+    for _ in range(500):
+        limiter.reserve()
+        limiter.update_from_headers(
+            {"X-RateLimit-Remaining": "4000", "X-RateLimit-Reset": reset_at}, 304
+        )
+    limiter.reserve()
+    limiter.update_from_headers({"X-RateLimit-Remaining": "3999", "X-RateLimit-Reset": reset_at})
+    assert limiter.remaining() == 3999
+    assert limiter.reserve() == 0.0
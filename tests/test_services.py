@@ -1,6 +1,15 @@
+import io
+import zipfile
+import httpx
 import pytest
 from unittest.mock import AsyncMock, patch
+from app.cache.readme_cache import readme_cache
+from app.cache.ttl_cache import ttl_cache
+from app.parsers.badge_analysis import ReadmeBadges
 from app.services.actions_service import ActionsService
+from app.services.badge_service import BadgeService
+from app.services.badge_service import config as badge_config
+from app.services.github_client import GitHubClient
 from app.services.coverage_service import CoverageService
 from app.services.quality_service import QualityService
 
@@ -32,3 +41,152 @@ async def test_get_quality_tools():
         assert "SonarCloud" in tools
         assert "CodeQL" in tools
         assert "Codecov" in tools
+
+@pytest.fixture
+def readme_github():
+    """Serves a raw README: badges, a section heading, then a large body in small chunks."""
+    state = {"requests": 0, "chunks_sent": 0, "not_modified": 0}
+    body = [b"# Project\n", b"![c](https://img.shields.io/badge/cov", b"erage-75%25-green)\n",
+            b"\n## Install\n"] + [b"x" * 1024 + b"\n"] * 100
+
+    async def chunks():
+        for chunk in body:
+            state["chunks_sent"] += 1
+            yield chunk
+
+    def handler(request):
+        state["requests"] += 1
+        assert request.headers["Accept"] == "application/vnd.github.raw+json"
+        if request.headers.get("If-None-Match") == '"v1"':
+            state["not_modified"] += 1
+            return httpx.Response(304, headers={"ETag": '"v1"'})
+        return httpx.Response(200, headers={"ETag": '"v1"'}, content=chunks())
+
+    client = GitHubClient(transport=httpx.MockTransport(handler))
+    readme_cache.clear()
+    with patch("app.services.badge_service.github_client", client), \
+         patch("app.services.github_client.github_rate_limiter.wait", new_callable=AsyncMock):
+        yield state
+    readme_cache.clear()
+
+@pytest.mark.asyncio
+async def test_readme_streaming_stops_after_badge_region(readme_github):
+    """Reading stops after a run of text without badges and the result is cached by ETag."""
+    with patch("app.services.badge_service.ReadmeBadges.from_readme",
+               wraps=ReadmeBadges.from_readme) as mock_parse:
+        first = await BadgeService.get_readme_badges("owner", "repo")
+        second = await BadgeService.get_readme_badges("owner", "repo")
+
+    assert first.badges == ["https://img.shields.io/badge/coverage-75%25-green"]
+    assert first.analysis.coverage == 75.0
+    assert readme_github["chunks_sent"] < 20
+    assert second is first
+    assert readme_github["not_modified"] == 1
+    assert mock_parse.call_count == 1
+
+@pytest.mark.asyncio
+async def test_readme_streaming_respects_byte_cap(readme_github):
+    """Without a badge region end in sight, reading stops at README_MAX_BYTES."""
+    with patch.object(badge_config, "README_MAX_BYTES", 30):
+        readme = await BadgeService.get_readme_badges("owner", "repo")
+    # The badge URL straddles the cap, so the truncated line is not parsed.
+    assert readme.badges == []
+    assert readme_github["chunks_sent"] == 2
+
+@pytest.mark.asyncio
+async def test_readme_refetched_when_analysis_was_evicted(readme_github):
+    await BadgeService.get_readme_badges("owner", "repo")
+    readme_cache.clear()
+    readme = await BadgeService.get_readme_badges("owner", "repo")
+    assert readme.analysis.coverage == 75.0
+    assert readme_github["requests"] == 3
+
+@pytest.mark.asyncio
+async def test_rate_limited_readme_does_not_fail_the_refresh():
+    """A 403 on a streamed README is read, recorded as a rate limit and yields no badges."""
+    async def body():
+        yield b'{"message": "API rate limit exceeded"}'
+
+    def handler(request):
+        return httpx.Response(403, content=body(), headers={
+            "X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "0"
+        })
+
+    client = GitHubClient(transport=httpx.MockTransport(handler))
+    readme_cache.clear()
+    with patch("app.services.badge_service.github_client", client), \
+         patch("app.services.github_client.github_rate_limiter") as limiter:
+        limiter.wait = AsyncMock()
+        readme = await BadgeService.get_readme_badges("owner", "repo")
+
+    assert readme.badges == []
+    assert limiter.update_from_headers.call_args.args[1:] == (403, True)
+
+def _log_archive():
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        zf.writestr("1_test.txt", "collecting...\n=== 2 failed, 5 passed in 1.2s ===\n")
+        zf.writestr("test/3_Run pytest.txt", "=== 2 failed, 5 passed in 1.2s ===\n")
+        zf.writestr("2_integration.txt", "Tests failed: 1\n")
+        zf.writestr("3_lint.txt", "All checks passed\n")
+    return buffer.getvalue()
+
+@pytest.mark.asyncio
+async def test_failed_tests_count_from_streamed_log_archive():
+    """Failed tests are summed over the job logs of the last failed run and cached by run id."""
+    requests = []
+
+    def handler(request):
+        requests.append(request.url.path)
+        if request.url.path.endswith("/actions/runs"):
+            return httpx.Response(200, json={"workflow_runs": [
+                {"id": 7, "status": "completed", "conclusion": "failure"}
+            ]})
+        if request.url.path.endswith("/actions/runs/7/logs"):
+            return httpx.Response(302, headers={"Location": "https://storage.example.com/logs.zip"})
+        if request.url.host == "storage.example.com":
+            assert "Authorization" not in request.headers
+            return httpx.Response(200, content=_log_archive())
+        return httpx.Response(404)
+
+    client = GitHubClient(transport=httpx.MockTransport(handler))
+    client.headers["Authorization"] = "token secret"
+    ttl_cache.delete("failed_tests_owner/repo_7")
+    with patch("app.services.actions_service.github_client", client), \
+         patch("app.services.github_client.github_rate_limiter.wait", new_callable=AsyncMock):
+        first = await ActionsService.get_failed_tests_count("owner", "repo")
+        second = await ActionsService.get_failed_tests_count("owner", "repo")
+
+    assert first == second == 3
+    assert requests.count("/logs.zip") == 1
+    ttl_cache.delete("failed_tests_owner/repo_7")
+
+@pytest.mark.asyncio
+async def test_rate_limited_or_truncated_logs_yield_no_count():
+    """A 403 on the streamed logs and a truncated archive both leave the count unknown."""
+    archive = {"status": 403, "content": b""}
+
+    async def body():
+        yield archive["content"]
+
+    def handler(request):
+        if request.url.path.endswith("/actions/runs"):
+            return httpx.Response(200, json={"workflow_runs": [
+                {"id": 8, "status": "completed", "conclusion": "failure"}
+            ]})
+        return httpx.Response(archive["status"], content=body(), headers={
+            "X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "0"
+        })
+
+    client = GitHubClient(transport=httpx.MockTransport(handler))
+    ttl_cache.delete("failed_tests_owner/repo_8")
+    with patch("app.services.actions_service.github_client", client), \
+         patch("app.services.github_client.github_rate_limiter") as limiter:
+        limiter.wait = AsyncMock()
+        archive["content"] = b'{"message": "API rate limit exceeded"}'
+        assert await ActionsService.get_failed_tests_count("owner", "repo") is None
+        assert limiter.update_from_headers.call_args.args[1:] == (403, True)
+
+        archive["status"], archive["content"] = 200, _log_archive()[:-30]
+        assert await ActionsService.get_failed_tests_count("owner", "repo") is None
+    assert ttl_cache.get("failed_tests_owner/repo_8") is None
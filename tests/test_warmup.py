@@ -0,0 +1,99 @@
+import asyncio
+import time
+import pytest
+from unittest.mock import AsyncMock, patch
+from app.cache.ttl_cache import ttl_cache
+from app.services.warmup import WarmupScheduler
+from app.utils.rate_limit import TokenBucketRateLimiter, background_priority, _background
+from app.utils.single_flight import SingleFlight
+
+@pytest.mark.asyncio
+async def test_scheduler_refreshes_accounts_with_background_priority():
+    seen = []
+
+    async def refresh(account):
+        seen.append((account, _background.get() is not None))
+
+    ttl_cache._cache.clear()
+    scheduler = WarmupScheduler(["octo-org", None], refresh, jitter_seconds=0)
+    scheduler.start()
+    await asyncio.sleep(0.05)
+    await scheduler.stop()
+
+    assert ("octo-org", True) in seen
+    assert (None, True) in seen
+    assert scheduler.stats()["refreshes"] >= 2
+
+def test_next_refresh_is_scheduled_before_expiry():
+    ttl_cache._cache.clear()
+    ttl_cache.set("repos_octo-org", [], ttl=1000)
+    scheduler = WarmupScheduler(["octo-org"], AsyncMock(), lead_seconds=300, jitter_seconds=0)
+    with patch("app.services.warmup.time.monotonic", return_value=0.0):
+        assert scheduler._next_due("octo-org") == pytest.approx(700, abs=1)
+    ttl_cache._cache.clear()
+
+@pytest.mark.asyncio
+async def test_background_requests_stay_within_budget_share():
+    """The budget is enforced per request, so one large account cannot overrun it."""
+    limiter = TokenBucketRateLimiter(burst=1000, background_budget_share=0.01)
+    limiter.update_from_headers({
+        "X-RateLimit-Limit": "400", "X-RateLimit-Remaining": "400",
+        "X-RateLimit-Reset": str(time.time() + 3600),
+    })
+    refresh = AsyncMock()
+    scheduler = WarmupScheduler(["a"], refresh)
+
+    with background_priority():
+        for _ in range(4):
+            await limiter.wait()
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(limiter.wait(), 0.05)
+    assert limiter.background_requests == 4
+    # The next request of an interactive caller is not limited by the budget.
+    await asyncio.wait_for(limiter.wait(), 0.05)
+
+    with patch("app.services.warmup.github_rate_limiter", limiter):
+        assert await scheduler.run_once("a") is False
+    refresh.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_interactive_caller_promotes_joined_background_refresh():
+    limiter = TokenBucketRateLimiter(burst=1000, background_budget_share=0.0)
+    flight = SingleFlight()
+
+    async def refresh():
+        await limiter.wait()
+        return "done"
+
+    with background_priority():
+        warmup = asyncio.create_task(flight.do("repos_a", refresh))
+    await asyncio.sleep(0.01)
+    # Out of budget, the warm-up refresh waits until an interactive request joins it.
+    assert not warmup.done()
+    assert await asyncio.wait_for(flight.do("repos_a", refresh), 1) == "done"
+    assert await warmup == "done"
+    assert limiter.background_requests == 0
+
+def test_refreshed_account_is_not_refreshed_again_immediately():
+    ttl_cache._cache.clear()
+    scheduler = WarmupScheduler(["missing"], AsyncMock(), retry_seconds=60, jitter_seconds=0)
+    with patch("app.services.warmup.time.monotonic", return_value=0.0):
+        assert scheduler._next_due("missing") == 0.0
+        assert scheduler._next_due("missing", just_refreshed=True) == 60.0
+
+@pytest.mark.asyncio
+async def test_background_requests_yield_to_interactive_ones():
+    limiter = TokenBucketRateLimiter(requests_per_minute=600, burst=4, background_floor=0.5)
+    order = []
+
+    async def background():
+        with background_priority():
+            await limiter.wait()
+        order.append("background")
+
+    async def interactive(i):
+        await limiter.wait()
+        order.append(f"interactive{i}")
+
+    await asyncio.gather(*[interactive(i) for i in range(6)], background())
+    assert order[-1] == "background"
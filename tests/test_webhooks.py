@@ -0,0 +1,142 @@
+import hashlib
+import hmac
+import json
+import pytest
+from unittest.mock import patch
+from httpx import AsyncClient
+from app.main import app
+from app.cache.ttl_cache import ttl_cache
+from app.models.enums import BuildStatus
+from app.models.metrics import RepoMetrics
+from app.models.repo import Repository
+
+SECRET = "webhook-secret"
+
+REPOSITORY = {"full_name": "user/repo", "name": "repo", "owner": {"login": "user"}}
+
+PAYLOADS = {
+    "workflow_run": {
+        "action": "completed",
+        "workflow_run": {"id": 1, "status": "completed", "conclusion": "failure"},
+        "repository": REPOSITORY,
+    },
+    "release": {
+        "action": "published",
+        "release": {"tag_name": "v2.1.0"},
+        "repository": REPOSITORY,
+    },
+    "push": {
+        "ref": "refs/heads/main",
+        "commits": [{"id": "abc"}],
+        "repository": REPOSITORY,
+    },
+}
+
+
+def _sign(body: bytes) -> str:
+    return "sha256=" + hmac.new(SECRET.encode(), body, hashlib.sha256).hexdigest()
+
+
+def _seed_cache():
+    repo = Repository(
+        name="repo", full_name="user/repo", html_url="https://github.com/user/repo",
+        metrics=RepoMetrics(build_status=BuildStatus.SUCCESS, version="1.0.0")
+    )
+    ttl_cache._cache.clear()
+    ttl_cache.set("repo_user/repo", (("2024-01-01", "2024-01-01"), repo))
+    ttl_cache.set("repos_user", [repo])
+
+
+async def _deliver(event: str, payload: dict, signature=None):
+    body = json.dumps(payload).encode()
+    headers = {
+        "X-GitHub-Event": event,
+        "X-Hub-Signature-256": signature or _sign(body),
+        "Content-Type": "application/json",
+    }
+    with patch("app.api.webhooks.config.GITHUB_WEBHOOK_SECRET", SECRET):
+        async with AsyncClient(app=app, base_url="http://test") as ac:
+            return await ac.post("/webhooks/github", content=body, headers=headers)
+
+
+@pytest.mark.asyncio
+async def test_invalid_signature_is_rejected():
+    response = await _deliver("push", PAYLOADS["push"], signature="sha256=bad")
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_workflow_run_patches_build_status():
+    _seed_cache()
+    ttl_cache.set("failed_tests_user/repo_1", 3)
+    response = await _deliver("workflow_run", PAYLOADS["workflow_run"])
+
+    assert response.json()["action"] == "patched"
+    assert ttl_cache.get("repos_user")[0].metrics.build_status == BuildStatus.FAILURE
+    assert ttl_cache.get("repo_user/repo")[1].metrics.build_status == BuildStatus.FAILURE
+    assert ttl_cache.get("repos_user")[0].metrics.failing_tests_count == 3
+
+    fixed = {**PAYLOADS["workflow_run"], "workflow_run": {
+        "id": 2, "status": "completed", "conclusion": "success"}}
+    assert (await _deliver("workflow_run", fixed)).json()["action"] == "patched"
+    metrics = ttl_cache.get("repos_user")[0].metrics
+    assert metrics.build_status == BuildStatus.SUCCESS
+    assert metrics.failing_tests_count == 0
+    ttl_cache._cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_failed_run_with_unparsed_logs_invalidates():
+    _seed_cache()
+    response = await _deliver("workflow_run", PAYLOADS["workflow_run"])
+
+    assert response.json()["action"] == "invalidated"
+    assert ttl_cache.get("repo_user/repo") is None
+    ttl_cache._cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_release_patches_version():
+    _seed_cache()
+    response = await _deliver("release", PAYLOADS["release"])
+
+    assert response.json()["action"] == "patched"
+    assert ttl_cache.get("repos_user")[0].metrics.version == "2.1.0"
+    ttl_cache._cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_push_invalidates_only_the_affected_repo():
+    _seed_cache()
+    response = await _deliver("push", PAYLOADS["push"])
+
+    assert response.json()["action"] == "invalidated"
+    assert ttl_cache.get("repo_user/repo") is None
+    repos, stale = ttl_cache.get_with_staleness("repos_user")
+    assert stale and repos[0].name == "repo"
+    ttl_cache._cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_late_delivery_of_older_run_is_ignored():
+    _seed_cache()
+    newer = {"action": "in_progress", "repository": REPOSITORY, "workflow_run": {
+        "id": 2, "status": "in_progress", "conclusion": None,
+        "run_started_at": "2024-05-02T00:00:00Z"}}
+    older = {"action": "completed", "repository": REPOSITORY, "workflow_run": {
+        "id": 1, "status": "completed", "conclusion": "failure",
+        "run_started_at": "2024-05-01T00:00:00Z"}}
+
+    assert (await _deliver("workflow_run", newer)).json()["action"] == "patched"
+    assert (await _deliver("workflow_run", older)).json()["action"] == "ignored"
+    assert ttl_cache.get("repos_user")[0].metrics.build_status == BuildStatus.IN_PROGRESS
+    ttl_cache._cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_prerelease_does_not_change_version():
+    _seed_cache()
+    payload = {**PAYLOADS["release"], "release": {"tag_name": "v3.0.0-rc1", "prerelease": True}}
+    assert (await _deliver("release", payload)).json()["action"] == "ignored"
+    assert ttl_cache.get("repos_user")[0].metrics.version == "1.0.0"
+    ttl_cache._cache.clear()